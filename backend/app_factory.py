@@ -0,0 +1,125 @@
+import os
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI
+from fastapi.middleware.cors import CORSMiddleware
+
+# Deployable components:
+#   search - stateless /jobs API backed by Apify, cheap to scale out
+#   apply  - browser-automation endpoints that drive Chrome via Selenium
+COMPONENTS = ("search", "apply")
+
+# The Next.js dev server (next dev -p 8080); set CORS_ORIGINS (comma separated, or "*") for other deployments
+DEFAULT_CORS_ORIGINS = "http://localhost:8080,http://127.0.0.1:8080"
+
+
+def parse_components(value):
+    """Turns "search,apply" (e.g. from APP_COMPONENTS) into a validated tuple."""
+    components = tuple(c.strip() for c in value.split(",") if c.strip())
+    unknown = set(components) - set(COMPONENTS)
+    if unknown:
+        raise ValueError(f"Unknown app components: {', '.join(sorted(unknown))}")
+    return components
+
+
+def parse_origins(value):
+    """Turns "https://a.example,https://b.example" (e.g. from CORS_ORIGINS) into a list."""
+    return [origin.strip().rstrip("/") for origin in value.split(",") if origin.strip()]
+
+
+def create_app(components=None, normalize_jobs=False):
+    """
+    Builds the FastAPI app with only the requested components mounted.
+
+    Routers (and whatever they import) are loaded here, and API clients are
+    created in the lifespan handler, so a search-only process never imports
+    Selenium and an apply-only process never talks to Apify.
+
+    Args:
+        components: Iterable of names from COMPONENTS. Defaults to the
+            APP_COMPONENTS environment variable, or everything.
+        normalize_jobs: Return normalized job dicts from /jobs instead of the
+            raw Apify dataset items.
+    """
+    if components is None:
+        components = parse_components(os.environ.get("APP_COMPONENTS", ",".join(COMPONENTS)))
+    components = tuple(components)
+
+    @asynccontextmanager
+    async def lifespan(app):
+        index_path = os.environ.get("JOB_INDEX_PATH")
+        if "search" in components:
+            from search_api import create_apify_client
+            from job_index import JobIndex
+            app.state.apify_client = create_apify_client()
+            # Jobs from every search accumulate here, optionally persisted across restarts
+            if index_path and os.path.exists(index_path):
+                app.state.job_index = JobIndex.load(index_path)
+            else:
+                app.state.job_index = JobIndex()
+        if "apply" in components:
+            from apply_links import ApplyLinkResolver
+            from form_analysis import FormAnalyzer
+            from prefetch import FormPrefetcher
+            app.state.apply_link_resolver = ApplyLinkResolver()
+            # Reads server-rendered forms over the resolver's connection pool, no browser needed
+            app.state.form_analyzer = FormAnalyzer(session=app.state.apply_link_resolver.session)
+            # Resolves the top search results' forms in the background (search + apply in one process)
+            app.state.form_prefetcher = FormPrefetcher.from_env(app.state.apply_link_resolver,
+                                                                app.state.form_analyzer)
+        yield
+        if "search" in components and index_path:
+            app.state.job_index.save(index_path)
+        if "apply" in components:
+            from apply_api import session_watcher, resource_monitor, screenshot_store, latency_tracker
+            session_watcher.stop()
+            resource_monitor.stop()
+            screenshot_store.shutdown()
+            app.state.form_prefetcher.shutdown()
+            latency_tracker.save()
+
+    # Create FastAPI app
+    app = FastAPI(title="Job Application Automation API", lifespan=lifespan)
+    app.state.components = components
+    app.state.normalize_jobs = normalize_jobs
+
+    # Per-user and global limits on searches and applications; 429 + Retry-After when exceeded
+    from rate_limits import AdmissionController, AdmissionMiddleware
+    app.state.admission = AdmissionController.from_env()
+    if app.state.admission is not None:
+        app.add_middleware(AdmissionMiddleware, controller=app.state.admission)
+
+    # Compress larger JSON bodies (brotli when installed, else gzip); streams pass through
+    from compression import CompressionMiddleware
+    compression = CompressionMiddleware.options_from_env()
+    if compression is not None:
+        app.add_middleware(CompressionMiddleware, **compression)
+
+    # Add CORS middleware to allow cross-origin requests from the frontend.
+    # Added after admission control so 429 responses carry CORS headers too.
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=parse_origins(os.environ.get("CORS_ORIGINS", DEFAULT_CORS_ORIGINS)),
+        allow_credentials=True,
+        allow_methods=["*"],  # Allows all methods
+        allow_headers=["*"],  # Allows all headers
+        expose_headers=["ETag", "Last-Modified"],  # For clients revalidating by hand
+    )
+
+    if "search" in components:
+        from search_api import router as search_router
+        app.include_router(search_router)
+
+    if "apply" in components:
+        from apply_api import router as apply_router
+        app.include_router(apply_router)
+
+    @app.get("/")
+    async def root():
+        return {
+            "message": "Job Application Automation API is running",
+            "components": list(components),
+            "rate_limits": app.state.admission.summary() if app.state.admission else None,
+        }
+
+    return app
@@ -0,0 +1,713 @@
+import os
+import time
+import random
+import asyncio
+import secrets
+from typing import Dict, Any, List, Optional
+
+from fastapi import APIRouter, Body, HTTPException, Request
+from fastapi.responses import FileResponse
+from fastapi.concurrency import run_in_threadpool
+
+from models import UserData, JobData, ApplicationRequest, ApplicationResponse
+from apply_links import job_apply_url, check_public_url, UnsafeURL
+from ats_adapters import adapter_for
+from idempotency import IdempotencyRegistry, idempotency_key
+from prefetch import prefetch_group
+from session_watcher import SessionWatcher
+from resource_monitor import ResourceMonitor, BrowserBudgetExceeded
+from chrome_profiles import ProfileTemplate
+from screenshots import ScreenshotStore, MEDIA_TYPES
+from tab_pool import TabPool
+from profile_store import ProfileStore, ProfileNotFound
+from latency import latency_tracker
+from job_queue import queue_from_env, StatusMap
+from fast_json import FastJSONResponse
+from conditional import conditional, etag_for, not_modified, not_modified_response
+
+router = APIRouter()
+
+# With APPLY_QUEUE set, browsers run on worker nodes (worker.py) fed by this queue
+apply_queue = queue_from_env()
+
+# Application tracking (in the queue when there is one, so every API process and worker shares it)
+application_status: Dict[str, Dict[str, Any]] = StatusMap(apply_queue) if apply_queue is not None else {}
+
+# Notices when users close the browsers left open for manual completion
+session_watcher = SessionWatcher()
+
+def setup_webdriver(profile_dir=None):
+    """Configure and initialize the Selenium WebDriver with advanced anti-bot detection.
+
+    profile_dir is a session cloned from chrome_profiles, whose warm disk cache
+    saves re-downloading ATS assets; without it Chrome starts from a throwaway profile."""
+    # Selenium is only needed by the browser-automation tier, so import it on first use
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options
+
+    chrome_options = Options()
+    
+    # Non-headless mode - Browser will be visible to the user
+    # Explicitly make sure headless mode is disabled
+    chrome_options.add_argument("--start-maximized")  # Start with maximized browser
+    
+    # Additional options for stability
+    chrome_options.add_argument("--no-sandbox")
+    chrome_options.add_argument("--disable-dev-shm-usage")
+    
+    # Anti-bot detection measures
+    chrome_options.add_argument("--disable-blink-features=AutomationControlled")
+    chrome_options.add_argument("--disable-extensions")
+    
+    # Set a realistic window size (like a standard laptop screen)
+    chrome_options.add_argument("--window-size=1366,768")
+    
+    # Add a user agent that appears more like a regular browser
+    chrome_options.add_argument("--user-agent=Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36")
+    
+    # Disable automation info bar and other automation flags
+    chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
+    chrome_options.add_experimental_option('useAutomationExtension', False)
+    
+    # Additional preferences to appear more human-like
+    prefs = {
+        "credentials_enable_service": False,
+        "profile.password_manager_enabled": False,
+        "profile.default_content_setting_values.notifications": 2,  # Block notifications
+        "plugins.always_open_pdf_externally": True  # Don't open PDFs in browser
+    }
+    chrome_options.add_experimental_option("prefs", prefs)
+    
+    if profile_dir:
+        for argument in chrome_profiles.chrome_arguments(profile_dir):
+            chrome_options.add_argument(argument)
+    
+    # Create the WebDriver
+    driver = webdriver.Chrome(options=chrome_options)
+    
+    # Execute CDP commands to further disguise automation
+    # This removes the 'navigator.webdriver' flag that many bot detectors check
+    driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {
+        'source': '''
+            Object.defineProperty(navigator, 'webdriver', {
+                get: () => undefined
+            })
+        '''
+    })
+    
+    # Add additional stealth techniques
+    driver.execute_cdp_cmd('Network.setUserAgentOverride', {
+        "userAgent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36"
+    })
+    
+    return driver
+
+def mark_completed_manually(job_id: str):
+    """Session watcher callback: the user closed the browser for job_id."""
+    # Record success after manual interaction
+    status_message = "Application completed manually by user"
+    print(f"Browser was closed by the user. {status_message} ({job_id})")
+    if tab_pool is not None:
+        tab_pool.close(job_id)
+    application_status[job_id] = {
+        "status": "success",
+        "message": status_message,
+        "timestamp": time.time()
+    }
+    resource_monitor.release(job_id)
+    chrome_profiles.release(job_id)
+
+def expire_idle_session(job_id: str):
+    """Resource monitor callback: the browser for job_id sat idle past the timeout."""
+    if tab_pool is not None and tab_pool.is_browser(job_id):
+        # A shared browser: every application in it expires with it
+        for tab_job_id in tab_pool.drop_browser(job_id):
+            expire_idle_session(tab_job_id)
+        chrome_profiles.release(job_id)
+        return
+    session_watcher.unregister(job_id)
+    application_status[job_id] = {
+        "status": "expired",
+        "message": "Browser was closed after being idle for too long",
+        "timestamp": time.time()
+    }
+    chrome_profiles.release(job_id)
+
+# Per-session memory/CPU accounting and the global browser memory budget
+resource_monitor = ResourceMonitor.from_env(on_idle=expire_idle_session)
+
+# Profile template with a shared, size-capped disk cache cloned into every browser session
+chrome_profiles = ProfileTemplate.from_env()
+
+# One execution per (user, job, apply URL), shared by duplicate /apply requests
+idempotency_registry = IdempotencyRegistry.from_env()
+
+def launch_shared_browser(browser_key: str):
+    """Tab pool callback: starts a browser for several applications, accounted as one session."""
+    resource_monitor.acquire(browser_key)
+    try:
+        driver = setup_webdriver(chrome_profiles.clone(browser_key))
+    except Exception:
+        resource_monitor.release(browser_key)
+        chrome_profiles.release(browser_key, harvest=False)
+        raise
+    resource_monitor.track(browser_key, driver)
+    return driver
+
+def shared_browser_closed(browser_key: str):
+    resource_monitor.release(browser_key)
+    chrome_profiles.release(browser_key)
+
+# With APPLY_TABS_PER_BROWSER > 1, applications share browsers as isolated tabs
+tab_pool = TabPool.from_env(launch_shared_browser, on_browser_closed=shared_browser_closed)
+
+# Compressed, size-bounded store for form screenshots
+screenshot_store = ScreenshotStore.from_env()
+
+# Versioned user profiles and resumes, so /apply can send a profile id instead of the profile
+profile_store = ProfileStore.from_env()
+
+# How long /apply waits for a queued application to be filled, and how often it checks
+QUEUE_WAIT_S = float(os.environ.get("APPLY_QUEUE_WAIT_S", 120))
+QUEUE_POLL_S = 0.5
+
+def process_application(job_id: str, job_url: str, user_data: UserData, direct_form: bool = False,
+                        profile_values: Optional[Dict[str, str]] = None,
+                        schema: Optional[List[Dict[str, Any]]] = None):
+    """Process a job application using Selenium.
+
+    With direct_form=True, job_url is already the application form (see
+    apply_links), so the Apply-button search and page-transition wait are skipped.
+    profile_values is the stored profile's precomputed field map, if there is one.
+    schema is the form's field list prefetched by FormPrefetcher: its fields are
+    matched to the profile before the browser starts, and the page is only
+    described again if they aren't all found on it.
+    """
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.common.exceptions import TimeoutException, NoSuchElementException
+
+    # Import custom form filling functions
+    from formfiller import safe_send_keys, extract_field_descriptors, locate_fields
+    from field_matcher import match_fields
+
+    driver = None
+    tab = None
+    planned = match_fields(schema, user_data, values=profile_values) if schema and direct_form else None
+
+    # Reserve memory for another Chrome before starting one (in tab mode, only
+    # when no shared browser has room for another tab)
+    try:
+        if tab_pool is not None:
+            tab = tab_pool.open(job_id)
+        else:
+            resource_monitor.acquire(job_id)
+    except BrowserBudgetExceeded as e:
+        error_msg = f"Too many browser sessions open, try again later: {e}"
+        print(error_msg)
+        application_status[job_id] = {
+            "status": "failed",
+            "message": error_msg,
+            "timestamp": time.time()
+        }
+        return {"success": False, "message": error_msg}
+    except Exception as e:
+        # Starting a shared browser for the tab failed
+        error_msg = f"Error processing application: {str(e)}"
+        print(error_msg)
+        application_status[job_id] = {
+            "status": "failed",
+            "message": error_msg,
+            "timestamp": time.time()
+        }
+        return {"success": False, "message": error_msg}
+
+    application_status[job_id] = {
+        "status": "processing",
+        "message": "Starting application process - Browser window opening for interactive form filling",
+        "timestamp": time.time()
+    }
+    
+    form_filled = False  # Track if we successfully filled any form fields
+    screenshot_path = None
+    
+    try:
+        # Set up the WebDriver
+        if tab is not None:
+            # Switches the shared browser to this tab; its other tabs wait until deactivate()
+            driver = tab.activate()
+        else:
+            driver = setup_webdriver(chrome_profiles.clone(job_id))
+            resource_monitor.track(job_id, driver)
+        
+        print(f"Starting application for job {job_id} at {job_url}")
+        
+        # Navigate to the job URL
+        driver.get(job_url)
+        print(f"Loaded job page: {job_url}")
+        
+        # Wait for page to load, for as long as this ATS host usually needs
+        latency_tracker.note_page(driver, job_url)
+        latency_tracker.wait(driver, "page_load", EC.presence_of_element_located((By.TAG_NAME, "body")))
+        
+        if direct_form:
+            # Resolved ahead of time, we're already on the form
+            print("Job URL is the application form, skipping apply button search")
+            apply_buttons = []
+        else:
+            # Look for common application button patterns
+            apply_buttons = driver.find_elements(By.XPATH, 
+                "//a[contains(text(), 'Apply') or contains(@class, 'apply') or contains(@id, 'apply')]"
+            )
+        
+        if direct_form or apply_buttons:
+            if apply_buttons:
+                print(f"Found {len(apply_buttons)} possible apply buttons")
+                # Click the first apply button
+                apply_buttons[0].click()
+                print("Clicked apply button")
+                
+                # Wait for application form page to load
+                print("Waiting for application form to load...")
+                time.sleep(5)  # Allow longer time for page transition for better user experience
+                latency_tracker.note_page(driver)  # The form may be hosted by the ATS rather than the job board
+            
+            # Try to fill the form with user data
+            # Assume we're on an application form
+            try:
+                # Wait for form elements to be present
+                latency_tracker.wait(driver, "form", EC.presence_of_element_located((By.TAG_NAME, "form")))
+                
+                targets = None
+                schema_reused = False
+                if planned:
+                    # Matched from the prefetched schema already; only the elements need finding
+                    elements = locate_fields(driver, [schema[match["index"]] for match in planned])
+                    if all(elements):
+                        targets = [(element, schema[match["index"]], match) for element, match in zip(elements, planned)]
+                        schema_reused = True
+                        print(f"Filling {len(targets)} fields matched from the prefetched form schema")
+                    else:
+                        print("Prefetched form schema doesn't fit the live page, describing it again")
+                if targets is None:
+                    # Describe every field in one round trip, then map them all to the
+                    # profile in-process instead of probing the page field by field
+                    fields = extract_field_descriptors(driver)
+                    matches = match_fields([descriptor for _, descriptor in fields], user_data, values=profile_values)
+                    print(f"Matched {len(matches)} of {len(fields)} form fields to the user profile")
+                    targets = [(*fields[match["index"]], match) for match in matches]
+                for element, descriptor, match in targets:
+                    # match_fields only maps text-like fields, so typing is safe for all of them
+                    safe_send_keys(driver, element, match["value"], match["label"])
+                    # Pause briefly for visual feedback
+                    time.sleep(random.uniform(0.2, 0.5))
+                
+                # Take a screenshot for verification; encoding and storage happen off this thread
+                # The screenshot shows the applicant's details: it is only reachable with this
+                # application's unguessable token, never by the public job id alone
+                screenshot_token = secrets.token_urlsafe(24)
+                screenshot_store.capture(driver, screenshot_key(job_id, screenshot_token))
+                screenshot_path = f"/apply/{job_id}/screenshot/{screenshot_token}"
+                print(f"Queued form screenshot, served at {screenshot_path}")
+                
+                # Inform the user they can now complete the form manually
+                print("\n=====================================================")
+                print(f"BROWSER WINDOW OPEN FOR JOB: {job_id}")
+                print("Please complete the application form manually.")
+                print("THE BROWSER WILL REMAIN OPEN UNTIL YOU CLOSE IT.")
+                print("Close the browser window when you've finished the application.")
+                print("=====================================================\n")
+                
+                # Update application status to inform frontend
+                application_status[job_id] = {
+                    "status": "manual_interaction",
+                    "message": "Browser open for manual completion. Please close the browser when finished.",
+                    "timestamp": time.time()
+                }
+                
+                # Mark that we successfully filled at least some form fields
+                form_filled = True
+                
+                # Update application status
+                application_status[job_id] = {
+                    "status": "success",
+                    "message": "Successfully filled application form",
+                    "timestamp": time.time()
+                }
+                
+                return {
+                    "success": True,
+                    "message": "Application form filled successfully",
+                    "details": {"screenshot": screenshot_path, "schema_reused": schema_reused}
+                }
+                
+            except (TimeoutException, NoSuchElementException) as e:
+                error_msg = f"Error filling application form: {str(e)}"
+                print(error_msg)
+                application_status[job_id] = {
+                    "status": "failed",
+                    "message": error_msg,
+                    "timestamp": time.time()
+                }
+                return {"success": False, "message": error_msg}
+        else:
+            msg = "No apply button found on the page"
+            print(msg)
+            application_status[job_id] = {
+                "status": "failed",
+                "message": msg,
+                "timestamp": time.time()
+            }
+            return {"success": False, "message": msg}
+            
+    except Exception as e:
+        error_msg = f"Error processing application: {str(e)}"
+        print(error_msg)
+        application_status[job_id] = {
+            "status": "failed",
+            "message": error_msg,
+            "timestamp": time.time()
+        }
+        return {"success": False, "message": error_msg}
+    finally:
+        # Always show manual interaction message if we have a driver
+        if driver:
+            print("\n=====================================")
+            print("BROWSER WINDOW IS OPEN FOR MANUAL INTERACTION")
+            print("Please complete the application form manually")
+            print("THE BROWSER WILL REMAIN OPEN UNTIL YOU CLOSE IT")
+            print("Close the browser window when you've finished")
+            print("=====================================\n")
+            
+            # Update status to indicate manual interaction needed
+            application_status[job_id] = {
+                "status": "manual_interaction",
+                "message": "Browser open for manual completion. Please close the browser when finished.",
+                "timestamp": time.time()
+            }
+            
+            # Hand the browser to the shared watcher instead of polling it from
+            # this thread; the status flips to success once the user closes it
+            if tab is not None:
+                tab.deactivate()
+                session_watcher.register(job_id, driver, on_closed=mark_completed_manually,
+                                         probe=lambda: tab_pool.is_closed(job_id))
+            else:
+                session_watcher.register(job_id, driver, on_closed=mark_completed_manually)
+        elif tab is not None:
+            # The tab couldn't be driven; free its slot in the shared browser
+            tab_pool.close(job_id)
+        else:
+            # Chrome never started, give its memory reservation and profile back
+            resource_monitor.release(job_id)
+            chrome_profiles.release(job_id, harvest=False)
+
+def enqueue_application(job_id: str, job_url: str, user: UserData, direct_form: bool,
+                        profile_values: Optional[Dict[str, str]], schema: Optional[List[Dict[str, Any]]] = None):
+    user_data = user.model_dump() if hasattr(user, "model_dump") else user.dict()
+    task_id = apply_queue.enqueue(job_id, {
+        "job_id": job_id, "job_url": job_url, "user": user_data,
+        "direct_form": direct_form, "profile_values": profile_values, "schema": schema,
+    })
+    application_status[job_id] = {
+        "status": "queued",
+        "message": "Waiting for a browser worker",
+        "timestamp": time.time()
+    }
+    return task_id
+
+async def run_on_worker(job_id: str, job_url: str, user: UserData, direct_form: bool,
+                        profile_values: Optional[Dict[str, str]] = None, schema: Optional[List[Dict[str, Any]]] = None):
+    """Queues process_application for a worker node and waits up to APPLY_QUEUE_WAIT_S for its result.
+    If no worker finishes it by then, reports it as queued; the status endpoint follows it from there."""
+    task_id = await run_in_threadpool(enqueue_application, job_id, job_url, user, direct_form, profile_values, schema)
+    deadline = time.time() + QUEUE_WAIT_S
+    while time.time() < deadline:
+        state, result = await run_in_threadpool(apply_queue.result, task_id)
+        if state in ("done", "failed"):
+            return {**result, "details": {**result.get("details", {}), "task_id": task_id}}
+        await asyncio.sleep(QUEUE_POLL_S)
+    return {
+        "success": True,
+        "message": "Application queued for a browser worker, follow it on the status endpoint",
+        "details": {"queued": True, "task_id": task_id}
+    }
+
+async def run_application(request: Request, job: JobData, user: UserData, job_url: str, direct_submit: bool,
+                          profile_values: Optional[Dict[str, str]] = None, resume_path: Optional[str] = None):
+    """One execution of an application: direct submission when possible, otherwise the browser.
+    resume_path is the stored profile's resume in the blob store, never a path from the request.
+    Returns a dict with success, message and details."""
+    # The user picked a job: stop prefetching the others and use what was warmed up for this one
+    prefetched = request.app.state.form_prefetcher.take(job.id, prefetch_group(request))
+    if prefetched:
+        print(f"Using prefetched form for job {job.id} ({len(prefetched['fields'] or [])} fields)")
+    
+    # Resolve redirects and the Apply link over HTTP so the browser can open the form directly
+    # (answered from the resolver cache when the job was prefetched)
+    resolution = await run_in_threadpool(request.app.state.apply_link_resolver.resolve, job.id, job_url)
+    if resolution["is_form"]:
+        job_url = resolution["url"]
+    # A complete static schema of this very form lets the fill skip describing the page
+    schema = None
+    if prefetched and prefetched["complete"] and prefetched["fields"] and prefetched["url"] == job_url:
+        schema = prefetched["fields"]
+    
+    if direct_submit:
+        adapter = adapter_for(job_url, session=request.app.state.apply_link_resolver.session)
+        if adapter:
+            submission = await run_in_threadpool(adapter.submit, job_url, user, resume_path)
+            if submission["submitted"]:
+                application_status[job.id] = {
+                    "status": "success",
+                    "message": f"Application submitted through the {adapter.provider} API",
+                    "timestamp": time.time()
+                }
+                return {
+                    "success": True,
+                    "message": application_status[job.id]["message"],
+                    "details": {"submitted_via": adapter.provider, "elapsed_s": submission["elapsed_s"]}
+                }
+            print(f"Direct submission to {adapter.provider} not possible, using the browser: {submission['error']}")
+    
+    if apply_queue is not None:
+        # A browser worker node runs it; this process only waits for the result
+        result = await run_on_worker(job.id, job_url, user, resolution["is_form"], profile_values, schema)
+    else:
+        # Process application on a worker thread so other requests are still served meanwhile.
+        result = await run_in_threadpool(process_application, job.id, job_url, user, resolution["is_form"],
+                                         profile_values, schema)
+    return {**result, "details": {**result.get("details", {}), "prefetched": prefetched is not None}}
+
+@router.post("/apply", response_model=ApplicationResponse)
+async def apply_for_job(request: Request, application: ApplicationRequest = Body(...), direct_submit: bool = False):
+    """Apply for a job using the provided job and user data. Returns once the form has been
+    filled; the browser stays open for manual completion and the status endpoint reports
+    success after the user closes it.
+
+    With direct_submit=true, Greenhouse and Ashby jobs (when their API keys are configured)
+    are submitted through the provider API instead, with the resume uploaded to the stored
+    profile (POST /profiles/{user_id}/resume) when profileId is used; anything the
+    adapter can't handle falls back to the browser.
+
+    Instead of the whole user profile, the body can name a stored profile with profileId
+    (and optionally profileVersion, default latest) and send its owner token in
+    X-Profile-Token; see PUT /profiles/{user_id}."""
+    # Validated by FastAPI (422 on a malformed body); job listing extras are dropped
+    job, user, values, resume_path = application.job, application.user, None, None
+    if application.profileId:
+        if not await run_in_threadpool(profile_store.owns, application.profileId,
+                                       request.headers.get(PROFILE_TOKEN_HEADER)):
+            raise HTTPException(status_code=404, detail=f"No profile {application.profileId}")
+        try:
+            profile = await run_in_threadpool(profile_store.get, application.profileId, application.profileVersion)
+        except ProfileNotFound as e:
+            raise HTTPException(status_code=404, detail=str(e))
+        user, values, resume_path = profile.user, profile.values, profile.resume_path
+    elif user is None:
+        raise HTTPException(status_code=422, detail="Send either user or profileId")
+    else:
+        # Files are only ever read from the profile store; a path sent in the body is dropped
+        data = user.model_dump() if hasattr(user, "model_dump") else user.dict()
+        if data.pop("resumePath", None) is not None:
+            user = UserData(**data)
+    try:
+        print(f"Received application for job {job.id} at {job.company}")
+        
+        # Get the job URL
+        job_url = job.externalApplyLink or job.url
+        print(job.externalApplyLink)
+        if not job_url:
+            try:
+                # If no direct URL is provided, try to use the job ID to create a URL
+                # In production, you would query a database or API for the job URL
+                job_url = f"https://www.indeed.com/viewjob?jk={job.id}"
+                print(f"Using simulated job URL: {job_url}")
+            except Exception as e:
+                print(f"Error looking up job: {str(e)}")
+                return ApplicationResponse(
+                    success=False,
+                    message=f"Could not determine job URL: {str(e)}",
+                    job_id=job.id,
+                    company=job.company
+                )
+            
+        # Double-clicks and retries attach to the execution already running for this
+        # user, job and URL (across workers with IDEMPOTENCY_DB) instead of opening another browser
+        key = idempotency_key(user, job.id, job_url, request.headers.get("Idempotency-Key") or None)
+        result, deduplicated = await idempotency_registry.execute(
+            key, lambda: run_application(request, job, user, job_url, direct_submit, values, resume_path)
+        )
+        if deduplicated:
+            print(f"Duplicate application request for job {job.id}, sharing the existing result")
+        
+        # Return the actual result after the browser is closed
+        return ApplicationResponse(
+            success=result.get('success', False),
+            message=result.get('message', "Application process completed"),
+            job_id=job.id,
+            company=job.company,
+            details={
+                **result.get("details", {}),
+                "status": application_status.get(job.id, {}).get("status"),
+                "deduplicated": deduplicated,
+                "idempotency_key": key
+            }
+        )
+    except Exception as e:
+        print(f"Unexpected error processing application request: {str(e)}")
+        return ApplicationResponse(
+            success=False,
+            message=f"Error processing application: {str(e)}",
+            job_id=job.id,
+            company=job.company,
+            details={"error": str(e)}
+        )
+
+# Header carrying the owner token a profile's first save returned
+PROFILE_TOKEN_HEADER = "X-Profile-Token"
+
+async def authorize_profile_write(request: Request, user_id: str):
+    """Lets the owner of user_id through, or whoever creates it. Returns the token issued to a new
+    profile's creator (None for the owner); anyone else gets a 403."""
+    if await run_in_threadpool(profile_store.owns, user_id, request.headers.get(PROFILE_TOKEN_HEADER)):
+        return None
+    token = await run_in_threadpool(profile_store.issue_token, user_id)
+    if token is None:
+        raise HTTPException(status_code=403, detail=f"Profile {user_id} belongs to someone else; "
+                                                    f"send its owner token in {PROFILE_TOKEN_HEADER}")
+    return token
+
+def with_token(summary: Dict[str, Any], token: Optional[str]):
+    # The token is only ever shown once, to the profile's creator
+    return {**summary, "profileToken": token} if token else summary
+
+@router.put("/profiles/{user_id}")
+async def save_profile(request: Request, user_id: str, profile: UserData = Body(...)):
+    """Save the user's profile as a new version (unchanged content keeps the current version).
+
+    The first save of a user id returns a profileToken; every later request for
+    the profile, including /apply with profileId, must send it in X-Profile-Token."""
+    token = await authorize_profile_write(request, user_id)
+    data = profile.model_dump() if hasattr(profile, "model_dump") else profile.dict()
+    try:
+        saved = await run_in_threadpool(profile_store.put, user_id, data)
+    except ValueError as e:
+        if token:
+            await run_in_threadpool(profile_store.release, user_id)
+        raise HTTPException(status_code=400, detail=str(e))
+    return with_token(saved.summary(), token)
+
+@router.post("/profiles/{user_id}/resume")
+async def upload_resume(request: Request, user_id: str, filename: str = "resume.pdf"):
+    """Store the request body as the user's resume and save a profile version that uses it."""
+    token = await authorize_profile_write(request, user_id)
+    data = await request.body()
+    try:
+        digest = await run_in_threadpool(profile_store.put_resume, data, filename)
+        try:
+            current = (await run_in_threadpool(profile_store.get, user_id)).profile
+        except ProfileNotFound:
+            current = {}
+        saved = await run_in_threadpool(profile_store.put, user_id, current, digest)
+    except ValueError as e:
+        if token:
+            await run_in_threadpool(profile_store.release, user_id)
+        raise HTTPException(status_code=400, detail=str(e))
+    return with_token(saved.summary(), token)
+
+@router.get("/profiles/{user_id}")
+async def get_profile(request: Request, user_id: str, version: Optional[int] = None):
+    """A version of the user's profile (the latest by default); needs its X-Profile-Token."""
+    if not await run_in_threadpool(profile_store.owns, user_id, request.headers.get(PROFILE_TOKEN_HEADER)):
+        raise HTTPException(status_code=404, detail=f"No profile {user_id}")
+    try:
+        profile = await run_in_threadpool(profile_store.get, user_id, version)
+    except ProfileNotFound as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    return {**profile.summary(), "versions": await run_in_threadpool(profile_store.versions, user_id)}
+
+@router.get("/apply/{job_id}/status")
+async def get_application_status(request: Request, job_id: str):
+    """Get the current status of a job application.
+
+    The ETag and Last-Modified come from the status entry, so polling with
+    If-None-Match gets an empty 304 until the status changes (resource usage
+    is only refreshed along with it)."""
+    status = application_status.get(job_id)
+    if status is None:
+        raise HTTPException(status_code=404, detail="Application not found")
+    timestamp = status.get("timestamp")
+    etag = etag_for(job_id, status.get("status"), status.get("message"), status.get("view_url"), timestamp)
+    if not_modified(request, etag, timestamp):
+        return not_modified_response(etag, timestamp)
+    return conditional(request, FastJSONResponse({
+        "job_id": job_id,
+        **status,
+        "resources": resource_monitor.usage(job_id)
+    }), etag, timestamp)
+
+@router.post("/apply/resolve")
+async def resolve_apply_links(request: Request, jobs: List[JobData] = Body(...)):
+    """Resolve the application form URL for many jobs at once.
+
+    Only jobs this server found in a search are resolved, from the URLs it got
+    from the job board; URLs in the request body are ignored."""
+    resolver = request.app.state.apply_link_resolver
+    job_index = getattr(request.app.state, "job_index", None)
+    pairs, unknown = [], {}
+    for job in jobs:
+        indexed = job_index.get(job.id) if job_index is not None else None
+        if indexed is None:
+            unknown[job.id] = {"job_id": job.id, "url": None, "is_form": False, "ats": None, "chain": [],
+                               "error": "Unknown job, search for it first"}
+        else:
+            pairs.append((job.id, job_apply_url(indexed)))
+    return {**unknown, **await run_in_threadpool(resolver.resolve_many, pairs)}
+
+@router.get("/apply/{job_id}/prefetched")
+async def get_prefetched_form(request: Request, job_id: str):
+    """The form schema prefetched for a job after a search, if any."""
+    entry = request.app.state.form_prefetcher.cached(job_id)
+    if not entry:
+        raise HTTPException(status_code=404, detail="Nothing prefetched for this job")
+    return entry
+
+@router.get("/forms/analyze")
+async def analyze_form(request: Request, url: str):
+    """Field schema of an application form from its HTML alone. complete=false means
+    the page needs a browser to show the whole form. Only public http(s) URLs are fetched."""
+    try:
+        await run_in_threadpool(check_public_url, url)
+    except UnsafeURL as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Can't fetch {url}: {e}")
+    return await run_in_threadpool(request.app.state.form_analyzer.analyze, url)
+
+@router.get("/sessions")
+async def get_sessions():
+    """Memory/CPU of every open browser session, the global budget and the shared browser cache."""
+    return {**resource_monitor.summary(), "profiles": chrome_profiles.summary(),
+            "tabs": tab_pool.summary() if tab_pool is not None else None,
+            "queue": await run_in_threadpool(apply_queue.summary) if apply_queue is not None else None}
+
+@router.get("/latency")
+async def get_latency():
+    """Learned p50/p95 wait latencies and the resulting wait budgets, per ATS host and operation."""
+    return latency_tracker.summary()
+
+def screenshot_key(job_id: str, token: str):
+    return f"{job_id}:{token}"
+
+@router.get("/apply/{job_id}/screenshot/{token}")
+async def get_application_screenshot(job_id: str, token: str, thumb: bool = False):
+    """Serve the form screenshot of one application, at the path its /apply response returned.
+
+    It shows the applicant's personal details, so it must never be kept by shared caches."""
+    entry = await run_in_threadpool(screenshot_store.get, screenshot_key(job_id, token))
+    path = entry and screenshot_store.path_for(entry["digest"], thumbnail=thumb and entry["thumbnail"])
+    if not path:
+        raise HTTPException(status_code=404, detail="Screenshot not found")
+    return FileResponse(path, media_type=MEDIA_TYPES[path.rsplit(".", 1)[1]],
+                        headers={"Cache-Control": "private, no-store"})
@@ -0,0 +1,282 @@
+import os
+import re
+import time
+import socket
+import ipaddress
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urljoin, urlsplit, parse_qs
+
+import requests
+from requests.adapters import HTTPAdapter
+from bs4 import BeautifulSoup
+
+USER_AGENT = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36"
+
+# Hosts of applicant tracking systems we know how to recognise
+ATS_HOSTS = {
+    "boards.greenhouse.io": "greenhouse",
+    "job-boards.greenhouse.io": "greenhouse",
+    "jobs.ashbyhq.com": "ashby",
+    "jobs.lever.co": "lever",
+    "apply.workable.com": "workable",
+    "jobs.smartrecruiters.com": "smartrecruiters",
+}
+ATS_HOST_SUFFIXES = {
+    ".myworkdayjobs.com": "workday",
+    ".icims.com": "icims",
+    ".successfactors.com": "successfactors",
+    ".successfactors.eu": "successfactors",
+}
+
+# Set to fetch private/loopback addresses too (e.g. the local fixture server in tests)
+ALLOW_PRIVATE_URLS = os.environ.get("ALLOW_PRIVATE_URLS", "").lower() in ("1", "on", "true")
+
+
+class UnsafeURL(requests.exceptions.InvalidURL):
+    """Raised for URLs the server must not fetch: not http(s), or pointing at a private address."""
+
+
+def check_public_url(url):
+    """
+    Raises UnsafeURL unless url is http(s) and every address its host resolves
+    to is public, so client-supplied URLs can't reach loopback, the private
+    network or cloud metadata services (169.254.169.254).
+    """
+    parts = urlsplit(url or "")
+    if parts.scheme not in ("http", "https") or not parts.hostname:
+        raise UnsafeURL(f"Only http(s) URLs can be fetched: {url}")
+    if ALLOW_PRIVATE_URLS:
+        return
+    try:
+        infos = socket.getaddrinfo(parts.hostname, parts.port or (443 if parts.scheme == "https" else 80),
+                                   proto=socket.IPPROTO_TCP)
+    except (socket.gaierror, UnicodeError) as e:
+        raise requests.exceptions.ConnectionError(f"Failed to resolve {parts.hostname}: {e}")
+    for info in infos:
+        address = ipaddress.ip_address(info[4][0].split("%")[0])
+        if not address.is_global or address.is_multicast:
+            raise UnsafeURL(f"Refusing to fetch {parts.hostname}: it resolves to non-public address {address}")
+
+
+class PublicOnlyAdapter(HTTPAdapter):
+    """HTTPAdapter that runs check_public_url on every request, redirect hops included."""
+
+    def send(self, request, **kwargs):
+        check_public_url(request.url)
+        return super().send(request, **kwargs)
+
+
+def public_session(pool_size=8):
+    """A pooled requests.Session that only fetches public http(s) URLs."""
+    session = requests.Session()
+    adapter = PublicOnlyAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers["User-Agent"] = USER_AGENT
+    return session
+
+
+# Greenhouse embeds its board with a script tag; gh_jid on the host page picks the job
+GREENHOUSE_EMBED_RE = re.compile(r"boards\.greenhouse\.io/embed/job_board/js\?for=([\w-]+)")
+
+
+def detect_ats(url):
+    """Returns the ATS provider name for an apply URL, or None if it isn't a known ATS host."""
+    if not url:
+        return None
+    host = urlsplit(url).netloc.lower().split(":")[0]
+    if host in ATS_HOSTS:
+        return ATS_HOSTS[host]
+    for suffix, provider in ATS_HOST_SUFFIXES.items():
+        if host.endswith(suffix):
+            return provider
+    return None
+
+
+def ats_form_url(url):
+    """
+    Returns the URL of the application form itself for a known ATS job URL,
+    or None if we can't tell where the form lives from the URL alone.
+    """
+    provider = detect_ats(url)
+    parts = urlsplit(url)
+    path = parts.path.rstrip("/")
+    if provider == "greenhouse":
+        # embed/job_app and boards.greenhouse.io/<board>/jobs/<id> both render the form inline
+        if path.endswith("/embed/job_app") or "/jobs/" in path:
+            return url
+    elif provider == "ashby":
+        segments = [s for s in path.split("/") if s]
+        if len(segments) >= 2:
+            if segments[-1] == "application":
+                return url
+            return f"{parts.scheme}://{parts.netloc}{path}/application" + (f"?{parts.query}" if parts.query else "")
+    elif provider == "lever":
+        if path.endswith("/apply"):
+            return url
+        if len([s for s in path.split("/") if s]) >= 2:
+            return f"{parts.scheme}://{parts.netloc}{path}/apply"
+    return None
+
+
+def looks_like_application_form(soup):
+    """Heuristic for pages that already are the form: a <form> with several fillable fields."""
+    for form in soup.find_all("form"):
+        fields = form.find_all(["input", "textarea", "select"])
+        fillable = [
+            f for f in fields
+            if f.name != "input" or (f.get("type") or "text").lower() in ("text", "email", "tel", "file", "number")
+        ]
+        if len(fillable) >= 3:
+            return True
+    return False
+
+
+def find_apply_link(soup, page_url):
+    """
+    Picks the link most likely to lead to the application form, mirroring what
+    process_application would click: ATS links first, then the Greenhouse embed
+    board, then anything that says "Apply".
+    """
+    anchors = [a for a in soup.find_all("a") if a.get("href") and not a["href"].startswith(("#", "javascript:", "mailto:"))]
+
+    for a in anchors:
+        href = urljoin(page_url, a["href"])
+        if detect_ats(href):
+            return href
+
+    embed = GREENHOUSE_EMBED_RE.search(str(soup))
+    if embed:
+        gh_jid = parse_qs(urlsplit(page_url).query).get("gh_jid")
+        if gh_jid:
+            return f"https://boards.greenhouse.io/embed/job_app?for={embed.group(1)}&token={gh_jid[0]}"
+
+    for a in anchors:
+        text = a.get_text(" ", strip=True)
+        classes = " ".join(a.get("class") or [])
+        if "Apply" in text or "apply" in classes or "apply" in (a.get("id") or ""):
+            return urljoin(page_url, a["href"])
+    return None
+
+
+class ApplyLinkResolver:
+    """
+    Resolves job URLs to the final ATS application form over plain HTTP, so
+    the browser can open the form directly instead of rendering the job page
+    and hunting for an Apply button.
+
+    Results are cached per (job id, start URL) for `ttl` seconds, so a
+    resolution is only ever reused for the very URL it was made from. The cache
+    keeps at most cache_size entries, least recently used first out, and drops
+    expired ones whenever a new one is stored. One pooled requests.Session is
+    shared by all resolutions.
+
+    Args:
+        ttl: Seconds a resolution stays cached.
+        cache_size: Most resolutions kept.
+        timeout: Per-request timeout in seconds.
+        max_hops: How many Apply links to follow after HTTP redirects.
+        max_workers: Concurrency for resolve_many().
+    """
+
+    def __init__(self, ttl=6 * 3600, timeout=10, max_hops=3, max_workers=8, session=None, cache_size=10000):
+        self.ttl = ttl
+        self.cache_size = cache_size
+        self.timeout = timeout
+        self.max_hops = max_hops
+        self.max_workers = max_workers
+        self.cache = OrderedDict()   # (job_id, url) -> resolution, least recently used first
+        self.lock = threading.Lock()
+        # Job and apply URLs come from clients and job boards: never follow them into the private network
+        self.session = session or public_session(max_workers)
+
+    def cached(self, job_id, url):
+        """Returns the cached resolution of url for a job id if it hasn't expired."""
+        key = (job_id, url)
+        with self.lock:
+            entry = self.cache.get(key)
+            if entry and time.time() - entry["resolved_at"] < self.ttl:
+                self.cache.move_to_end(key)
+                return entry
+            self.cache.pop(key, None)
+            return None
+
+    def _store(self, key, entry):
+        with self.lock:
+            # Expired entries of jobs nobody resolves again are only dropped here
+            expired = [k for k, cached in self.cache.items() if entry["resolved_at"] - cached["resolved_at"] >= self.ttl]
+            for k in expired:
+                del self.cache[k]
+            self.cache[key] = entry
+            self.cache.move_to_end(key)
+            while len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)
+
+    def resolve(self, job_id, url):
+        """
+        Follows redirects and Apply links from url to the application form.
+
+        Returns:
+            dict with url (where the browser should go), is_form (True if that
+            URL is the form itself), ats, chain (every URL visited) and error.
+        """
+        entry = self.cached(job_id, url)
+        if entry:
+            return entry
+
+        result = {"job_id": job_id, "url": url, "is_form": False, "ats": detect_ats(url), "chain": [], "error": None}
+        current = url
+        try:
+            for _ in range(self.max_hops + 1):
+                form_url = ats_form_url(current)
+                if form_url:
+                    result.update(url=form_url, is_form=True, ats=detect_ats(form_url))
+                    break
+
+                response = self.session.get(current, timeout=self.timeout, allow_redirects=True)
+                result["chain"].extend([r.url for r in response.history] + [response.url])
+                response.raise_for_status()
+                result.update(url=response.url, ats=detect_ats(response.url))
+
+                form_url = ats_form_url(response.url)
+                if form_url:
+                    result.update(url=form_url, is_form=True)
+                    break
+
+                soup = BeautifulSoup(response.text, "html.parser")
+                if looks_like_application_form(soup):
+                    result["is_form"] = True
+                    break
+
+                next_url = find_apply_link(soup, response.url)
+                if not next_url or next_url in result["chain"]:
+                    break
+                current = next_url
+        except requests.RequestException as e:
+            # Leave it to the browser, which may get past what plain HTTP can't
+            result["error"] = str(e)
+
+        result["resolved_at"] = time.time()
+        if not result["error"]:
+            self._store((job_id, url), result)
+        return result
+
+    def resolve_many(self, jobs):
+        """
+        Resolves many (job_id, url) pairs concurrently.
+
+        Returns:
+            dict of job_id -> resolution.
+        """
+        jobs = list(jobs)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            results = pool.map(lambda job: self.resolve(*job), jobs)
+            return {job_id: result for (job_id, _), result in zip(jobs, results)}
+
+
+def job_apply_url(job):
+    """The URL process_application starts from for a JobData or job dict."""
+    get = job.get if isinstance(job, dict) else lambda key: getattr(job, key, None)
+    return get("externalApplyLink") or get("url") or f"https://www.indeed.com/viewjob?jk={get('id')}"
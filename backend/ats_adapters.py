@@ -0,0 +1,381 @@
+import os
+import re
+import json
+import time
+import mimetypes
+from abc import ABC, abstractmethod
+from urllib.parse import urlsplit, parse_qs
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from apply_links import USER_AGENT, detect_ats
+from field_matcher import match_fields
+
+try:
+    # Streams multipart bodies from disk instead of building them in memory
+    from requests_toolbelt import MultipartEncoder
+except ImportError:
+    MultipartEncoder = None
+
+# File fields that take the resume (others, like cover letters, are left out)
+RESUME_FIELD_RE = re.compile(r"resume|\bcv\b|curriculum", re.IGNORECASE)
+
+
+class UnsupportedApplication(Exception):
+    """Raised when an adapter can't submit this application itself; use the browser instead."""
+
+
+def _multipart_request(session, url, fields, files, **kwargs):
+    """
+    POSTs fields ([(name, text)]) and files ([(name, path)]) as multipart/form-data.
+
+    With requests_toolbelt installed the body is streamed straight from the
+    open files; otherwise requests assembles it from the same file handles.
+    """
+    handles = []
+    try:
+        parts = list(fields)
+        for name, path in files:
+            handle = open(path, "rb")
+            handles.append(handle)
+            mime = mimetypes.guess_type(path)[0] or "application/octet-stream"
+            parts.append((name, (os.path.basename(path), handle, mime)))
+        if MultipartEncoder is not None:
+            encoder = MultipartEncoder(fields=parts)
+            headers = {"Content-Type": encoder.content_type}
+            return session.post(url, data=encoder, headers=headers, **kwargs)
+        return session.post(url, data=fields, files=parts[len(fields):], **kwargs)
+    finally:
+        for handle in handles:
+            handle.close()
+
+
+class ATSAdapter(ABC):
+    """
+    Submits applications to one ATS through its API instead of a browser.
+
+    Subclasses turn an apply URL into the provider's job identifiers, describe
+    the job's questions as field descriptors (the shape match_fields takes),
+    and post the answers as one multipart request.
+
+    Args:
+        api_key: The provider API key (sent as HTTP basic auth username).
+        api_base: Base URL of the provider API (point it at the fixture server to test).
+        session: requests.Session to share.
+        timeout: Per-request timeout in seconds.
+    """
+
+    provider = None
+    default_api_base = None
+
+    def __init__(self, api_key, api_base=None, session=None, timeout=30):
+        self.api_key = api_key
+        self.api_base = (api_base or self.default_api_base).rstrip("/")
+        self.timeout = timeout
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=4)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            session.headers["User-Agent"] = USER_AGENT
+        self.session = session
+
+    @classmethod
+    def from_env(cls, session=None):
+        """An adapter configured from <PROVIDER>_API_KEY / <PROVIDER>_API_BASE, or None without a key."""
+        prefix = cls.provider.upper()
+        api_key = os.environ.get(f"{prefix}_API_KEY")
+        if not api_key:
+            return None
+        return cls(api_key, os.environ.get(f"{prefix}_API_BASE"), session=session)
+
+    @property
+    def auth(self):
+        return (self.api_key, "")
+
+    @abstractmethod
+    def job_reference(self, url):
+        """Provider identifiers for the job behind url. Raises UnsupportedApplication."""
+
+    @abstractmethod
+    def questions(self, reference):
+        """The job's questions as [(descriptor, required)]."""
+
+    @abstractmethod
+    def post(self, reference, answers, resume_fields, resume_path):
+        """Sends the application. Returns (accepted, response payload)."""
+
+    def plan(self, url, user, resume_path=None):
+        """
+        Works out what would be submitted, without submitting anything.
+
+        Returns:
+            dict with reference, answers ({field name: value}), resume_fields
+            and missing (labels of required questions we can't answer).
+        """
+        reference = self.job_reference(url)
+        questions = self.questions(reference)
+        descriptors = [descriptor for descriptor, _ in questions]
+
+        answers = {}
+        for match in match_fields(descriptors, user):
+            answers[descriptors[match["index"]]["name"]] = match["value"]
+
+        resume_fields = []
+        if resume_path:
+            for descriptor in descriptors:
+                if descriptor["type"] == "file" and RESUME_FIELD_RE.search(descriptor["label"] or descriptor["name"]):
+                    resume_fields.append(descriptor["name"])
+                    break
+
+        answered = set(answers) | set(resume_fields)
+        missing = []
+        for descriptor, required in questions:
+            # A question counts as answered when any of its fields is (e.g. resume file or resume text)
+            group = descriptor.get("question") or descriptor["name"]
+            if required and not any((d.get("question") or d["name"]) == group and d["name"] in answered
+                                    for d in descriptors):
+                if descriptor["label"] not in missing:
+                    missing.append(descriptor["label"])
+        return {"reference": reference, "answers": answers, "resume_fields": resume_fields, "missing": missing}
+
+    def submit(self, url, user, resume_path=None):
+        """
+        Submits the application for url with the user's profile.
+
+        Returns:
+            dict with submitted, provider, missing, response, elapsed_s and error.
+            submitted=False means the caller should fall back to the browser.
+        """
+        started = time.perf_counter()
+        result = {"submitted": False, "provider": self.provider, "missing": [], "response": None, "error": None}
+        try:
+            plan = self.plan(url, user, resume_path)
+            result["missing"] = plan["missing"]
+            if plan["missing"]:
+                result["error"] = f"Required questions we can't answer: {', '.join(plan['missing'])}"
+            else:
+                result["submitted"], result["response"] = self.post(
+                    plan["reference"], plan["answers"], plan["resume_fields"], resume_path
+                )
+                if not result["submitted"]:
+                    result["error"] = f"{self.provider} rejected the application"
+        except UnsupportedApplication as e:
+            result["error"] = str(e)
+        except (requests.RequestException, ValueError, KeyError) as e:
+            result["error"] = f"{self.provider} API error: {e}"
+        result["elapsed_s"] = round(time.perf_counter() - started, 3)
+        return result
+
+
+class GreenhouseAdapter(ATSAdapter):
+    """
+    Greenhouse Job Board API: GET /v1/boards/<board>/jobs/<id>?questions=true
+    for the questions, then a multipart POST to the same URL.
+    """
+
+    provider = "greenhouse"
+    default_api_base = "https://boards-api.greenhouse.io"
+
+    # Job Board API field types -> (tag, type) the browser extractor would report
+    FIELD_TYPES = {
+        "input_text": ("input", "text"),
+        "input_file": ("input", "file"),
+        "textarea": ("textarea", "textarea"),
+        "multi_value_single_select": ("select", "select"),
+        "multi_value_multi_select": ("select", "select"),
+    }
+
+    def job_reference(self, url):
+        parts = urlsplit(url)
+        query = parse_qs(parts.query)
+        segments = [s for s in parts.path.split("/") if s]
+        if "jobs" in segments and segments.index("jobs") >= 1 and len(segments) > segments.index("jobs") + 1:
+            # boards.greenhouse.io/<board>/jobs/<id>
+            at = segments.index("jobs")
+            return segments[at - 1], segments[at + 1]
+        if query.get("for") and query.get("token"):
+            # boards.greenhouse.io/embed/job_app?for=<board>&token=<id>
+            return query["for"][0], query["token"][0]
+        raise UnsupportedApplication(f"Can't tell the Greenhouse board and job id from {url}")
+
+    def job_url(self, reference):
+        board, job_id = reference
+        return f"{self.api_base}/v1/boards/{board}/jobs/{job_id}"
+
+    def questions(self, reference):
+        response = self.session.get(self.job_url(reference), params={"questions": "true"}, timeout=self.timeout)
+        response.raise_for_status()
+        questions = []
+        for question in response.json().get("questions", []):
+            for field in question["fields"]:
+                if field["type"] not in self.FIELD_TYPES:
+                    continue
+                tag, field_type = self.FIELD_TYPES[field["type"]]
+                questions.append(({
+                    "tag": tag,
+                    "type": field_type,
+                    "id": None,
+                    "name": field["name"],
+                    "label": question["label"],
+                    "aria_label": None,
+                    "placeholder": None,
+                    "autocomplete": None,
+                    "required": question["required"],
+                    "question": question["label"],
+                }, question["required"]))
+        return questions
+
+    def post(self, reference, answers, resume_fields, resume_path):
+        response = _multipart_request(
+            self.session, self.job_url(reference),
+            list(answers.items()), [(name, resume_path) for name in resume_fields],
+            auth=self.auth, timeout=self.timeout,
+        )
+        payload = response.json() if response.content else None
+        return response.ok, payload
+
+
+class AshbyAdapter(ATSAdapter):
+    """
+    Ashby API: jobPosting.info for the application form definition, then
+    applicationForm.submit with the answers as JSON and files as named parts.
+    """
+
+    provider = "ashby"
+    default_api_base = "https://api.ashbyhq.com"
+
+    FIELD_TYPES = {
+        "String": ("input", "text"),
+        "Email": ("input", "email"),
+        "Phone": ("input", "tel"),
+        "File": ("input", "file"),
+        "LongText": ("textarea", "textarea"),
+        "Boolean": ("select", "select"),
+        "ValueSelect": ("select", "select"),
+        "MultiValueSelect": ("select", "select"),
+    }
+
+    # Uuid-like posting id in jobs.ashbyhq.com/<org>/<posting id>[/application]
+    POSTING_ID_RE = re.compile(r"^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$")
+
+    def job_reference(self, url):
+        for segment in urlsplit(url).path.split("/"):
+            if self.POSTING_ID_RE.match(segment):
+                return segment
+        raise UnsupportedApplication(f"No Ashby job posting id in {url}")
+
+    def questions(self, reference):
+        response = self.session.post(f"{self.api_base}/jobPosting.info", json={"jobPostingId": reference},
+                                     auth=self.auth, timeout=self.timeout)
+        response.raise_for_status()
+        payload = response.json()
+        if not payload.get("success"):
+            raise UnsupportedApplication(f"Ashby has no posting {reference}: {payload.get('errors')}")
+        questions = []
+        for section in payload["results"]["applicationFormDefinition"]["sections"]:
+            for entry in section["fieldEntries"]:
+                field = entry["field"]
+                if field["type"] not in self.FIELD_TYPES:
+                    continue
+                tag, field_type = self.FIELD_TYPES[field["type"]]
+                questions.append(({
+                    "tag": tag,
+                    "type": field_type,
+                    "id": None,
+                    "name": field["path"],
+                    "label": field["title"],
+                    "aria_label": None,
+                    "placeholder": None,
+                    "autocomplete": None,
+                    "required": entry["isRequired"],
+                }, entry["isRequired"]))
+        return questions
+
+    def post(self, reference, answers, resume_fields, resume_path):
+        submissions = [{"path": path, "value": value} for path, value in answers.items()]
+        # File answers name the multipart part that carries the file
+        files = []
+        for i, path in enumerate(resume_fields):
+            part = f"resume_{i}"
+            submissions.append({"path": path, "value": part})
+            files.append((part, resume_path))
+        fields = [
+            ("jobPostingId", reference),
+            ("applicationForm", json.dumps({"fieldSubmissions": submissions})),
+        ]
+        response = _multipart_request(
+            self.session, f"{self.api_base}/applicationForm.submit", fields, files,
+            auth=self.auth, timeout=self.timeout,
+        )
+        response.raise_for_status()
+        payload = response.json()
+        return bool(payload.get("success")), payload
+
+
+# Used by the command line harness
+SAMPLE_PROFILE = {
+    "firstName": "Ada",
+    "lastName": "Lovelace",
+    "email": "ada@example.com",
+    "phone": "555-0100",
+    "githubUsername": "ada",
+    "city": "Boston",
+    "state": "MA",
+}
+
+ADAPTERS = {adapter.provider: adapter for adapter in (GreenhouseAdapter, AshbyAdapter)}
+
+
+def adapter_for(url, session=None):
+    """
+    The direct-submission adapter for an apply URL, or None when the provider
+    is unknown or no API key is configured for it (use the browser then).
+    """
+    adapter_class = ADAPTERS.get(detect_ats(url))
+    return adapter_class.from_env(session=session) if adapter_class else None
+
+
+def main():
+    import argparse
+    import tempfile
+    from fixture_server import start_fixture_server
+
+    parser = argparse.ArgumentParser(description="Submit sample applications through the ATS adapters")
+    parser.add_argument("urls", nargs="*", help="Apply URLs (default: the Greenhouse and Ashby jobs from jobs.py)")
+    parser.add_argument("--live", action="store_true",
+                        help="Use the real provider APIs (needs *_API_KEY) instead of the local stand-in server")
+    args = parser.parse_args()
+
+    urls = args.urls or [
+        "https://boards.greenhouse.io/veracode/jobs/7843495002",
+        "https://jobs.ashbyhq.com/Jerry/9458cca3-9c58-4aad-a579-7f5720c7ec87/application",
+    ]
+    server = None
+    if not args.live:
+        server, base_url = start_fixture_server()
+        os.environ.setdefault("GREENHOUSE_API_KEY", "local")
+        os.environ.setdefault("ASHBY_API_KEY", "local")
+        os.environ["GREENHOUSE_API_BASE"] = f"{base_url}/greenhouse-api"
+        os.environ["ASHBY_API_BASE"] = f"{base_url}/ashby-api"
+
+    resume = tempfile.NamedTemporaryFile(prefix="resume_", suffix=".pdf", delete=False)
+    resume.write(b"%PDF-1.4\n% sample resume\n%%EOF\n")
+    resume.close()
+    try:
+        for url in urls:
+            adapter = adapter_for(url)
+            if adapter is None:
+                print(f"{url}: no adapter configured, would use the browser")
+                continue
+            result = adapter.submit(url, SAMPLE_PROFILE, resume.name)
+            print(json.dumps({"url": url, **result}, indent=2))
+    finally:
+        os.unlink(resume.name)
+        if server:
+            server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,218 @@
+import io
+import os
+import sys
+import json
+import time
+import traceback
+import multiprocessing.util
+from contextlib import redirect_stdout
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from selenium.common.exceptions import WebDriverException
+
+from field_matcher import match_fields
+from formfiller import extract_field_descriptors, fill_all_pages, setup_headless_driver
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Page report counters summed over every page of a URL
+TOTAL_KEYS = ("text_found", "text_filled", "dropdowns_found", "dropdowns_filled", "files_found")
+
+# Per worker process: one headless browser reused across URLs, and the shared settings
+_worker = {"driver": None}
+
+
+def read_urls(path):
+    """Application URLs from a file, one per line; blank lines and # comments are skipped."""
+    with open(path) as f:
+        return [line.strip() for line in f if line.strip() and not line.lstrip().startswith("#")]
+
+
+def done_keys(path):
+    """Keys of the URLs that already have a line in an existing report, so a sweep can be picked up again."""
+    if not os.path.exists(path):
+        return set()
+    done = set()
+    with open(path) as f:
+        for line in f:
+            try:
+                report = json.loads(line)
+                done.add(report.get("key") or report["url"])
+            except (ValueError, KeyError):
+                continue  # A line cut short by a killed run
+    return done
+
+
+def _quit_driver():
+    driver = _worker.pop("driver", None)
+    if driver is not None:
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+
+def _init_worker(settings):
+    _worker.update(settings, driver=None)
+    # Runs when the pool shuts the worker down, so no Chrome outlives the sweep
+    multiprocessing.util.Finalize(None, _quit_driver, exitpriority=10)
+    if settings["project_index_path"]:
+        from project_index import ProjectIndex
+        _worker["project_index"] = ProjectIndex.load(settings["project_index_path"])
+
+
+def _driver():
+    if _worker.get("driver") is None:
+        driver = setup_headless_driver()
+        driver.set_page_load_timeout(_worker["page_timeout"])
+        _worker["driver"] = driver
+    return _worker["driver"]
+
+
+def fill_url(index, url, key=None):
+    """
+    Loads url in this worker's browser and runs fill_all_pages on it.
+
+    key identifies the URL across runs for --skip-done (default: the URL
+    itself; the fixture name for fixture sweeps, whose port changes every run).
+
+    Returns:
+        The report line for url: totals and per-page reports, how many fields
+        the profile maps to, timings, and the error if one was raised.
+    """
+    report = {"index": index, "url": url, "key": key or url, "worker": os.getpid(),
+              "started_at": time.strftime("%Y-%m-%dT%H:%M:%S")}
+    profile = _worker["profile"]
+    matched = []
+
+    def on_page_filled(driver, page_report):
+        # What the field matcher would map on this page, reported alongside what got filled
+        fields = extract_field_descriptors(driver)
+        matches = match_fields([descriptor for _, descriptor in fields], profile)
+        matched.append({"page": page_report["page"], "fields": len(fields), "matched": len(matches),
+                        "attributes": sorted(match["attribute"] for match in matches)})
+
+    # fill_form_page narrates every field; keep it in the report instead of the console
+    log = io.StringIO()
+    started = time.perf_counter()
+    try:
+        driver = _driver()
+        driver.delete_all_cookies()
+        with redirect_stdout(log if not _worker["verbose"] else sys.stdout):
+            driver.get(url)
+            loaded = time.perf_counter()
+            report["load_s"] = round(loaded - started, 3)
+            pages = fill_all_pages(driver, _worker["resume_path"], on_page_filled=on_page_filled,
+                                   max_pages=_worker["max_pages"], project_index=_worker.get("project_index"))
+        report["fill_s"] = round(time.perf_counter() - loaded, 3)
+        report["pages"] = pages
+        report["totals"] = {key: sum(page[key] for page in pages) for key in TOTAL_KEYS}
+        report["totals"]["resume_attached"] = any(page["resume_attached"] for page in pages)
+        report["form_found"] = any(page["form_found"] for page in pages)
+        report["profile_matches"] = matched
+        report["error"] = None
+    except Exception as e:
+        report["error"] = f"{type(e).__name__}: {str(e).strip()}"
+        report["traceback"] = traceback.format_exc(limit=5)
+        if isinstance(e, WebDriverException):
+            # The browser may be gone; the next URL gets a fresh one
+            _quit_driver()
+    report["elapsed_s"] = round(time.perf_counter() - started, 3)
+    report["log_tail"] = log.getvalue()[-2000:]
+    return report
+
+
+def run_batch(urls, output, workers=2, settings=None, on_report=None):
+    """
+    Fills every URL across a pool of worker processes, each with its own
+    headless browser, appending one JSON line per URL to output as it finishes.
+    urls are (index, url) or (index, url, key) tuples.
+
+    Returns:
+        Counts of URLs processed, with a form found, and failed.
+    """
+    summary = {"processed": 0, "form_found": 0, "failed": 0}
+    with open(output, "a") as out, \
+            ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(settings,)) as pool:
+        futures = [pool.submit(fill_url, *item) for item in urls]
+        for future in as_completed(futures):
+            report = future.result()
+            out.write(json.dumps(report) + "\n")
+            # Flushed per line so a long sweep that gets killed keeps what it did
+            out.flush()
+            summary["processed"] += 1
+            summary["form_found"] += bool(report.get("form_found"))
+            summary["failed"] += report["error"] is not None
+            if on_report:
+                on_report(report, summary)
+    return summary
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description="Run the form filler over a list of application URLs in parallel")
+    parser.add_argument("urls", nargs="?", help="File with one application URL per line")
+    parser.add_argument("-p", "--profile", help="Profile JSON (UserData fields); defaults to a sample profile")
+    parser.add_argument("-r", "--resume", help="Resume to upload (default: the profile's resumePath, else resume.pdf)")
+    parser.add_argument("-j", "--jobs", type=int, default=2, help="Parallel headless browsers")
+    parser.add_argument("-o", "--output", default="batch_fill.jsonl", help="JSONL report, appended to")
+    parser.add_argument("--skip-done", action="store_true", help="Skip URLs that already have a line in the report")
+    parser.add_argument("--max-pages", type=int, default=20, help="Pages to walk through per URL")
+    parser.add_argument("--page-timeout", type=float, default=60, help="Page load timeout in seconds")
+    parser.add_argument("--project-index", help="projects.bm25 to answer textareas from")
+    parser.add_argument("--fixtures", action="store_true", help="Sweep the offline ATS fixtures instead of a URL file")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Print the filler's output instead of capturing it")
+    args = parser.parse_args()
+
+    if args.profile:
+        with open(args.profile) as f:
+            profile = json.load(f)
+    else:
+        from ats_adapters import SAMPLE_PROFILE
+        profile = SAMPLE_PROFILE
+    resume_path = os.path.abspath(args.resume or profile.get("resumePath") or os.path.join(BACKEND_DIR, "resume.pdf"))
+    if not os.path.exists(resume_path):
+        print(f"Warning: resume {resume_path} not found, file inputs will be left empty")
+
+    server = None
+    if args.fixtures:
+        from fixture_server import load_manifest, start_fixture_server
+        server, base_url = start_fixture_server()
+        urls = [(f"{base_url}/{fixture['path']}", f"fixture:{fixture['name']}") for fixture in load_manifest()]
+    elif args.urls:
+        urls = [(url, url) for url in read_urls(args.urls)]
+    else:
+        parser.error("Give a URL file or --fixtures")
+
+    skipped = done_keys(args.output) if args.skip_done else set()
+    pending = [(index, url, key) for index, (url, key) in enumerate(urls) if key not in skipped]
+    print(f"Filling {len(pending)} URLs with {args.jobs} browsers ({len(urls) - len(pending)} already done)")
+
+    settings = {
+        "profile": profile,
+        "resume_path": resume_path,
+        "max_pages": args.max_pages,
+        "page_timeout": args.page_timeout,
+        "project_index_path": args.project_index,
+        "verbose": args.verbose,
+    }
+
+    def on_report(report, summary):
+        status = report["error"] or f"{report['totals']['text_filled']}/{report['totals']['text_found']} text, " \
+                                    f"{len(report['pages'])} pages"
+        print(f"[{summary['processed']}/{len(pending)}] {report['elapsed_s']:>6.1f}s  {report['url']}  {status}")
+
+    started = time.perf_counter()
+    try:
+        summary = run_batch(pending, args.output, workers=args.jobs, settings=settings, on_report=on_report)
+    finally:
+        if server is not None:
+            server.shutdown()
+    print(f"Done in {time.perf_counter() - started:.1f}s: {summary['processed']} URLs, "
+          f"{summary['form_found']} with a form, {summary['failed']} failed. Report: {args.output}")
+    # Non-zero for CI/cron when anything failed
+    sys.exit(1 if summary["failed"] else 0)
+
+
+if __name__ == "__main__":
+    main()
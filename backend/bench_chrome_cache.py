@@ -0,0 +1,136 @@
+import os
+import json
+import time
+import shutil
+import platform
+import statistics
+import tempfile
+
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.support.ui import WebDriverWait
+
+from bench_formfiller import RESULTS_DIR, git_revision
+from chrome_profiles import ProfileTemplate
+from fixture_server import load_manifest, start_fixture_server
+
+# Navigation timing plus how many subresources came from the disk cache (transferSize 0)
+PAGE_TIMING_JS = """
+const nav = performance.getEntriesByType('navigation')[0];
+const resources = performance.getEntriesByType('resource');
+return {
+    load_ms: nav.loadEventEnd - nav.startTime,
+    dom_content_loaded_ms: nav.domContentLoadedEventEnd - nav.startTime,
+    resources: resources.length,
+    cached_resources: resources.filter(r => r.transferSize === 0 && r.decodedBodySize > 0).length,
+    transfer_bytes: resources.reduce((total, r) => total + r.transferSize, 0),
+};
+"""
+
+
+def setup_profiled_driver(template, session_dir):
+    chrome_options = Options()
+    chrome_options.add_argument("--headless=new")
+    chrome_options.add_argument("--no-sandbox")
+    chrome_options.add_argument("--disable-dev-shm-usage")
+    chrome_options.add_argument("--window-size=1366,768")
+    for argument in template.chrome_arguments(session_dir):
+        chrome_options.add_argument(argument)
+    return webdriver.Chrome(options=chrome_options)
+
+
+def load_page(template, key, url):
+    """Opens url in a fresh session cloned from template and returns its timings."""
+    started = time.perf_counter()
+    session_dir = template.clone(key)
+    clone_s = time.perf_counter() - started
+    driver = setup_profiled_driver(template, session_dir)
+    try:
+        driver.get(url)
+        WebDriverWait(driver, 30).until(
+            lambda d: d.execute_script("return performance.getEntriesByType('navigation')[0].loadEventEnd > 0")
+        )
+        timing = driver.execute_script(PAGE_TIMING_JS)
+    finally:
+        driver.quit()
+        # Chrome has exited, so its cache can be harvested right away
+        template.release(key, wait=True)
+    timing["clone_ms"] = round(clone_s * 1000, 2)
+    return timing
+
+
+def summarise(runs):
+    summary = {key: round(statistics.median(run[key] for run in runs), 2) for key in runs[0]}
+    summary["runs"] = runs
+    return summary
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description="Compare cold and warm-cache page loads of the ATS fixtures")
+    parser.add_argument("-f", "--fixture", action="append", help="Only run this fixture (repeatable)")
+    parser.add_argument("-n", "--repeat", type=int, default=5, help="Loads per fixture and mode (median is reported)")
+    parser.add_argument("--delay", type=float, default=0.05, help="Fixture server latency per GET in seconds")
+    parser.add_argument("-o", "--output", help="Results JSON file (default: bench_results/chrome-cache-<rev>.json)")
+    args = parser.parse_args()
+
+    fixtures = [f for f in load_manifest() if not args.fixture or f["name"] in args.fixture]
+    if not fixtures:
+        parser.error("No matching fixtures")
+
+    server, base_url = start_fixture_server(delay=args.delay)
+    root = tempfile.mkdtemp(prefix="bench_chrome_cache_")
+    results = {}
+    try:
+        for fixture in fixtures:
+            url = f"{base_url}/{fixture['path']}"
+            cold, warm = [], []
+            for i in range(args.repeat):
+                # Cold: a brand new template every time, like the old throwaway profiles
+                cold_template = ProfileTemplate(os.path.join(root, f"cold-{fixture['name']}-{i}"))
+                cold.append(load_page(cold_template, f"cold{i}", url))
+                print(f"[{fixture['name']}] cold {i + 1}/{args.repeat}: {cold[-1]['load_ms']:.0f} ms")
+
+            # Warm: one priming load fills the shared cache, then every session is cloned from it
+            warm_template = ProfileTemplate(os.path.join(root, f"warm-{fixture['name']}"))
+            load_page(warm_template, "prime", url)
+            for i in range(args.repeat):
+                warm.append(load_page(warm_template, f"warm{i}", url))
+                print(f"[{fixture['name']}] warm {i + 1}/{args.repeat}: {warm[-1]['load_ms']:.0f} ms "
+                      f"({warm[-1]['cached_resources']}/{warm[-1]['resources']} from cache)")
+            results[fixture["name"]] = {
+                "cold": summarise(cold),
+                "warm": summarise(warm),
+                "template": warm_template.summary(),
+            }
+    finally:
+        server.shutdown()
+        shutil.rmtree(root, ignore_errors=True)
+
+    revision = git_revision()
+    report = {
+        "meta": {
+            "revision": revision,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "repeat": args.repeat,
+            "server_delay_s": args.delay,
+        },
+        "results": results,
+    }
+    output = args.output or os.path.join(RESULTS_DIR, f"chrome-cache-{revision}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+
+    print(f"\n{'fixture':<12} {'cold load':>10} {'warm load':>10} {'cached':>8} {'clone ms':>9}")
+    for name, result in results.items():
+        cold, warm = result["cold"], result["warm"]
+        print(f"{name:<12} {cold['load_ms']:>10} {warm['load_ms']:>10} "
+              f"{warm['cached_resources']:>4}/{warm['resources']:<3} {warm['clone_ms']:>9}")
+    print(f"Wrote results to {output}")
+
+
+if __name__ == "__main__":
+    main()
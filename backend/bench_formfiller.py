@@ -0,0 +1,241 @@
+import os
+import sys
+import json
+import time
+import random
+import platform
+import statistics
+import subprocess
+import tempfile
+from collections import Counter
+from contextlib import contextmanager
+
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+
+from browser_processes import process_tree_rss_mb
+from fixture_server import load_manifest, start_fixture_server
+from formfiller import fill_all_pages, setup_headless_driver
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench_results")
+
+# Metrics compared between runs, and whether a bigger number is worse
+COMPARED_METRICS = {
+    "wall_clock_s": True,
+    "webdriver_commands": True,
+    "peak_rss_mb": True,
+    "fields_filled_correctly": False,
+}
+
+# Counts what actually ended up in the DOM after a page was filled
+VERIFY_PAGE_JS = """
+const form = document.querySelector('form');
+if (!form) { return {text: 0, dropdowns: 0, files: 0}; }
+const expectedText = arguments[0];
+let text = 0, dropdowns = 0, files = 0;
+form.querySelectorAll("input[type='text'], input[type='email'], input[type='tel'], input[type='number'], input[type='password'], textarea")
+    .forEach(el => { if (el.value === expectedText) text++; });
+document.querySelectorAll('select').forEach(el => { if (el.value !== '') dropdowns++; });
+document.querySelectorAll("[role='combobox']").forEach(el => { if (el.getAttribute('data-value')) dropdowns++; });
+form.querySelectorAll("input[type='file']").forEach(el => { if (el.files && el.files.length) files++; });
+return {text: text, dropdowns: dropdowns, files: files};
+"""
+
+
+class CommandCounter:
+    """Counts WebDriver commands sent by a driver (one per HTTP round trip to chromedriver)."""
+
+    def __init__(self, driver):
+        self.counts = Counter()
+        self.paused = False
+        self._execute = driver.execute
+        # Shadow the bound method on the instance so every helper goes through us
+        driver.execute = self._counting_execute
+
+    def _counting_execute(self, driver_command, params=None):
+        if not self.paused:
+            self.counts[driver_command] += 1
+        return self._execute(driver_command, params)
+
+    @contextmanager
+    def pause(self):
+        """Don't count commands issued by the benchmark itself."""
+        self.paused = True
+        try:
+            yield
+        finally:
+            self.paused = False
+
+    def reset(self):
+        self.counts.clear()
+
+    @property
+    def total(self):
+        return sum(self.counts.values())
+
+
+def run_fixture(fixture, base_url, resume_path):
+    """Runs the filler once against a fixture in a fresh headless browser."""
+    started = time.perf_counter()
+    driver = setup_headless_driver()
+    startup_s = time.perf_counter() - started
+    counter = CommandCounter(driver)
+    browser_pid = driver.service.process.pid
+    verified = []
+    peak_rss_mb = 0.0
+
+    def on_page_filled(driver, page_report):
+        nonlocal peak_rss_mb
+        with counter.pause():
+            verified.append(driver.execute_script(VERIFY_PAGE_JS, "A"))
+        peak_rss_mb = max(peak_rss_mb, process_tree_rss_mb(browser_pid))
+
+    try:
+        with counter.pause():
+            driver.get(f"{base_url}/{fixture['path']}")
+            WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.TAG_NAME, "form")))
+        counter.reset()
+
+        fill_started = time.perf_counter()
+        pages = fill_all_pages(driver, resume_path, on_page_filled=on_page_filled)
+        wall_clock_s = time.perf_counter() - fill_started
+    finally:
+        driver.quit()
+
+    expected_total = sum(sum(page.values()) for page in fixture["expected"])
+    filled_correctly = sum(sum(page.values()) for page in verified)
+    return {
+        "wall_clock_s": wall_clock_s,
+        "browser_startup_s": startup_s,
+        "webdriver_commands": counter.total,
+        "commands_by_name": dict(counter.counts.most_common()),
+        "pages_expected": len(fixture["expected"]),
+        "pages_visited": len(pages),
+        "fields_expected": expected_total,
+        "fields_filled_correctly": filled_correctly,
+        "per_page": verified,
+        "peak_rss_mb": round(peak_rss_mb, 1),
+    }
+
+
+def summarise(runs):
+    """Collapses repeated runs of one fixture into medians (plus the raw runs)."""
+    summary = {}
+    for key in ("wall_clock_s", "browser_startup_s", "webdriver_commands", "peak_rss_mb", "fields_filled_correctly"):
+        summary[key] = round(statistics.median(run[key] for run in runs), 3)
+    for key in ("fields_expected", "pages_expected", "pages_visited", "commands_by_name"):
+        summary[key] = runs[-1][key]
+    summary["runs"] = [
+        {k: run[k] for k in ("wall_clock_s", "webdriver_commands", "peak_rss_mb", "fields_filled_correctly")}
+        for run in runs
+    ]
+    return summary
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except Exception:
+        return "unknown"
+
+
+def compare_results(current, baseline, threshold):
+    """
+    Prints a per-fixture comparison against a previous results file.
+
+    Returns:
+        The list of (fixture, metric, old, new) regressions beyond threshold.
+    """
+    regressions = []
+    print(f"\nComparing against {baseline['meta'].get('revision')} (threshold {threshold:.0%})")
+    print(f"{'fixture':<12} {'metric':<26} {'baseline':>10} {'current':>10} {'change':>9}")
+    for name, result in current["results"].items():
+        old = baseline["results"].get(name)
+        if not old:
+            print(f"{name:<12} (not in baseline)")
+            continue
+        for metric, higher_is_worse in COMPARED_METRICS.items():
+            before, after = old.get(metric), result.get(metric)
+            if before is None or after is None:
+                continue
+            change = (after - before) / before if before else 0.0
+            worse = change > threshold if higher_is_worse else change < -threshold
+            flag = "  REGRESSION" if worse else ""
+            print(f"{name:<12} {metric:<26} {before:>10} {after:>10} {change:>+8.1%}{flag}")
+            if worse:
+                regressions.append((name, metric, before, after))
+    return regressions
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description="Benchmark fill_form_page against the offline ATS fixtures")
+    parser.add_argument("-f", "--fixture", action="append", help="Only run this fixture (repeatable)")
+    parser.add_argument("-n", "--repeat", type=int, default=3, help="Runs per fixture (median is reported)")
+    parser.add_argument("-o", "--output", help="Results JSON file (default: bench_results/formfiller-<rev>.json)")
+    parser.add_argument("-c", "--compare", help="Previous results JSON file to compare against")
+    parser.add_argument("-t", "--threshold", type=float, default=0.15, help="Relative change counted as a regression")
+    parser.add_argument("--seed", type=int, default=1234, help="Seed for the filler's human-like random delays")
+    parser.add_argument("--delay", type=float, default=0.0, help="Artificial fixture server latency per GET in seconds")
+    args = parser.parse_args()
+
+    fixtures = [f for f in load_manifest() if not args.fixture or f["name"] in args.fixture]
+    if not fixtures:
+        parser.error("No matching fixtures")
+
+    server, base_url = start_fixture_server(delay=args.delay)
+    resume = tempfile.NamedTemporaryFile(prefix="bench_resume_", suffix=".pdf", delete=False)
+    resume.write(b"%PDF-1.4\n% benchmark resume\n%%EOF\n")
+    resume.close()
+
+    results = {}
+    try:
+        for fixture in fixtures:
+            runs = []
+            for i in range(args.repeat):
+                # Same seed per run so the random "human" pauses are identical between commits
+                random.seed(args.seed + i)
+                print(f"[{fixture['name']}] run {i + 1}/{args.repeat}")
+                runs.append(run_fixture(fixture, base_url, resume.name))
+            results[fixture["name"]] = summarise(runs)
+    finally:
+        server.shutdown()
+        os.unlink(resume.name)
+
+    revision = git_revision()
+    report = {
+        "meta": {
+            "revision": revision,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "repeat": args.repeat,
+            "seed": args.seed,
+            "server_delay_s": args.delay,
+        },
+        "results": results,
+    }
+
+    output = args.output or os.path.join(RESULTS_DIR, f"formfiller-{revision}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+
+    print(f"\n{'fixture':<12} {'wall (s)':>9} {'commands':>9} {'filled':>9} {'peak MB':>9}")
+    for name, result in results.items():
+        filled = f"{result['fields_filled_correctly']}/{result['fields_expected']}"
+        print(f"{name:<12} {result['wall_clock_s']:>9} {result['webdriver_commands']:>9} {filled:>9} {result['peak_rss_mb']:>9}")
+    print(f"Wrote results to {output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if compare_results(report, baseline, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
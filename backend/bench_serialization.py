@@ -0,0 +1,79 @@
+import json
+import time
+import statistics
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+import fast_json
+from fake_apify import make_fake_items
+from fast_json import FastJSONResponse, parse_fields, project_job, project_jobs
+from models import JobSummary
+
+SIZES = (50, 1000, 10000)
+
+# fields= a compact job list asks for
+LIST_FIELDS = "id,company,positionName,location,jobType,postedAt,url"
+
+
+def default_response(items):
+    """What /jobs did before: raw items through jsonable_encoder and JSONResponse."""
+    return JSONResponse(jsonable_encoder(items)).body
+
+
+def validated_response(items):
+    """The projection validated through JobSummary, like a response_model on a returned list."""
+    return JSONResponse(jsonable_encoder([JobSummary(**project_job(item)) for item in items])).body
+
+
+def projected_response(items):
+    return FastJSONResponse(project_jobs(items)).body
+
+
+def list_fields_response(items):
+    return FastJSONResponse(project_jobs(items, parse_fields(LIST_FIELDS))).body
+
+
+MODES = [
+    ("raw + jsonable_encoder", default_response),
+    ("JobSummary validated", validated_response),
+    ("projection + fast", projected_response),
+    ("fields (7) + fast", list_fields_response),
+]
+
+
+def measure(render, items, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        body = render(items)
+        timings.append(time.perf_counter() - started)
+    return {"bytes": len(body), "ms": round(statistics.median(timings) * 1000, 3)}
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description="Compare payload size and serialization time of /jobs responses")
+    parser.add_argument("-n", "--repeat", type=int, default=7, help="Renders per size and mode (median is reported)")
+    parser.add_argument("-o", "--output", help="Write results as JSON to this file")
+    args = parser.parse_args()
+
+    results = {}
+    for size in SIZES:
+        items = make_fake_items(size)
+        results[size] = {name: measure(render, items, args.repeat) for name, render in MODES}
+
+    print(f"encoder: {'orjson' if fast_json.orjson is not None else 'json (orjson not installed)'}")
+    print(f"{'jobs':>6}  {'mode':<24} {'KB':>10} {'ms':>10}")
+    for size, modes in results.items():
+        for name, r in modes.items():
+            print(f"{size:>6}  {name:<24} {r['bytes'] / 1024:>10.1f} {r['ms']:>10}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"orjson": fast_json.orjson is not None, "results": results}, f, indent=2)
+        print(f"Wrote results to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+import os
+import sys
+import json
+import statistics
+import subprocess
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Runs inside a fresh interpreter: build the app, run its startup, report timings
+CHILD_SCRIPT = r"""
+import sys, time, json, asyncio, resource
+started = time.perf_counter()
+components = tuple(sys.argv[1].split(","))
+eager = sys.argv[2] == "eager"
+if eager:
+    # What the old monolithic main.py paid at import time
+    import selenium.webdriver, formfiller, apify_client
+from app_factory import create_app
+app = create_app(components)
+imported = time.perf_counter()
+
+async def startup():
+    async with app.router.lifespan_context(app):
+        pass
+
+asyncio.run(startup())
+ready = time.perf_counter()
+print(json.dumps({
+    "import_s": imported - started,
+    "ready_s": ready - started,
+    # ru_maxrss is KB on Linux
+    "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    "modules": len(sys.modules),
+    "selenium_loaded": "selenium" in sys.modules,
+    "apify_loaded": "apify_client" in sys.modules,
+}))
+"""
+
+CONFIGURATIONS = [
+    ("search", "search", "lazy"),
+    ("apply", "apply", "lazy"),
+    ("search+apply", "search,apply", "lazy"),
+    ("monolith (eager)", "search,apply", "eager"),
+]
+
+
+def measure(components, mode):
+    output = subprocess.check_output(
+        [sys.executable, "-c", CHILD_SCRIPT, components, mode], cwd=BACKEND_DIR, text=True
+    )
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description="Measure cold start and memory of each app tier")
+    parser.add_argument("-n", "--repeat", type=int, default=5, help="Fresh interpreters per configuration")
+    parser.add_argument("-o", "--output", help="Write results as JSON to this file")
+    args = parser.parse_args()
+
+    results = {}
+    for name, components, mode in CONFIGURATIONS:
+        runs = [measure(components, mode) for _ in range(args.repeat)]
+        results[name] = {
+            "import_s": round(statistics.median(r["import_s"] for r in runs), 4),
+            "ready_s": round(statistics.median(r["ready_s"] for r in runs), 4),
+            "peak_rss_mb": round(statistics.median(r["peak_rss_mb"] for r in runs), 1),
+            "modules": runs[-1]["modules"],
+            "selenium_loaded": runs[-1]["selenium_loaded"],
+            "apify_loaded": runs[-1]["apify_loaded"],
+        }
+
+    print(f"{'configuration':<18} {'import s':>9} {'ready s':>9} {'RSS MB':>8} {'modules':>8}  selenium  apify")
+    for name, r in results.items():
+        print(f"{name:<18} {r['import_s']:>9} {r['ready_s']:>9} {r['peak_rss_mb']:>8} {r['modules']:>8}  "
+              f"{str(r['selenium_loaded']):<8}  {r['apify_loaded']}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Wrote results to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
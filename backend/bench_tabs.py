@@ -0,0 +1,140 @@
+import os
+import io
+import json
+import time
+import platform
+import tempfile
+import threading
+from contextlib import redirect_stdout
+from concurrent.futures import ThreadPoolExecutor
+
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+
+from bench_formfiller import RESULTS_DIR, git_revision
+from browser_processes import process_tree_rss_mb
+from fixture_server import load_manifest, start_fixture_server
+from formfiller import fill_all_pages, setup_headless_driver
+from tab_pool import TabPool
+
+
+def fill(driver, url, resume_path):
+    driver.get(url)
+    WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.TAG_NAME, "form")))
+    # Keep the filler's narration out of the benchmark output
+    with redirect_stdout(io.StringIO()):
+        pages = fill_all_pages(driver, resume_path)
+    return sum(page["text_filled"] for page in pages)
+
+
+def total_rss_mb(drivers):
+    return sum(process_tree_rss_mb(driver.service.process.pid) for driver in drivers)
+
+
+def run_browser_per_application(urls, resume_path, concurrency):
+    """The current model: every application starts (and keeps) its own Chrome."""
+    drivers = []
+    lock = threading.Lock()
+
+    def apply(url):
+        driver = setup_headless_driver()
+        with lock:
+            drivers.append(driver)
+        return fill(driver, url, resume_path)
+
+    started = time.perf_counter()
+    try:
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            filled = list(pool.map(apply, urls))
+        elapsed = time.perf_counter() - started
+        # Every application is still open, as when users finish them by hand
+        rss_mb = total_rss_mb(drivers)
+    finally:
+        for driver in drivers:
+            driver.quit()
+    return {"elapsed_s": elapsed, "rss_mb": rss_mb, "browsers": len(drivers), "fields_filled": sum(filled)}
+
+
+def run_tabs(urls, resume_path, concurrency, tabs_per_browser, isolate=True):
+    """Applications as (isolated) tabs, tabs_per_browser to a Chrome."""
+    pool = TabPool(lambda key: setup_headless_driver(), tabs_per_browser=tabs_per_browser, isolate=isolate)
+
+    def apply(item):
+        index, url = item
+        tab = pool.open(f"app{index}")
+        with tab.active() as driver:
+            return fill(driver, url, resume_path)
+
+    started = time.perf_counter()
+    try:
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            filled = list(executor.map(apply, enumerate(urls)))
+        elapsed = time.perf_counter() - started
+        drivers = [browser.driver for browser in pool.browsers.values()]
+        rss_mb = total_rss_mb(drivers)
+    finally:
+        for key in list(pool.sessions):
+            pool.close(key)
+    return {"elapsed_s": elapsed, "rss_mb": rss_mb, "browsers": len(drivers), "fields_filled": sum(filled)}
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description="Memory and throughput of tabs vs one browser per application")
+    parser.add_argument("-a", "--applications", type=int, default=12, help="Applications kept open at once")
+    parser.add_argument("-c", "--concurrency", type=int, default=4, help="Applications filled in parallel")
+    parser.add_argument("-t", "--tabs", type=int, action="append", help="Tabs per browser to try (repeatable)")
+    parser.add_argument("--no-isolation", action="store_true", help="Plain tabs instead of separate browser contexts")
+    parser.add_argument("-o", "--output", help="Results JSON file (default: bench_results/tabs-<rev>.json)")
+    args = parser.parse_args()
+
+    fixtures = load_manifest()
+    server, base_url = start_fixture_server()
+    urls = [f"{base_url}/{fixtures[i % len(fixtures)]['path']}" for i in range(args.applications)]
+    resume = tempfile.NamedTemporaryFile(prefix="bench_resume_", suffix=".pdf", delete=False)
+    resume.write(b"%PDF-1.4\n% benchmark resume\n%%EOF\n")
+    resume.close()
+
+    results = {}
+    try:
+        results["browser per application"] = run_browser_per_application(urls, resume.name, args.concurrency)
+        for tabs in args.tabs or [4, 8]:
+            results[f"{tabs} tabs per browser"] = run_tabs(urls, resume.name, args.concurrency, tabs,
+                                                          isolate=not args.no_isolation)
+    finally:
+        server.shutdown()
+        os.remove(resume.name)
+
+    for result in results.values():
+        result["mb_per_application"] = round(result["rss_mb"] / args.applications, 1)
+        result["applications_per_gb"] = round(1024 / result["mb_per_application"], 1) if result["rss_mb"] else None
+        result["applications_per_min"] = round(60 * args.applications / result["elapsed_s"], 1)
+
+    revision = git_revision()
+    report = {
+        "meta": {
+            "revision": revision,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "applications": args.applications,
+            "concurrency": args.concurrency,
+            "isolated": not args.no_isolation,
+        },
+        "results": results,
+    }
+    output = args.output or os.path.join(RESULTS_DIR, f"tabs-{revision}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+
+    print(f"\n{'mode':<24} {'browsers':>8} {'RSS MB':>8} {'MB/app':>7} {'apps/GB':>8} {'apps/min':>9} {'filled':>7}")
+    for name, r in results.items():
+        print(f"{name:<24} {r['browsers']:>8} {r['rss_mb']:>8.0f} {r['mb_per_application']:>7} "
+              f"{r['applications_per_gb']:>8} {r['applications_per_min']:>9} {r['fields_filled']:>7}")
+    print(f"Wrote results to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+import os
+
+try:
+    import psutil
+except ImportError:  # Fall back to /proc on Linux
+    psutil = None
+
+
+def _proc_children(pid):
+    """Returns the direct children of pid by scanning /proc (Linux only)."""
+    children = []
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                # The command name can contain spaces, so split after the closing paren
+                fields = f.read().rsplit(")", 1)[1].split()
+            if int(fields[1]) == pid:
+                children.append(int(entry))
+        except (OSError, IndexError, ValueError):
+            continue
+    return children
+
+
+def can_inspect_processes():
+    """True if process liveness can be checked without WebDriver commands."""
+    return psutil is not None or os.path.isdir("/proc")
+
+
+def descendant_pids(pid):
+    """All descendants of pid (children, grandchildren, ...)."""
+    if psutil:
+        try:
+            return [p.pid for p in psutil.Process(pid).children(recursive=True)]
+        except psutil.NoSuchProcess:
+            return []
+    found = []
+    pending = [pid]
+    while pending:
+        children = _proc_children(pending.pop())
+        found.extend(children)
+        pending.extend(children)
+    return found
+
+
+def pid_alive(pid):
+    """True if pid is running (zombies waiting to be reaped count as dead)."""
+    if psutil:
+        try:
+            return psutil.Process(pid).status() != psutil.STATUS_ZOMBIE
+        except psutil.NoSuchProcess:
+            return False
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            return f.read().rsplit(")", 1)[1].split()[0] != "Z"
+    except (OSError, IndexError):
+        return False
+
+
+def process_tree_rss_mb(root_pid):
+    """Total resident memory of a process and all its descendants, in MB."""
+    if psutil:
+        try:
+            root = psutil.Process(root_pid)
+            procs = [root] + root.children(recursive=True)
+        except psutil.NoSuchProcess:
+            return 0.0
+        total = 0
+        for proc in procs:
+            try:
+                total += proc.memory_info().rss
+            except psutil.NoSuchProcess:
+                pass
+        return total / (1024 * 1024)
+
+    total_kb = 0
+    for pid in [root_pid] + descendant_pids(root_pid):
+        try:
+            with open(f"/proc/{pid}/status") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        total_kb += int(line.split()[1])
+                        break
+        except OSError:
+            continue
+    return total_kb / 1024
+
+
+def process_tree_usage(root_pid):
+    """
+    Memory and CPU of a process and all its descendants.
+
+    Returns:
+        dict with rss_mb, cpu_s (user + system seconds so far) and processes.
+    """
+    pids = [root_pid] + descendant_pids(root_pid)
+    rss = 0
+    cpu_s = 0.0
+    counted = 0
+    if psutil:
+        for pid in pids:
+            try:
+                proc = psutil.Process(pid)
+                with proc.oneshot():
+                    rss += proc.memory_info().rss
+                    times = proc.cpu_times()
+                    cpu_s += times.user + times.system
+                counted += 1
+            except psutil.NoSuchProcess:
+                continue
+    else:
+        ticks = os.sysconf("SC_CLK_TCK")
+        page_size = os.sysconf("SC_PAGE_SIZE")
+        for pid in pids:
+            try:
+                with open(f"/proc/{pid}/stat") as f:
+                    fields = f.read().rsplit(")", 1)[1].split()
+                # utime/stime are fields 14/15 of stat, rss (in pages) is 24
+                cpu_s += (int(fields[11]) + int(fields[12])) / ticks
+                rss += int(fields[21]) * page_size
+                counted += 1
+            except (OSError, IndexError, ValueError):
+                continue
+    return {"rss_mb": rss / (1024 * 1024), "cpu_s": cpu_s, "processes": counted}
+
+
+def driver_pids(driver):
+    """
+    (chromedriver pid, browser pids) for a Selenium Chrome driver.
+
+    Browser pids are the direct children of chromedriver, i.e. the main
+    Chrome process(es); renderers and helpers hang off those.
+    """
+    service = getattr(driver, "service", None)
+    process = getattr(service, "process", None)
+    if process is None:
+        return None, []
+    if psutil:
+        try:
+            return process.pid, [p.pid for p in psutil.Process(process.pid).children()]
+        except psutil.NoSuchProcess:
+            return process.pid, []
+    if os.path.isdir("/proc"):
+        return process.pid, _proc_children(process.pid)
+    return process.pid, []
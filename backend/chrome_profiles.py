@@ -0,0 +1,261 @@
+import os
+import time
+import hashlib
+import shutil
+import tempfile
+import threading
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows: no reflinks and no cross-process lock, hardlinks/copies still work
+    fcntl = None
+
+# ioctl that asks the filesystem (btrfs, xfs, APFS via cp -c, ...) for a copy-on-write clone
+FICLONE = 0x40049409
+
+# Read-only modes don't stop root, so a root-run Chrome could write through a hardlink into the template
+HARDLINKS_PROTECTED = not (hasattr(os, "geteuid") and os.geteuid() == 0)
+
+# Cache bookkeeping Chrome rebuilds from the entry files; never shared between sessions
+CACHE_INDEX_NAMES = ("index", "the-real-index", "LOCK", "LOG", "LOG.old")
+
+
+def clone_file(src, dst):
+    """
+    Clones src to dst as cheaply as the filesystem allows.
+
+    Returns:
+        "reflink", "hardlink" or "copy". Hardlinked files are read-only (see
+        ProfileTemplate), so a browser that wants to change one replaces it
+        instead of writing through to the shared template.
+    """
+    if fcntl is not None:
+        try:
+            with open(src, "rb") as s, open(dst, "wb") as d:
+                fcntl.ioctl(d.fileno(), FICLONE, s.fileno())
+            os.chmod(dst, 0o644)
+            return "reflink"
+        except OSError:
+            try:
+                os.remove(dst)
+            except OSError:
+                pass
+    if HARDLINKS_PROTECTED:
+        try:
+            os.link(src, dst)
+            return "hardlink"
+        except OSError:
+            pass
+    shutil.copy2(src, dst)
+    os.chmod(dst, 0o644)
+    return "copy"
+
+
+def tree_size(path):
+    total = 0
+    for root, _, names in os.walk(path):
+        for name in names:
+            try:
+                total += os.lstat(os.path.join(root, name)).st_size
+            except OSError:
+                pass
+    return total
+
+
+class ProfileTemplate:
+    """
+    A managed Chrome profile template with a shared, size-capped disk cache.
+
+    Every session gets its own user-data dir and disk-cache dir, cloned from
+    the template (reflinks where the filesystem supports them, otherwise
+    hardlinks to read-only files, otherwise copies), so ATS scripts, styles
+    and fonts fetched by earlier sessions are already on disk. When a session
+    ends, the cache entries it added are harvested back into the template and
+    the session directory is removed. compact() keeps the shared cache under
+    cache_max_mb by dropping the least recently used entries.
+
+    Chrome never shares a live cache directory, which it doesn't support; only
+    finished sessions' entries are merged, under a lock that also holds across
+    API worker processes.
+
+    Args:
+        root: Directory holding template/ and sessions/.
+        cache_max_mb: Size cap for the shared cache.
+        compact_interval: Seconds between automatic compactions.
+        harvest_delay: Seconds to wait after release() so Chrome has exited
+            and flushed its cache before it is harvested.
+    """
+
+    def __init__(self, root, cache_max_mb=512, compact_interval=3600, harvest_delay=5.0):
+        self.root = root
+        self.template_dir = os.path.join(root, "template")
+        self.profile_dir = os.path.join(self.template_dir, "profile")
+        self.cache_dir = os.path.join(self.template_dir, "cache")
+        self.sessions_dir = os.path.join(root, "sessions")
+        self.cache_max_bytes = int(cache_max_mb * 1024 * 1024)
+        self.compact_interval = compact_interval
+        self.harvest_delay = harvest_delay
+        self.lock = threading.Lock()
+        self.sessions = {}
+        self.last_compacted = 0.0
+        self.stats = {"clones": 0, "reflink": 0, "hardlink": 0, "copy": 0, "harvested": 0, "evicted": 0}
+        for path in (self.profile_dir, self.cache_dir, self.sessions_dir):
+            os.makedirs(path, exist_ok=True)
+        # Skips Chrome's first-run work (welcome page, default browser check) in every clone
+        open(os.path.join(self.profile_dir, "First Run"), "a").close()
+
+    @classmethod
+    def from_env(cls):
+        """Configured by CHROME_PROFILE_DIR and CHROME_CACHE_MAX_MB."""
+        return cls(
+            root=os.environ.get("CHROME_PROFILE_DIR", os.path.join(tempfile.gettempdir(), "job-app-chrome-profiles")),
+            cache_max_mb=float(os.environ.get("CHROME_CACHE_MAX_MB", 512)),
+        )
+
+    @contextmanager
+    def _shared_lock(self):
+        """Exclusive lock on the template for this thread and, where possible, other processes."""
+        with self.lock, open(os.path.join(self.root, ".lock"), "w") as handle:
+            if fcntl is not None:
+                fcntl.flock(handle, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(handle, fcntl.LOCK_UN)
+
+    def _clone_tree(self, src_root, dst_root):
+        methods = {}
+        for root, dirs, names in os.walk(src_root):
+            relative = os.path.relpath(root, src_root)
+            target = os.path.normpath(os.path.join(dst_root, relative))
+            os.makedirs(target, exist_ok=True)
+            for name in names:
+                method = clone_file(os.path.join(root, name), os.path.join(target, name))
+                methods[method] = methods.get(method, 0) + 1
+        return methods
+
+    def clone(self, key):
+        """
+        Creates the profile for a new session.
+
+        Returns:
+            The session directory; pass it to chrome_arguments().
+        """
+        # The key comes from clients (a job id), so it only names the session in self.sessions;
+        # the directory is named after its hash and can't escape sessions_dir
+        digest = hashlib.sha256(str(key).encode("utf-8")).hexdigest()[:16]
+        session_dir = os.path.join(self.sessions_dir, f"{digest}-{os.getpid()}-{time.time_ns()}")
+        with self._shared_lock():
+            methods = self._clone_tree(self.profile_dir, os.path.join(session_dir, "profile"))
+            for method, count in self._clone_tree(self.cache_dir, os.path.join(session_dir, "cache")).items():
+                methods[method] = methods.get(method, 0) + count
+        with self.lock:
+            self.sessions[key] = session_dir
+            self.stats["clones"] += 1
+            for method, count in methods.items():
+                self.stats[method] += count
+        return session_dir
+
+    def chrome_arguments(self, session_dir):
+        """Command line switches that point Chrome at a cloned session."""
+        return [
+            f"--user-data-dir={os.path.join(session_dir, 'profile')}",
+            f"--disk-cache-dir={os.path.join(session_dir, 'cache')}",
+            f"--disk-cache-size={self.cache_max_bytes}",
+        ]
+
+    def release(self, key, harvest=True, wait=False):
+        """
+        Ends a session: after harvest_delay, merges its new cache entries into
+        the template (if harvest) and deletes its directory. Returns immediately
+        unless wait is True (for callers that already quit the browser).
+        """
+        with self.lock:
+            session_dir = self.sessions.pop(key, None)
+        if session_dir is None:
+            return
+        if wait:
+            return self._finish(session_dir, harvest)
+        timer = threading.Timer(self.harvest_delay, self._finish, (session_dir, harvest))
+        timer.daemon = True
+        timer.start()
+
+    def _finish(self, session_dir, harvest):
+        try:
+            if harvest:
+                self.harvest(os.path.join(session_dir, "cache"))
+        except Exception as e:
+            print(f"Error harvesting browser cache from {session_dir}: {e}")
+        finally:
+            shutil.rmtree(session_dir, ignore_errors=True)
+        if time.time() - self.last_compacted > self.compact_interval:
+            self.compact()
+
+    def harvest(self, session_cache_dir):
+        """
+        Copies cache entries a session created into the shared cache and marks
+        entries it reused as recently used. Returns how many entries were added.
+        """
+        added = 0
+        now = time.time()
+        with self._shared_lock():
+            for root, _, names in os.walk(session_cache_dir):
+                relative = os.path.relpath(root, session_cache_dir)
+                target_dir = os.path.normpath(os.path.join(self.cache_dir, relative))
+                for name in names:
+                    if name in CACHE_INDEX_NAMES:
+                        continue
+                    src = os.path.join(root, name)
+                    dst = os.path.join(target_dir, name)
+                    if os.path.exists(dst):
+                        os.utime(dst, (now, now))
+                        continue
+                    os.makedirs(target_dir, exist_ok=True)
+                    tmp = f"{dst}.tmp{os.getpid()}"
+                    shutil.copyfile(src, tmp)
+                    # Read-only, so hardlinked clones can't modify the template in place
+                    os.chmod(tmp, 0o444)
+                    os.replace(tmp, dst)
+                    added += 1
+        with self.lock:
+            self.stats["harvested"] += added
+        return added
+
+    def compact(self):
+        """
+        Drops stale index files and the least recently used cache entries until
+        the shared cache fits in cache_max_mb. Returns how many entries were removed.
+        """
+        removed = 0
+        with self._shared_lock():
+            entries = []
+            for root, _, names in os.walk(self.cache_dir):
+                for name in names:
+                    path = os.path.join(root, name)
+                    if name in CACHE_INDEX_NAMES or ".tmp" in name:
+                        os.remove(path)
+                        continue
+                    stat = os.stat(path)
+                    entries.append((stat.st_mtime, stat.st_size, path))
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in sorted(entries):
+                if total <= self.cache_max_bytes:
+                    break
+                os.remove(path)
+                total -= size
+                removed += 1
+            self.last_compacted = time.time()
+        with self.lock:
+            self.stats["evicted"] += removed
+        return removed
+
+    def summary(self):
+        with self.lock:
+            return {
+                **self.stats,
+                "active_sessions": len(self.sessions),
+                "cache_mb": round(tree_size(self.cache_dir) / (1024 * 1024), 1),
+                "cache_max_mb": round(self.cache_max_bytes / (1024 * 1024), 1),
+            }
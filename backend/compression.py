@@ -0,0 +1,102 @@
+import os
+import gzip
+
+from starlette.datastructures import Headers, MutableHeaders
+
+try:
+    import brotli
+except ImportError:  # Optional: gzip only without it
+    brotli = None
+
+# Content types worth compressing; images (screenshots) already are
+COMPRESSIBLE_TYPES = ("application/json", "application/x-ndjson", "text/", "application/javascript")
+
+
+def accepted_encodings(header):
+    """Encodings named in an Accept-Encoding header with a non-zero q-value."""
+    accepted = set()
+    for item in (header or "").split(","):
+        name, _, params = item.strip().partition(";")
+        q = params.strip()
+        if q.startswith("q="):
+            try:
+                if float(q[2:]) <= 0:
+                    continue
+            except ValueError:
+                continue
+        if name.strip():
+            accepted.add(name.strip().lower())
+    return accepted
+
+
+def choose_encoding(header):
+    accepted = accepted_encodings(header)
+    if brotli is not None and ("br" in accepted or "*" in accepted):
+        return "br"
+    if "gzip" in accepted or "*" in accepted:
+        return "gzip"
+    return None
+
+
+class CompressionMiddleware:
+    """
+    ASGI middleware that compresses response bodies with brotli (when the
+    brotli package is installed and the client accepts it) or gzip.
+
+    Only complete bodies of at least minimum_size bytes with a compressible
+    content type are compressed. Streamed responses (/jobs/stream) are passed
+    through untouched, so each line still reaches the client as soon as it is
+    produced instead of waiting in a compressor's buffer.
+    """
+
+    def __init__(self, app, minimum_size=1024, gzip_level=6, brotli_quality=5):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    @classmethod
+    def options_from_env(cls):
+        """Keyword arguments from COMPRESSION_MIN_SIZE, or None when COMPRESSION=off."""
+        if os.environ.get("COMPRESSION", "on").lower() in ("0", "off", "false"):
+            return None
+        return {"minimum_size": int(os.environ.get("COMPRESSION_MIN_SIZE", 1024))}
+
+    def compress(self, body, encoding):
+        if encoding == "br":
+            return brotli.compress(body, quality=self.brotli_quality)
+        return gzip.compress(body, compresslevel=self.gzip_level, mtime=0)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding"))
+        if encoding is None:
+            return await self.app(scope, receive, send)
+
+        start = None
+
+        async def send_compressed(message):
+            nonlocal start
+            if message["type"] == "http.response.start":
+                start = message  # Held until the body shows whether it is worth compressing
+                return
+            if message["type"] != "http.response.body" or start is None:
+                return await send(message)
+
+            headers = MutableHeaders(raw=start["headers"])
+            body = message.get("body", b"")
+            compressible = headers.get("content-type", "").startswith(COMPRESSIBLE_TYPES)
+            if compressible:
+                headers.add_vary_header("Accept-Encoding")
+            if (compressible and not message.get("more_body", False) and len(body) >= self.minimum_size
+                    and "content-encoding" not in headers):
+                body = self.compress(body, encoding)
+                headers["content-encoding"] = encoding
+                headers["content-length"] = str(len(body))
+                message = {"type": "http.response.body", "body": body}
+            await send(start)
+            start = None
+            await send(message)
+
+        await self.app(scope, receive, send_compressed)
@@ -0,0 +1,64 @@
+import hashlib
+from email.utils import formatdate, parsedate_to_datetime
+
+from fastapi.responses import Response
+
+
+def etag_for(*parts):
+    """
+    Weak ETag over parts (bytes, or anything with a stable str()).
+
+    Weak, because the same JSON may be sent gzip- or brotli-encoded; the
+    validator is about the content, not the bytes on the wire.
+    """
+    digest = hashlib.blake2b(digest_size=12)
+    for part in parts:
+        digest.update(part if isinstance(part, bytes) else str(part).encode("utf-8"))
+        digest.update(b"\0")
+    return f'W/"{digest.hexdigest()}"'
+
+
+def http_date(timestamp):
+    return formatdate(timestamp, usegmt=True)
+
+
+def not_modified(request, etag, last_modified=None):
+    """
+    Whether the client's cached copy is current, per If-None-Match or (only
+    when that is absent) If-Modified-Since against a Unix last_modified time.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return "*" in tags or etag.removeprefix("W/") in tags
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            return int(last_modified) <= parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+def validator_headers(etag, last_modified=None):
+    # no-cache: browsers may keep the body but must revalidate, which they do with If-None-Match
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if last_modified is not None:
+        headers["Last-Modified"] = http_date(last_modified)
+    return headers
+
+
+def not_modified_response(etag, last_modified=None):
+    return Response(status_code=304, headers=validator_headers(etag, last_modified))
+
+
+def conditional(request, response, etag=None, last_modified=None):
+    """
+    The response with ETag/Last-Modified set, or a bodyless 304 when the
+    client already has it. etag defaults to one over the rendered body.
+    """
+    etag = etag or etag_for(response.body)
+    if not_modified(request, etag, last_modified):
+        return not_modified_response(etag, last_modified)
+    response.headers.update(validator_headers(etag, last_modified))
+    return response
@@ -1,27 +1,100 @@
 import requests
+from requests.adapters import HTTPAdapter
 from bs4 import BeautifulSoup
 import json
 import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urljoin, urlsplit, parse_qs
+
+from skills import skill_tagger
 
 BASE_URL = "https://devpost.com"
 
 
-def get_project_links(username):
+class RateLimiter:
+    """Spaces out request starts across threads to at most `rate` per second."""
+
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate else 0.0
+        self.lock = threading.Lock()
+        self.next_slot = 0.0
+
+    def wait(self):
+        with self.lock:
+            now = time.monotonic()
+            slot = max(now, self.next_slot)
+            self.next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+def make_session(pool_size=4):
+    """A requests.Session whose connection pool fits pool_size concurrent fetches."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def parse_portfolio_page(html, base_url=BASE_URL):
     """
-    Fetches the portfolio page for a given username and extracts project URLs.
+    Extracts project URLs (in page order) and the highest page number the
+    pagination links to from one portfolio page.
     """
-    url = f"{BASE_URL}/{username}"
-    resp = requests.get(url)
-    resp.raise_for_status()
-    soup = BeautifulSoup(resp.text, "html.parser")
+    soup = BeautifulSoup(html, "html.parser")
     projects = []
     # Select all project links in the portfolio
     for a in soup.select("a.link-to-software"):  # links to software pages
         href = a.get("href")
         if href:
-            full_url = href if href.startswith("http") else BASE_URL + href
+            full_url = href if href.startswith("http") else urljoin(base_url + "/", href)
             projects.append(full_url)
-    return list(dict.fromkeys(projects))  # dedupe while preserving order
+
+    last_page = 1
+    for a in soup.select(".pagination a[href]"):
+        page = parse_qs(urlsplit(a["href"]).query).get("page", [""])[0]
+        if page.isdigit():
+            last_page = max(last_page, int(page))
+    return projects, last_page
+
+
+def get_project_links(username, base_url=BASE_URL, session=None, max_workers=4, rate=4.0):
+    """
+    Finds every project in a user's portfolio, across all its pages.
+
+    Page 1 tells us how far the pagination goes; the remaining pages are
+    fetched concurrently on one pooled session, with request starts limited
+    to `rate` per second. If the pagination only shows a window of pages,
+    discovery continues from the furthest page it links to.
+
+    Returns:
+        Project URLs in portfolio order, without duplicates.
+    """
+    session = session or make_session(max_workers)
+    limiter = RateLimiter(rate)
+    url = f"{base_url}/{username}"
+
+    def fetch(page):
+        limiter.wait()
+        resp = session.get(url, params={"page": page} if page > 1 else None)
+        resp.raise_for_status()
+        return parse_portfolio_page(resp.text, base_url)
+
+    projects, last_page = fetch(1)
+    pages = {1: projects}
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        while True:
+            remaining = [page for page in range(2, last_page + 1) if page not in pages]
+            if not remaining:
+                break
+            for page, (page_projects, page_last) in zip(remaining, pool.map(fetch, remaining)):
+                pages[page] = page_projects
+                last_page = max(last_page, page_last)
+
+    ordered = [project for page in sorted(pages) for project in pages[page]]
+    return list(dict.fromkeys(ordered))  # dedupe while preserving order
 
 
 def get_project_details(project_url):
@@ -54,17 +127,19 @@ def get_project_details(project_url):
     # Built With tags
     built = soup.select("#built-with span.cp-tag")
     details["built_with"] = [tag.get_text(strip=True) for tag in built]
+    # Skill ids shared with job postings, from the tags and the write-up
+    details["skills"] = skill_tagger.tag_project(details)
 
     return details
 
 
-def scrape_username(username, delay=1):
+def scrape_username(username, delay=1, base_url=BASE_URL):
     """
     Orchestrates scraping for a given username.
 
     Returns a dict keyed by project slug with project detail dictionaries.
     """
-    project_urls = get_project_links(username)
+    project_urls = get_project_links(username, base_url=base_url)
     results = {}
     for url in project_urls:
         slug = url.rstrip('/').split('/')[-1]
@@ -83,9 +158,17 @@ if __name__ == "__main__":
     parser.add_argument("username", help="Devpost username (e.g. voomp)")
     parser.add_argument("-o", "--output", help="Output JSON file", default="projects.json")
     parser.add_argument("-d", "--delay", type=float, help="Delay between requests in seconds", default=1.0)
+    parser.add_argument("--base-url", default=BASE_URL,
+                        help="Devpost host (e.g. the fixture server with saved pages: fixture_server.py --devpost)")
+    parser.add_argument("--links-only", action="store_true", help="Only list the portfolio's project URLs")
     args = parser.parse_args()
 
-    data = scrape_username(args.username, delay=args.delay)
+    if args.links_only:
+        for link in get_project_links(args.username, base_url=args.base_url):
+            print(link)
+        raise SystemExit
+
+    data = scrape_username(args.username, delay=args.delay, base_url=args.base_url)
     with open(args.output, 'w') as f:
         json.dump(data, f, indent=2)
     print(f"Wrote {len(data)} projects to {args.output}")
@@ -0,0 +1,172 @@
+import time
+import uuid
+import threading
+
+# Run statuses the real Apify API reports
+RUNNING_STATUSES = ("READY", "RUNNING")
+TERMINAL_STATUSES = ("SUCCEEDED", "FAILED", "TIMED-OUT", "ABORTED")
+
+
+# Body of a fake posting, about the length of a short real one
+DESCRIPTION_PARAGRAPHS = [
+    "{company} is hiring a {search} to build things with Python and React.",
+    "You will design, ship and operate services used by thousands of customers, working closely "
+    "with product and design on everything from the first prototype to production monitoring.",
+    "Requirements: experience with Python or JavaScript, SQL databases, REST APIs and git. "
+    "Bonus points for AWS, Docker and a portfolio of side projects or hackathon entries.",
+    "We offer competitive pay, health, dental and vision insurance, a 401(k) match and flexible "
+    "remote work. {company} is an equal opportunity employer.",
+]
+
+
+def make_fake_items(count, search="Software Engineer", location="Remote"):
+    """Raw Indeed-scraper-shaped dataset items for offline runs."""
+    companies = ["Veracode", "Jerry", "EverTrue", "Getinge", "Acme", "Initech", "Globex", "Hooli"]
+    items = []
+    for i in range(count):
+        company = companies[i % len(companies)]
+        job_id = f"fake{i:06d}"
+        paragraphs = [p.format(company=company, search=search) for p in DESCRIPTION_PARAGRAPHS]
+        items.append({
+            "id": job_id,
+            "company": company,
+            "positionName": f"{search} {i}",
+            "location": location,
+            "description": "\n\n".join(paragraphs),
+            "descriptionHTML": "".join(f"<p>{p}</p>" for p in paragraphs),
+            "isExpired": False,
+            "jobType": ["Full-time"],
+            "postedAt": "2025-04-15",
+            "url": f"https://www.indeed.com/viewjob?jk={job_id}",
+            "externalApplyLink": None,
+            "salary": None,
+            "rating": 0,
+            "reviewsCount": 0,
+            "postingDateParsed": "2025-04-15T00:00:00.000Z",
+            "scrapedAt": "2025-04-16T09:30:00.000Z",
+            "searchInput": {"position": search, "location": location, "country": "US"},
+            "urlInput": f"https://www.indeed.com/jobs?q={search}&l={location}",
+        })
+    return items
+
+
+class FakeListPage:
+    """Mimics apify_client's ListPage (only the attributes we read)."""
+
+    def __init__(self, items, offset, total):
+        self.items = items
+        self.offset = offset
+        self.count = len(items)
+        self.total = total
+
+
+class FakeRun:
+    """One simulated actor run that pushes items into its dataset over time."""
+
+    def __init__(self, items, first_delay, batch_size, batch_interval):
+        self.id = uuid.uuid4().hex
+        self.dataset_id = uuid.uuid4().hex
+        self.items = []
+        self.status = "RUNNING"
+        self.aborted = threading.Event()
+        self.lock = threading.Lock()
+        self.thread = threading.Thread(
+            target=self._produce, args=(list(items), first_delay, batch_size, batch_interval), daemon=True
+        )
+        self.thread.start()
+
+    def _produce(self, pending, first_delay, batch_size, batch_interval):
+        if self.aborted.wait(first_delay):
+            return
+        while pending:
+            batch, pending = pending[:batch_size], pending[batch_size:]
+            with self.lock:
+                self.items.extend(batch)
+            if pending and self.aborted.wait(batch_interval):
+                return
+        with self.lock:
+            if self.status == "RUNNING":
+                self.status = "SUCCEEDED"
+
+    def info(self):
+        return {"id": self.id, "status": self.status, "defaultDatasetId": self.dataset_id}
+
+
+class FakeActorClient:
+    def __init__(self, client):
+        self.client = client
+
+    def start(self, run_input=None, **kwargs):
+        max_items = (run_input or {}).get("maxItems") or len(self.client.items)
+        run = FakeRun(self.client.items[:max_items], self.client.first_delay,
+                      self.client.batch_size, self.client.batch_interval)
+        self.client.runs[run.id] = run
+        self.client.datasets[run.dataset_id] = run
+        return run.info()
+
+    def call(self, run_input=None, **kwargs):
+        info = self.start(run_input=run_input)
+        self.client.runs[info["id"]].thread.join()
+        return self.client.runs[info["id"]].info()
+
+
+class FakeRunClient:
+    def __init__(self, run):
+        self.run = run
+
+    def get(self):
+        return self.run.info()
+
+    def abort(self):
+        with self.run.lock:
+            if self.run.status in RUNNING_STATUSES:
+                self.run.status = "ABORTED"
+        self.run.aborted.set()
+        return self.run.info()
+
+
+class FakeDatasetClient:
+    def __init__(self, run):
+        self.run = run
+
+    def list_items(self, offset=0, limit=None, **kwargs):
+        with self.run.lock:
+            end = len(self.run.items) if limit is None else offset + limit
+            items = self.run.items[offset:end]
+            total = len(self.run.items)
+        return FakeListPage(items, offset, total)
+
+    def iterate_items(self, offset=0, limit=None, **kwargs):
+        yield from self.list_items(offset=offset, limit=limit).items
+
+
+class FakeApifyClient:
+    """
+    In-process stand-in for ApifyClient covering what search_api uses:
+    actor().start()/call(), run().get()/abort() and dataset().list_items()/
+    iterate_items(). Items show up in batches, so streaming can be exercised
+    offline with realistic timing.
+
+    Args:
+        items: Raw dataset items every run produces (default: generated ones).
+        first_delay: Seconds before the first batch appears.
+        batch_size: Items pushed per batch.
+        batch_interval: Seconds between batches.
+    """
+
+    def __init__(self, items=None, first_delay=0.5, batch_size=5, batch_interval=0.25):
+        self.items = list(items) if items is not None else make_fake_items(50)
+        self.first_delay = first_delay
+        self.batch_size = batch_size
+        self.batch_interval = batch_interval
+        self.runs = {}
+        self.datasets = {}
+
+    def actor(self, actor_id):
+        return FakeActorClient(self)
+
+    def run(self, run_id):
+        return FakeRunClient(self.runs[run_id])
+
+    def dataset(self, dataset_id):
+        return FakeDatasetClient(self.datasets[dataset_id])
@@ -0,0 +1,56 @@
+import json
+
+from fastapi.responses import JSONResponse
+
+from models import JOB_SUMMARY_FIELDS
+
+try:
+    import orjson
+except ImportError:  # Optional: the standard library encoder is used instead
+    orjson = None
+
+
+def dumps(content):
+    """Serializes content to compact UTF-8 JSON bytes, with orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(content)
+    # Dates and other non-JSON values are written as their string form, like jsonable_encoder
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":"), default=str).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSONResponse that skips FastAPI's jsonable_encoder pass and encodes with dumps().
+
+    Return it directly from an endpoint with plain dicts/lists; the endpoint's
+    response_model still documents the shape but isn't re-validated.
+    """
+
+    def render(self, content):
+        return dumps(content)
+
+
+def parse_fields(value):
+    """
+    Turns a `fields` query parameter ("id,company,positionName") into a tuple of
+    JobSummary field names. None or "" means every JobSummary field.
+
+    Raises:
+        ValueError: If a name isn't a JobSummary field.
+    """
+    if not value:
+        return JOB_SUMMARY_FIELDS
+    fields = tuple(dict.fromkeys(f.strip() for f in value.split(",") if f.strip()))
+    unknown = [f for f in fields if f not in JOB_SUMMARY_FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown job fields: {', '.join(unknown)} (available: {', '.join(JOB_SUMMARY_FIELDS)})")
+    return fields
+
+
+def project_job(job, fields=JOB_SUMMARY_FIELDS):
+    """The JobSummary projection of a raw Apify item or normalized job dict, without the other keys."""
+    return {field: job.get(field) for field in fields}
+
+
+def project_jobs(jobs, fields=JOB_SUMMARY_FIELDS):
+    return [{field: job.get(field) for field in fields} for job in jobs]
@@ -0,0 +1,222 @@
+import re
+from functools import lru_cache
+
+# Below this a field is left alone rather than filled with a guess
+MIN_CONFIDENCE = 0.5
+
+# How much we trust a pattern hit depending on where it matched
+SOURCE_WEIGHTS = {
+    "label": 0.9,
+    "aria_label": 0.85,
+    "name": 0.75,
+    "id": 0.75,
+    "placeholder": 0.7,
+}
+
+# Field types a value can be typed into; checkboxes, radios, selects and file
+# inputs are never matched (typing into them would just click them)
+TEXT_FIELD_TYPES = frozenset({"text", "email", "tel", "url", "number", "search", "textarea"})
+
+# HTML autocomplete tokens are explicit, so they win outright
+AUTOCOMPLETE_ATTRIBUTES = {
+    "given-name": "firstName",
+    "family-name": "lastName",
+    "name": "fullName",
+    "email": "email",
+    "tel": "phone",
+    "tel-national": "phone",
+    "street-address": "street",
+    "address-line1": "street",
+    "address-level2": "city",
+    "address-level1": "state",
+    "postal-code": "zipCode",
+    "country": "country",
+    "country-name": "country",
+    "url": "website",
+}
+
+# Input types that imply the attribute when nothing better matches
+TYPE_ATTRIBUTES = {
+    "email": ("email", 0.6),
+    "tel": ("phone", 0.6),
+}
+
+# Profile attribute -> synonym patterns, most specific attributes first. Patterns
+# are matched against normalized text (lowercase, separators turned into spaces).
+# "first"/"last" only count next to "name": "How did you first hear about us?" and
+# "Last employer" aren't name fields.
+FIELD_SYNONYMS = [
+    ("firstName", [r"\bfirst name\b", r"\bgiven name", r"\bfirstname\b", r"\bfname\b", r"\bname first\b", r"\bforename\b"]),
+    ("lastName", [r"\blast name\b", r"\bfamily name\b", r"\bsurname\b", r"\blastname\b", r"\blname\b", r"\bname last\b"]),
+    ("fullName", [r"^(your )?(full |legal )?name$", r"\bfull name\b", r"\blegal name\b", r"\bsystemfield name\b"]),
+    ("email", [r"\be ?mail\b", r"\bemail address\b"]),
+    ("phone", [r"\bphone\b", r"\bmobile\b", r"\btelephone\b", r"\bcell\b", r"\btel\b", r"\bphone number\b"]),
+    ("githubUrl", [r"\bgit ?hub\b"]),
+    ("street", [r"\bstreet\b", r"\baddress line 1\b", r"\baddress ?1\b", r"^(home |mailing )?address$", r"\baddressline1\b"]),
+    ("city", [r"\bcity\b", r"\btown\b"]),
+    ("state", [r"\bstate\b", r"\bprovince\b", r"\bregion\b"]),
+    ("zipCode", [r"\bzip\b", r"\bzip ?code\b", r"\bpostal ?code\b", r"\bpostcode\b"]),
+    ("country", [r"\bcountry\b"]),
+    ("location", [r"\blocation\b", r"\bwhere are you (currently )?(located|based)\b", r"\bcurrent(ly)? (location|based)\b"]),
+]
+
+# Labels containing these are about someone or something else
+NEGATIVE_PATTERNS = re.compile(
+    r"\b(emergency|reference|referr(er|al)|manager|supervisor|company name|employer|school|university|"
+    r"recruiter|hiring|spouse|parent|guardian|device|extension)\b"
+)
+
+_SPLIT_CAMEL = re.compile(r"(?<=[a-z0-9])(?=[A-Z])")
+_NON_WORD = re.compile(r"[^a-z0-9@]+")
+
+
+def normalize_text(text, split_camel=False):
+    """'job_application[first_name]' / 'First Name *' -> 'job application first name'.
+
+    split_camel also breaks up identifiers like 'firstName'. It's off for human
+    readable labels, where it would turn 'LinkedIn' into 'linked in'.
+    """
+    if not text:
+        return ""
+    text = str(text)
+    if split_camel:
+        text = _SPLIT_CAMEL.sub(" ", text)
+    return _NON_WORD.sub(" ", text.lower()).strip()
+
+
+def compile_synonyms(extra_fields=()):
+    """
+    Compiles the synonym table into one regex per attribute.
+
+    Extra profile fields (e.g. "linkedinUrl" sent by the frontend) get a
+    pattern built from their own words, so they match "LinkedIn URL" labels.
+    """
+    table = list(FIELD_SYNONYMS)
+    known = {attribute for attribute, _ in table}
+    for field in extra_fields:
+        if field in known:
+            continue
+        words = normalize_text(field, split_camel=True).split()
+        if words:
+            table.append((field, [r"\b" + r" ?".join(map(re.escape, words)) + r"\b"]))
+    return tuple((attribute, re.compile("|".join(f"(?:{p})" for p in patterns))) for attribute, patterns in table)
+
+
+_DEFAULT_INDEX = compile_synonyms()
+
+
+@lru_cache(maxsize=4096)
+def _compiled_for(extra_fields):
+    return compile_synonyms(extra_fields) if extra_fields else _DEFAULT_INDEX
+
+
+@lru_cache(maxsize=4096)
+def _match_key(tag, input_type, label, aria_label, name, element_id, placeholder, autocomplete, extra_fields):
+    """Memoized core of match_descriptor; all arguments are already normalized."""
+    if autocomplete in AUTOCOMPLETE_ATTRIBUTES:
+        return AUTOCOMPLETE_ATTRIBUTES[autocomplete], 1.0
+
+    best_attribute, best_confidence = None, 0.0
+    sources = (("label", label), ("aria_label", aria_label), ("name", name), ("id", element_id), ("placeholder", placeholder))
+    for source, text in sources:
+        if not text or SOURCE_WEIGHTS[source] <= best_confidence:
+            continue
+        if NEGATIVE_PATTERNS.search(text):
+            continue
+        for attribute, pattern in _compiled_for(extra_fields):
+            if pattern.search(text):
+                best_attribute, best_confidence = attribute, SOURCE_WEIGHTS[source]
+                break  # Table is ordered most specific first
+
+    if best_attribute is None and input_type in TYPE_ATTRIBUTES:
+        best_attribute, best_confidence = TYPE_ATTRIBUTES[input_type]
+    return best_attribute, best_confidence
+
+
+def match_descriptor(descriptor, extra_fields=()):
+    """
+    Maps one field descriptor to a profile attribute.
+
+    Args:
+        descriptor: dict with any of tag, type, label, aria_label, name, id,
+            placeholder, autocomplete (see formfiller.extract_field_descriptors).
+        extra_fields: Names of extra profile fields that may also match.
+
+    Returns:
+        (attribute, confidence); attribute is None when nothing matched.
+    """
+    autocomplete = (descriptor.get("autocomplete") or "").lower().split()
+    return _match_key(
+        (descriptor.get("tag") or "input").lower(),
+        (descriptor.get("type") or "text").lower(),
+        normalize_text(descriptor.get("label")),
+        normalize_text(descriptor.get("aria_label")),
+        normalize_text(descriptor.get("name"), split_camel=True),
+        normalize_text(descriptor.get("id"), split_camel=True),
+        normalize_text(descriptor.get("placeholder")),
+        autocomplete[-1] if autocomplete else "",
+        tuple(sorted(extra_fields)),
+    )
+
+
+def profile_values(user):
+    """
+    Flattens a UserData (or plain dict) into the attributes fields can map to,
+    including derived ones like fullName, githubUrl and location.
+    """
+    if hasattr(user, "model_dump"):
+        data = user.model_dump()
+    elif hasattr(user, "dict"):
+        data = user.dict()
+    else:
+        data = dict(user)
+    values = {k: v for k, v in data.items() if v not in (None, "") and isinstance(v, (str, int, float))}
+    values = {k: str(v) for k, v in values.items()}
+
+    if "fullName" not in values:
+        full_name = " ".join(v for v in (values.get("firstName"), values.get("lastName")) if v)
+        if full_name:
+            values["fullName"] = full_name
+    if "githubUrl" not in values and values.get("githubUsername"):
+        values["githubUrl"] = f"https://github.com/{values['githubUsername']}"
+    if "location" not in values:
+        location = ", ".join(v for v in (values.get("city"), values.get("state")) if v)
+        if location:
+            values["location"] = location
+    return values
+
+
+def match_fields(descriptors, user, min_confidence=MIN_CONFIDENCE, values=None):
+    """
+    Maps every field descriptor on a page to a profile value in one pass.
+
+    Each profile attribute is used for at most one field (the most confident
+    one), so e.g. a stray second "Name" box doesn't get the name twice. Only
+    text-like fields (TEXT_FIELD_TYPES) are considered.
+    values, when given, is profile_values(user) computed ahead of time (see
+    profile_store.ProfileVersion).
+
+    Returns:
+        List of dicts with index (into descriptors), attribute, value,
+        confidence and label, in page order.
+    """
+    if values is None:
+        values = profile_values(user)
+    extra_fields = tuple(sorted(k for k in values if k not in {a for a, _ in FIELD_SYNONYMS}))
+
+    best = {}
+    for index, descriptor in enumerate(descriptors):
+        if (descriptor.get("type") or "text").lower() not in TEXT_FIELD_TYPES:
+            continue
+        attribute, confidence = match_descriptor(descriptor, extra_fields)
+        if attribute is None or confidence < min_confidence or attribute not in values:
+            continue
+        if attribute not in best or confidence > best[attribute]["confidence"]:
+            best[attribute] = {
+                "index": index,
+                "attribute": attribute,
+                "value": values[attribute],
+                "confidence": confidence,
+                "label": descriptor.get("label") or descriptor.get("name") or attribute,
+            }
+    return sorted(best.values(), key=lambda match: match["index"])
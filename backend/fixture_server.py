@@ -0,0 +1,215 @@
+import os
+import re
+import json
+import time
+import threading
+from functools import partial
+from email.parser import BytesParser
+from email.policy import HTTP
+from urllib.parse import urlsplit, parse_qs, urlencode
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "ats")
+DEVPOST_FIXTURES_DIR = os.path.join(os.path.dirname(FIXTURES_DIR), "devpost")
+
+# Stand-ins for the Greenhouse Job Board API and the Ashby API (see ats_adapters)
+GREENHOUSE_JOB_RE = re.compile(r"^/greenhouse-api/v1/boards/([\w-]+)/jobs/(\d+)$")
+ASHBY_API_PREFIX = "/ashby-api/"
+
+
+def parse_multipart(content_type, body):
+    """
+    Splits a multipart/form-data body.
+
+    Returns:
+        (fields, files): fields maps names to text values, files maps names
+        to {"filename", "bytes"}.
+    """
+    message = BytesParser(policy=HTTP).parsebytes(
+        f"Content-Type: {content_type}\r\n\r\n".encode("latin-1") + body
+    )
+    fields, files = {}, {}
+    for part in message.iter_parts():
+        name = part.get_param("name", header="content-disposition")
+        filename = part.get_filename()
+        payload = part.get_payload(decode=True) or b""
+        if filename is not None:
+            files[name] = {"filename": filename, "bytes": len(payload)}
+        else:
+            fields[name] = payload.decode(part.get_content_charset() or "utf-8")
+    return fields, files
+
+
+class FixtureRequestHandler(SimpleHTTPRequestHandler):
+    """Serves the saved ATS pages from fixtures/ats like a (very) small ATS host."""
+
+    # Optional artificial latency in seconds, to mimic a slow ATS host
+    delay = 0.0
+
+    def end_headers(self):
+        # Let the browser cache static assets the way it would on a real ATS
+        if "/static/" in self.path:
+            self.send_header("Cache-Control", "public, max-age=86400")
+        else:
+            self.send_header("Cache-Control", "no-cache")
+        super().end_headers()
+
+    def do_GET(self):
+        if self.delay:
+            time.sleep(self.delay)
+        if self.path.startswith("/redirect/"):
+            return self.send_redirect_chain()
+        match = GREENHOUSE_JOB_RE.match(urlsplit(self.path).path)
+        if match:
+            job = self.load_api_fixture("greenhouse_job.json")
+            job["id"] = int(match.group(2))
+            return self.send_json(200, job)
+        super().do_GET()
+
+    def translate_path(self, path):
+        """
+        Also serves saved paginated pages: /<name>?page=<n> maps to <name>.page<n>.html
+        and an extensionless /<name> to <name>.html (e.g. fixtures/devpost).
+        """
+        parts = urlsplit(path)
+        translated = super().translate_path(parts.path)
+        page = parse_qs(parts.query).get("page", ["1"])[0]
+        if page != "1":
+            candidate = f"{translated}.page{page}.html"
+        elif not os.path.splitext(translated)[1]:
+            candidate = f"{translated}.html"
+        else:
+            return translated
+        return candidate if os.path.isfile(candidate) else translated
+
+    def load_api_fixture(self, name):
+        with open(os.path.join(self.directory, "api", name)) as f:
+            return json.load(f)
+
+    def send_redirect_chain(self):
+        """/redirect/<n>?to=<path> answers with n chained 302s ending at <path>."""
+        parsed = urlsplit(self.path)
+        hops = int(parsed.path.rsplit("/", 1)[1] or 0)
+        target = parse_qs(parsed.query).get("to", ["/"])[0]
+        location = f"/redirect/{hops - 1}?{urlencode({'to': target})}" if hops > 1 else target
+        self.send_response(302)
+        self.send_header("Location", location)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        path = urlsplit(self.path).path
+        if GREENHOUSE_JOB_RE.match(path):
+            return self.submit_greenhouse(body)
+        if path == ASHBY_API_PREFIX + "jobPosting.info":
+            return self.send_json(200, self.load_api_fixture("ashby_posting.json"))
+        if path == ASHBY_API_PREFIX + "applicationForm.submit":
+            return self.submit_ashby(body)
+        # Accept (and discard) form submissions so pages never hit a 501
+        self.send_json(200, {"success": True, "path": self.path})
+
+    def read_multipart(self, body):
+        """Parsed multipart body, or None after answering 401/415 for a bad request."""
+        if not (self.headers.get("Authorization") or "").startswith("Basic "):
+            self.send_json(401, {"error": "Missing API key"})
+            return None
+        content_type = self.headers.get("Content-Type") or ""
+        if not content_type.startswith("multipart/form-data"):
+            self.send_json(415, {"error": "Expected multipart/form-data"})
+            return None
+        return parse_multipart(content_type, body)
+
+    def submit_greenhouse(self, body):
+        """Job Board API application POST: required questions must be answered."""
+        parsed = self.read_multipart(body)
+        if parsed is None:
+            return
+        fields, files = parsed
+        missing = []
+        for question in self.load_api_fixture("greenhouse_job.json")["questions"]:
+            names = [field["name"] for field in question["fields"]]
+            if question["required"] and not any(fields.get(n) or n in files for n in names):
+                missing.append(question["label"])
+        if missing:
+            return self.send_json(400, {"error": "Missing required questions", "missing": missing})
+        self.send_json(200, {"success": "Candidate saved successfully", "fields": fields, "files": files})
+
+    def submit_ashby(self, body):
+        """applicationForm.submit: fieldSubmissions in a JSON part, files as named parts."""
+        parsed = self.read_multipart(body)
+        if parsed is None:
+            return
+        fields, files = parsed
+        try:
+            submissions = json.loads(fields.get("applicationForm") or "{}").get("fieldSubmissions", [])
+        except ValueError:
+            return self.send_json(400, {"success": False, "errors": ["applicationForm is not JSON"]})
+        answered = {s["path"]: s["value"] for s in submissions if s.get("value") not in (None, "")}
+        errors = []
+        posting = self.load_api_fixture("ashby_posting.json")["results"]
+        for section in posting["applicationFormDefinition"]["sections"]:
+            for entry in section["fieldEntries"]:
+                field = entry["field"]
+                value = answered.get(field["path"])
+                if entry["isRequired"] and value is None:
+                    errors.append(f"Missing {field['title']}")
+                elif field["type"] == "File" and value is not None and value not in files:
+                    errors.append(f"No file part named {value} for {field['title']}")
+        if fields.get("jobPostingId") != posting["id"]:
+            errors.append("Unknown jobPostingId")
+        if errors:
+            return self.send_json(200, {"success": False, "errors": errors})
+        self.send_json(200, {"success": True, "results": {"submittedValues": answered, "files": files}})
+
+    def send_json(self, status, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # Keep benchmark output readable
+        pass
+
+
+def load_manifest():
+    """The ATS fixtures (name, path, expected fill counts per page) from fixtures/ats/manifest.json."""
+    with open(os.path.join(FIXTURES_DIR, "manifest.json")) as f:
+        return json.load(f)["fixtures"]
+
+
+def start_fixture_server(host="127.0.0.1", port=0, directory=FIXTURES_DIR, delay=0.0):
+    """
+    Starts the fixture server on a background thread.
+
+    Returns:
+        (server, base_url). Call server.shutdown() when done.
+    """
+    handler = type("BoundFixtureRequestHandler", (FixtureRequestHandler,), {"delay": delay})
+    server = ThreadingHTTPServer((host, port), partial(handler, directory=directory))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    base_url = f"http://{host}:{server.server_address[1]}"
+    return server, base_url
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Serve the offline ATS fixtures over HTTP")
+    parser.add_argument("-p", "--port", type=int, default=8765, help="Port to listen on")
+    parser.add_argument("-d", "--delay", type=float, default=0.0, help="Artificial delay per GET in seconds")
+    parser.add_argument("--devpost", action="store_true", help="Serve the saved Devpost portfolio pages instead")
+    args = parser.parse_args()
+
+    directory = DEVPOST_FIXTURES_DIR if args.devpost else FIXTURES_DIR
+    server, base_url = start_fixture_server(port=args.port, directory=directory, delay=args.delay)
+    print(f"Serving {directory} at {base_url} (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
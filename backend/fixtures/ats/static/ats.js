@@ -0,0 +1,71 @@
+// Shared behaviour for the offline ATS fixtures: keyboard-driven custom
+// dropdowns (role=combobox + listbox) and client-side "next page" buttons,
+// roughly mimicking what the real ATS bundles do.
+(function () {
+  function options(combo) {
+    return Array.prototype.slice.call(
+      combo.parentNode.querySelectorAll('[role="option"]')
+    );
+  }
+
+  function setOpen(combo, open) {
+    var list = combo.parentNode.querySelector('[role="listbox"]');
+    combo.setAttribute('aria-expanded', open ? 'true' : 'false');
+    if (list) list.hidden = !open;
+    if (!open) combo.removeAttribute('data-active');
+  }
+
+  function highlight(combo, delta) {
+    var opts = options(combo);
+    if (!opts.length) return;
+    var idx = parseInt(combo.getAttribute('data-active') || '-1', 10) + delta;
+    idx = Math.max(0, Math.min(opts.length - 1, idx));
+    opts.forEach(function (o, i) { o.classList.toggle('active', i === idx); });
+    combo.setAttribute('data-active', String(idx));
+    combo.setAttribute('aria-activedescendant', opts[idx].id);
+  }
+
+  function choose(combo) {
+    var idx = parseInt(combo.getAttribute('data-active') || '-1', 10);
+    var opts = options(combo);
+    if (idx >= 0 && idx < opts.length) {
+      combo.setAttribute('data-value', opts[idx].getAttribute('data-value'));
+      combo.textContent = opts[idx].textContent;
+      setOpen(combo, false);
+    }
+  }
+
+  document.querySelectorAll('[role="combobox"]').forEach(function (combo) {
+    combo.addEventListener('click', function () {
+      setOpen(combo, combo.getAttribute('aria-expanded') !== 'true');
+    });
+    combo.addEventListener('keydown', function (ev) {
+      var open = combo.getAttribute('aria-expanded') === 'true';
+      if (ev.key === 'Enter') {
+        ev.preventDefault();
+        if (!open) setOpen(combo, true);
+        else choose(combo);
+      } else if (ev.key === 'ArrowDown') {
+        ev.preventDefault();
+        if (!open) setOpen(combo, true);
+        highlight(combo, 1);
+      } else if (ev.key === 'ArrowUp') {
+        ev.preventDefault();
+        highlight(combo, -1);
+      } else if (ev.key === 'Escape') {
+        setOpen(combo, false);
+      }
+    });
+  });
+
+  document.querySelectorAll('button[data-next]').forEach(function (btn) {
+    btn.addEventListener('click', function () {
+      window.location.href = btn.getAttribute('data-next');
+    });
+  });
+
+  // Never actually post anywhere from the fixtures.
+  document.querySelectorAll('form').forEach(function (form) {
+    form.addEventListener('submit', function (ev) { ev.preventDefault(); });
+  });
+})();
@@ -0,0 +1,185 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from bs4 import BeautifulSoup
+
+from apply_links import detect_ats, public_session
+
+try:
+    import lxml  # noqa: F401  (several times faster than html.parser when installed)
+    PARSER = "lxml"
+except ImportError:
+    PARSER = "html.parser"
+
+# Input types extract_field_descriptors skips in the browser
+SKIPPED_INPUT_TYPES = ("hidden", "submit", "button", "reset", "image")
+
+# ATS whose application forms are rendered client-side, so their HTML never has the full form
+CLIENT_RENDERED_ATS = ("workday", "icims", "successfactors")
+
+# Mount points of single-page apps that render the form after load
+SPA_ROOT_IDS = ("root", "app", "__next", "react-root")
+
+
+def _first_line(tag):
+    """Cheap stand-in for innerText.split('\\n')[0]: the first non-blank text inside tag."""
+    return next(tag.stripped_strings, "")
+
+
+def _label_for(el, labels):
+    """The same label heuristics as EXTRACT_FIELDS_JS / get_element_label, on parsed HTML."""
+    if el.get("id") and labels.get(el["id"]):
+        return labels[el["id"]]
+    parent = el.parent
+    for _ in range(3):
+        if parent is None or parent.name == "[document]":
+            break
+        text = _first_line(parent)
+        if text and len(text) < 100:
+            return text
+        if parent.name == "label":
+            text = parent.get_text(" ", strip=True)
+            if text:
+                return text
+        if parent.name == "fieldset":
+            legend = parent.find("legend")
+            if legend and legend.get_text(strip=True):
+                return legend.get_text(" ", strip=True)
+        parent = parent.parent
+    if el.get("aria-label"):
+        return el["aria-label"].strip()
+    if el.get("placeholder"):
+        return el["placeholder"].strip()
+    return el.get("name") or el.get("type") or "Unknown Element"
+
+
+def analyze_html(html, url=None):
+    """
+    Extracts the field schema from server-rendered HTML without a browser.
+
+    Returns:
+        dict with fields (descriptors shaped exactly like extract_field_descriptors
+        returns them, minus the elements), forms (how many <form>s there are),
+        complete (False when the browser is still needed to see the real form)
+        and reasons (why it isn't complete).
+    """
+    soup = BeautifulSoup(html, PARSER)
+    labels = {}
+    for label in soup.find_all("label", attrs={"for": True}):
+        text = label.get_text(" ", strip=True)
+        if text and label["for"] not in labels:
+            labels[label["for"]] = text
+
+    fields = []
+    for el in soup.find_all(["input", "textarea", "select"]):
+        tag = el.name
+        field_type = (el.get("type") or "text").lower() if tag == "input" else tag
+        if field_type in SKIPPED_INPUT_TYPES or el.has_attr("disabled"):
+            continue
+        fields.append({
+            "tag": tag,
+            "type": field_type,
+            "id": el.get("id") or None,
+            "name": el.get("name"),
+            "label": _label_for(el, labels),
+            "aria_label": el.get("aria-label"),
+            "placeholder": el.get("placeholder"),
+            "autocomplete": el.get("autocomplete"),
+            "required": el.has_attr("required") or el.get("aria-required") == "true",
+        })
+
+    forms = soup.find_all("form")
+    reasons = []
+    if not forms:
+        reasons.append("no <form> in the server-rendered HTML")
+    elif not any(form.find(["input", "textarea", "select"]) for form in forms):
+        reasons.append("form has no fields until scripts run")
+    if detect_ats(url) in CLIENT_RENDERED_ATS:
+        reasons.append(f"{detect_ats(url)} renders its forms client-side")
+    for root_id in SPA_ROOT_IDS:
+        mount = soup.find(id=root_id)
+        if mount is not None and not mount.find(True):
+            reasons.append(f"empty #{root_id} mount point (single-page app)")
+            break
+
+    return {"fields": fields, "forms": len(forms), "complete": not reasons, "reasons": reasons}
+
+
+class FormAnalyzer:
+    """
+    Fetches application forms over a pooled HTTP session and analyzes them
+    statically, so the field schema of server-rendered forms (Greenhouse
+    embed/job_app, Lever, ...) is known without launching Chrome. Only results
+    with complete=False need the browser path.
+
+    Args:
+        timeout: Per-request timeout in seconds.
+        max_workers: Concurrency for analyze_many().
+        session: requests.Session to share (e.g. the ApplyLinkResolver's).
+    """
+
+    def __init__(self, timeout=10, max_workers=8, session=None):
+        self.timeout = timeout
+        self.max_workers = max_workers
+        self.session = session or public_session(max_workers)
+
+    def analyze(self, url):
+        """
+        Fetches url and analyzes its form.
+
+        Returns:
+            analyze_html()'s dict plus url (after redirects), fetch_s, parse_s
+            and error. A failed fetch is reported as incomplete.
+        """
+        started = time.perf_counter()
+        try:
+            response = self.session.get(url, timeout=self.timeout)
+            response.raise_for_status()
+        except requests.RequestException as e:
+            return {"url": url, "fields": [], "forms": 0, "complete": False,
+                    "reasons": ["fetch failed"], "error": str(e)}
+        fetched = time.perf_counter()
+        result = analyze_html(response.text, response.url)
+        result.update(
+            url=response.url,
+            fetch_s=round(fetched - started, 4),
+            parse_s=round(time.perf_counter() - fetched, 4),
+            error=None,
+        )
+        return result
+
+    def analyze_many(self, urls):
+        """Analyzes many URLs concurrently. Returns a dict of url -> result."""
+        urls = list(urls)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            return dict(zip(urls, pool.map(self.analyze, urls)))
+
+
+def main():
+    import json
+    import argparse
+    parser = argparse.ArgumentParser(description="Print the field schema of application forms without a browser")
+    parser.add_argument("urls", nargs="+", help="Form URLs (or local HTML files with --files)")
+    parser.add_argument("--files", action="store_true", help="Treat arguments as local HTML files")
+    parser.add_argument("-n", "--repeat", type=int, default=1, help="Parse each page this many times and report pages/s")
+    args = parser.parse_args()
+
+    if args.files:
+        pages = {}
+        for path in args.urls:
+            with open(path, encoding="utf-8") as f:
+                pages[path] = f.read()
+        started = time.perf_counter()
+        for _ in range(args.repeat):
+            results = {path: analyze_html(html) for path, html in pages.items()}
+        elapsed = time.perf_counter() - started
+        print(f"Parsed {len(pages) * args.repeat} pages in {elapsed:.3f}s "
+              f"({len(pages) * args.repeat / elapsed:.0f} pages/s, parser={PARSER})")
+    else:
+        results = FormAnalyzer().analyze_many(args.urls)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,7 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import Select
 import time
 from selenium.common.exceptions import NoSuchElementException
+from field_matcher import match_fields
 
 # Create driver
 driver = webdriver.Chrome()
@@ -115,10 +116,25 @@ field_descriptions = [
     for f in fields
 ]
 
+# Stand-in for the user's profile (UserData fields, plus any extras)
+sample_profile = {
+	"firstName": "Ada",
+	"lastName": "Lovelace",
+	"email": "ada@example.com",
+	"phone": "555-0100",
+	"githubUsername": "ada",
+	"city": "Boston",
+	"state": "MA",
+}
+
 def your_ai_function(desc):
 	values = {}
+	# Labels we can map to the profile get real values, everything else "A"
+	matches = match_fields([{"label": field["name"], "type": field["type"]} for field in desc], sample_profile)
+	for match in matches:
+		values[desc[match["index"]]["name"]] = match["value"]
 	for field in desc:
-		values[field["name"]] = "A"
+		values.setdefault(field["name"], "A")
 	print(desc)
 	print(values)
 	return values
@@ -3,10 +3,11 @@ import os
 import time
 import random
 from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys 
 from selenium.webdriver.common.action_chains import ActionChains
-from selenium.webdriver.support.ui import Select, WebDriverWait
+from selenium.webdriver.support.ui import Select
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import (
     NoSuchElementException,
@@ -17,6 +18,19 @@ from selenium.common.exceptions import (
     InvalidArgumentException
 )
 
+from project_index import ProjectIndex
+from latency import latency_tracker
+
+def setup_headless_driver():
+    """Headless Chrome with the same stability flags the API uses (batch sweeps and benchmarks)."""
+    chrome_options = Options()
+    chrome_options.add_argument("--headless=new")
+    chrome_options.add_argument("--no-sandbox")
+    chrome_options.add_argument("--disable-dev-shm-usage")
+    chrome_options.add_argument("--disable-extensions")
+    chrome_options.add_argument("--window-size=1366,768")
+    return webdriver.Chrome(options=chrome_options)
+
 def move_mouse_to_element(driver, element, offset_x=None, offset_y=None):
     """Move the mouse to an element in a human-like way with slight randomization."""
     try:
@@ -62,13 +76,13 @@ def safe_send_keys(driver, element, text, element_name="field"):
     """Safely sends keys to an element with human-like behavior."""
     if not text:  # Skip if no text provided
         print(f"  • No value provided for '{element_name}', skipping.")
-        return
+        return False
         
     try:
-        # Wait for the element to be visible and enabled
-        WebDriverWait(driver, 5).until(EC.visibility_of(element))
+        # Wait for the element to be visible and enabled (for as long as this host usually needs)
+        latency_tracker.wait(driver, "visible", EC.visibility_of(element))
         # Wait for the element to be clickable
-        WebDriverWait(driver, 5).until(EC.element_to_be_clickable(element))
+        latency_tracker.wait(driver, "clickable", EC.element_to_be_clickable(element))
         
         # 1. Move mouse to element naturally before interacting
         move_mouse_to_element(driver, element)
@@ -90,12 +104,14 @@ def safe_send_keys(driver, element, text, element_name="field"):
             element.send_keys(Keys.TAB)
             
         print(f"  • Successfully filled '{element_name}' with human-like typing.")
+        return True
     except (TimeoutException, ElementClickInterceptedException):
         print(f"  • Warning: {element_name} not visible or clickable within timeout, skipping.")
     except StaleElementReferenceException:
         print(f"  • Warning: {element_name} became stale, skipping.")
     except Exception as e:
         print(f"  • Error filling '{element_name}': {e}")
+    return False
 
 def scroll_to_element(driver, element):
     """Scroll to an element with natural, human-like behavior."""
@@ -183,30 +199,148 @@ def get_element_label(driver, element, form=None):
     return element_name or element.get_attribute("type") or "Unknown Element"
 
 
-def fill_form_page(driver, resume_path):
+# Collects every fillable field under a root element in one round trip, using
+# the same label heuristics as get_element_label (label[for], parent text,
+# wrapping label, fieldset legend, aria-label, placeholder, name/type).
+EXTRACT_FIELDS_JS = """
+const root = arguments[0] || document;
+const skip = ['hidden', 'submit', 'button', 'reset', 'image'];
+const firstLine = (text) => (text || '').trim().split('\\n')[0].trim();
+
+function labelFor(el) {
+    if (el.id) {
+        const label = root.querySelector('label[for="' + CSS.escape(el.id) + '"]');
+        if (label && label.innerText.trim()) return label.innerText.trim();
+    }
+    let parent = el.parentElement;
+    for (let i = 0; i < 3 && parent; i++) {
+        const text = firstLine(parent.innerText);
+        if (text && text.length < 100) return text;
+        if (parent.tagName === 'LABEL' && parent.innerText.trim()) return parent.innerText.trim();
+        if (parent.tagName === 'FIELDSET') {
+            const legend = parent.querySelector('legend');
+            if (legend && legend.innerText.trim()) return legend.innerText.trim();
+        }
+        parent = parent.parentElement;
+    }
+    if (el.getAttribute('aria-label')) return el.getAttribute('aria-label').trim();
+    if (el.getAttribute('placeholder')) return el.getAttribute('placeholder').trim();
+    return el.getAttribute('name') || el.getAttribute('type') || 'Unknown Element';
+}
+
+const fields = [];
+root.querySelectorAll('input, textarea, select').forEach((el) => {
+    const tag = el.tagName.toLowerCase();
+    const type = (tag === 'input' ? (el.getAttribute('type') || 'text') : tag).toLowerCase();
+    if (skip.includes(type) || el.disabled) return;
+    fields.push([el, {
+        tag: tag,
+        type: type,
+        id: el.id || null,
+        name: el.getAttribute('name'),
+        label: labelFor(el),
+        aria_label: el.getAttribute('aria-label'),
+        placeholder: el.getAttribute('placeholder'),
+        autocomplete: el.getAttribute('autocomplete'),
+        required: el.required || el.getAttribute('aria-required') === 'true',
+    }]);
+});
+return fields;
+"""
+
+
+def extract_field_descriptors(driver, form=None):
+    """
+    Describes every fillable input/textarea/select in one WebDriver call.
+
+    Returns:
+        List of (element, descriptor) pairs. Descriptors are plain dicts with
+        tag, type, id, name, label, aria_label, placeholder, autocomplete and
+        required, the shape field_matcher.match_fields expects.
+    """
+    return [tuple(pair) for pair in driver.execute_script(EXTRACT_FIELDS_JS, form)]
+
+
+# Finds elements described by a static schema (form_analysis): by id, else by tag and name
+LOCATE_FIELDS_JS = """
+return arguments[0].map((field) => {
+    if (field.id) {
+        const el = document.getElementById(field.id);
+        if (el) return el;
+    }
+    if (field.name) {
+        return document.querySelector(field.tag + '[name="' + CSS.escape(field.name) + '"]');
+    }
+    return null;
+});
+"""
+
+
+def locate_fields(driver, descriptors):
+    """
+    The elements for descriptors taken from a prefetched static schema, in
+    one WebDriver call, so fields matched before the browser opened can be
+    filled without describing the page again.
+
+    Returns:
+        List of elements, None where a field wasn't found on the live page.
+    """
+    keys = [{"tag": d["tag"], "id": d.get("id"), "name": d.get("name")} for d in descriptors]
+    return driver.execute_script(LOCATE_FIELDS_JS, keys) if keys else []
+
+
+def resolve_resume(resume_path):
+    """The absolute path of the resume if it exists, otherwise None (reported once)."""
+    if resume_path and os.path.isfile(resume_path):
+        return os.path.abspath(resume_path)
+    if resume_path:
+        print(f"Error: Resume file not found at '{resume_path}'. Resume fields will be left empty.")
+    return None
+
+
+def fill_form_page(driver, resume_path, project_index=None):
     """
     Fills text fields, attempts to handle dropdowns using keyboard simulation,
     and uploads resume on the current page.
 
     Args:
         driver: The Selenium WebDriver instance.
-        resume_path: The absolute path to the resume file.
+        resume_path: The absolute path to the resume file, already checked
+            with resolve_resume(), or None to leave resume inputs empty.
+        project_index: Optional ProjectIndex; textareas are answered with the
+            project passage that best matches their label instead of "A".
+
+    Returns:
+        A dict summarising the page: how many text fields, dropdowns and file
+        inputs were found, and how many of each were filled.
     """
     print("-" * 30)
     print("Attempting to fill form fields on the current page...")
 
+    report = {
+        "form_found": False,
+        "text_found": 0,
+        "text_filled": 0,
+        "dropdowns_found": 0,
+        "dropdowns_filled": 0,
+        "files_found": 0,
+        "resume_attached": False,
+    }
+
+    # Waits on this page are budgeted from how fast its host has been so far
+    latency_tracker.note_page(driver)
+
     try:
         # Wait for the form element to be present
-        form = WebDriverWait(driver, 15).until(
-            EC.presence_of_element_located((By.TAG_NAME, "form"))
-        )
+        form = latency_tracker.wait(driver, "form", EC.presence_of_element_located((By.TAG_NAME, "form")))
         print("Form element found.")
+        report["form_found"] = True
     except TimeoutException:
         print("Error: Could not find a <form> element on the page within timeout.")
-        return # Cannot proceed without a form
+        return report # Cannot proceed without a form
     except Exception as e:
         print(f"An error occurred while finding the form: {e}")
-        return
+        return report
 
     # 1. Fill text-based inputs and textareas with "A"
     text_selectors = [
@@ -223,10 +357,15 @@ def fill_form_page(driver, resume_path):
             # Find elements within the *form*
             fields = form.find_elements(By.CSS_SELECTOR, sel)
             # print(f"Found {len(fields)} elements for selector '{sel}'.") # Debugging
+            report["text_found"] += len(fields)
             for field in fields:
                  label = get_element_label(driver, field, form)
+                 value = "A"
+                 if sel == "textarea" and project_index is not None:
+                     value = project_index.answer(label) or "A"
                  print(f"Filling field '{label}' (Selector: {sel})")
-                 safe_send_keys(driver, field, "A", f"text field '{label}'")
+                 if safe_send_keys(driver, field, value, f"text field '{label}'"):
+                     report["text_filled"] += 1
 
         except StaleElementReferenceException:
              print(f"  • Warning: Elements for selector '{sel}' became stale, skipping remaining for this selector.")
@@ -244,6 +383,7 @@ def fill_form_page(driver, resume_path):
         dropdown_elements_xpath = "//select[not(contains(@style, 'display: none')) and not(@disabled)] | //*[(@role='combobox' or @role='listbox' or contains(@class, 'select2-container') or contains(@class, 'chosen-container')) and not(contains(@style, 'display: none')) and not(@disabled)] | //select[contains(@style, 'display: none')]//following-sibling::*[not(contains(@style, 'display: none')) and not(@disabled)][1]"
 
         dropdown_elements = form.find_elements(By.XPATH, dropdown_elements_xpath)
+        report["dropdowns_found"] = len(dropdown_elements)
         # print(f"Found {len(dropdown_elements)} potential dropdown elements.") # Debugging
 
         for dropdown_elem in dropdown_elements:
@@ -274,6 +414,7 @@ def fill_form_page(driver, resume_path):
                          print("  • Sending Keys.ENTER")
                          dropdown_elem.send_keys(Keys.ENTER)
                          print("  • Keyboard simulation complete for dropdown.")
+                         report["dropdowns_filled"] += 1
                          time.sleep(0.5) # Pause after selection
 
                     except StaleElementReferenceException:
@@ -300,6 +441,7 @@ def fill_form_page(driver, resume_path):
     try:
         # Find all file inputs within the form context
         file_inputs = form.find_elements(By.CSS_SELECTOR, "input[type='file']")
+        report["files_found"] = len(file_inputs)
         # print(f"Found {len(file_inputs)} file input elements.") # Debugging
 
         resume_attached = False # Flag to ensure we only attach resume once if multiple file inputs match
@@ -339,19 +481,18 @@ def fill_form_page(driver, resume_path):
 
                 if is_resume_field:
                     print(f"  • Identified as a potential resume/CV upload field.")
-                    print(f"  • Attaching resume file: '{os.path.basename(resume_path)}'")
-
-                    # Ensure the resume file exists
-                    if not os.path.exists(resume_path):
-                        print(f"  • Error: Resume file not found at '{resume_path}'. Cannot attach.")
+                    # Checked once per run by resolve_resume(); None means there is nothing to attach
+                    if not resume_path:
+                        print("  • No resume file available. Cannot attach.")
                         continue # Skip this file input
+                    print(f"  • Attaching resume file: '{os.path.basename(resume_path)}'")
 
                     try:
                         # Wait for the file input element to be present and potentially interactable by send_keys.
                         # Using EC.presence_of_element_located is often sufficient for hidden file inputs.
                         # EC.element_to_be_clickable might fail if the element is truly hidden/overlaid.
                         # Rely on send_keys working on hidden inputs.
-                        WebDriverWait(driver, 10).until(
+                        latency_tracker.wait(driver, "file_input",
                              EC.presence_of_element_located((By.XPATH, f".//input[@id='{fld_id}' and @type='file']" if fld_id else f".//input[@name='{fld_name}' and @type='file']" if fld_name else ".//input[@type='file']") ) # Use xpath relative to form for robustness
                          )
                         # It's crucial that the file input element found here is the actual one
@@ -361,6 +502,7 @@ def fill_form_page(driver, resume_path):
                         # Add a small pause for the website's JavaScript to process the file selection
                         time.sleep(2)
                         resume_attached = True # Mark resume as attached
+                        report["resume_attached"] = True
 
                     except StaleElementReferenceException:
                         print(f"  • Warning: File input field '{label}' became stale during interaction, skipping.")
@@ -380,6 +522,103 @@ def fill_form_page(driver, resume_path):
     except Exception as e:
         print(f"  • An error occurred while trying to find file input elements: {e}")
 
+    return report
+
+
+def fill_all_pages(driver, resume_path, on_page_filled=None, max_pages=20, project_index=None):
+    """
+    Fills the current page, then keeps clicking Next/Continue and filling
+    each following page until no such button is left.
+
+    Args:
+        driver: The Selenium WebDriver instance, already on the first form page.
+        resume_path: The absolute path to the resume file.
+        on_page_filled: Optional callback(driver, page_report) run after each
+            page is filled and before moving on to the next one.
+        max_pages: Safety cap on the number of pages to walk through.
+        project_index: Optional ProjectIndex passed on to fill_form_page.
+
+    Returns:
+        A list with one fill_form_page report per page (each with a "page" key).
+    """
+    pages = []
+    page_num = 1
+    # Checked once here instead of for every file input on every page
+    resume_path = resolve_resume(resume_path)
+    while page_num <= max_pages:
+        print(f"\n--- Processing Page {page_num} ---")
+
+        # Fill the form on the current page
+        page_report = fill_form_page(driver, resume_path, project_index=project_index)
+        page_report["page"] = page_num
+        pages.append(page_report)
+        if on_page_filled:
+            on_page_filled(driver, page_report)
+
+        # Look for a "Next" or "Continue" button
+        # Look for buttons or submit inputs with text or value containing "next" or "continue" (case-insensitive)
+        next_button = None
+        # XPath to find visible and enabled buttons/submit inputs with relevant text/value
+        # Added space checks around text/value to avoid partial matches within words
+        next_button_xpath = "//*[(self::button or (self::input and @type='submit')) and (contains(translate(concat(' ', normalize-space(.), ' '), ' ABCDEFGHIJKLMNOPQRSTUVWXYZ', ' abcd efghijklmnopqrstuvwxyz'), ' next ') or contains(translate(concat(' ', normalize-space(@value), ' '), ' ABCDEFGHIJKLMNOPQRSTUVWXYZ', ' abcd efghijklmnopqrstuvwxyz'), ' next ') or contains(translate(concat(' ', normalize-space(.), ' '), ' ABCDEFGHIJKLMNOPQRSTUVWXYZ', ' abcd efghijklmnopqrstuvwxyz'), ' continue ') or contains(translate(concat(' ', normalize-space(@value), ' '), ' ABCDEFGHIJKLMNOPQRSTUVWXYZ', ' abcd efghijklmnopqrstuvwxyz'), ' continue ')) and not(@disabled)]"
+
+
+        print("Checking for Next/Continue button...")
+        try:
+            # Use find_elements to avoid immediate NoSuchElementException if button is absent
+            potential_next_buttons = driver.find_elements(By.XPATH, next_button_xpath)
+
+            # Find the first visible and enabled button
+            for btn in potential_next_buttons:
+                 if btn.is_displayed() and btn.is_enabled():
+                     next_button = btn
+                     break # Found a suitable next button
+
+        except Exception as e:
+             print(f"  • Error while searching for potential next buttons: {e}")
+             # If finding elements fails broadly, assume no next button can be found
+             pass # Continue to check if next_button was found
+
+
+        if next_button:
+            btn_display_text = next_button.text or next_button.get_attribute("value") or "Next/Continue Button"
+            print(f"Found '{btn_display_text.strip()}' button. Attempting to click...")
+            try:
+                # Wait for the specific next button found to be clickable
+                latency_tracker.wait(driver, "next_button", EC.element_to_be_clickable(next_button))
+                next_button.click()
+                print("Clicked Next/Continue button.")
+                page_num += 1
+                # Add a wait for the *next* page to load, e.g., wait for the form to reappear or a new element specific to the next page
+                print("Waiting for the next page to load...")
+                # Waiting for the form again is a general approach, but a more specific element is better if known.
+                latency_tracker.wait(driver, "next_page", EC.presence_of_element_located((By.TAG_NAME, "form")))
+                print("Next page loaded.")
+                time.sleep(2) # Short sleep after load for stability
+
+                continue  # process the next page
+
+            except StaleElementReferenceException:
+                print("  • Next/Continue button became stale before clicking, re-trying page processing.")
+                # If the button becomes stale right before clicking, the page might have already changed
+                # or be in the process. We can try to re-process the current (potentially new) page.
+                continue # Go to the next iteration of the main while loop
+
+            except (TimeoutException, ElementClickInterceptedException) as e:
+                print(f"  • Failed to click next button within timeout or click intercepted: {e}")
+                print("Likely reached the last page or encountered an unclickable element. Stopping.")
+                break # Exit the loop if click fails
+
+            except Exception as e:
+                print(f"  • An unexpected error occurred while trying to click the next button: {e}")
+                break # Exit the loop on unexpected errors
+
+        else:
+            print("\nNo clickable 'Next' or 'Continue' button found. Finished form automation or reached the end.")
+            break # Exit the loop if no next button is found
+
+    return pages
+
 
 def main():
     # ▶︎ Configuration
@@ -400,6 +639,12 @@ def main():
     else:
         print(f"Using resume file from: {resume_path}")
 
+    # Project passages for textareas, built with `python project_index.py build`
+    project_index = None
+    index_path = os.environ.get("PROJECT_INDEX_PATH", os.path.join(script_dir, "projects.bm25"))
+    if os.path.exists(index_path):
+        project_index = ProjectIndex.load(index_path)
+        print(f"Answering textareas from {project_index.n_docs} project passages in {index_path}")
 
     # ▶︎ Initialize Chrome
     driver = None
@@ -415,85 +660,13 @@ def main():
 
         # Wait for the initial page to load and a form element to be present
         print("Waiting for the initial page to load and form to be present...")
-        WebDriverWait(driver, 10).until(
-             EC.presence_of_element_located((By.TAG_NAME, "form"))
-        )
+        latency_tracker.note_page(driver, url)
+        latency_tracker.wait(driver, "form", EC.presence_of_element_located((By.TAG_NAME, "form")))
         print("Initial page loaded and form found.")
         time.sleep(2) # Give a little extra time for potential JavaScript rendering
 
         # ▶︎ Loop through pages until no Next/Continue button found
-        page_num = 1
-        while True:
-            print(f"\n--- Processing Page {page_num} ---")
-
-            # Fill the form on the current page
-            fill_form_page(driver, resume_path)
-
-            # Look for a "Next" or "Continue" button
-            # Look for buttons or submit inputs with text or value containing "next" or "continue" (case-insensitive)
-            next_button = None
-            # XPath to find visible and enabled buttons/submit inputs with relevant text/value
-            # Added space checks around text/value to avoid partial matches within words
-            next_button_xpath = "//*[(self::button or (self::input and @type='submit')) and (contains(translate(concat(' ', normalize-space(.), ' '), ' ABCDEFGHIJKLMNOPQRSTUVWXYZ', ' abcd efghijklmnopqrstuvwxyz'), ' next ') or contains(translate(concat(' ', normalize-space(@value), ' '), ' ABCDEFGHIJKLMNOPQRSTUVWXYZ', ' abcd efghijklmnopqrstuvwxyz'), ' next ') or contains(translate(concat(' ', normalize-space(.), ' '), ' ABCDEFGHIJKLMNOPQRSTUVWXYZ', ' abcd efghijklmnopqrstuvwxyz'), ' continue ') or contains(translate(concat(' ', normalize-space(@value), ' '), ' ABCDEFGHIJKLMNOPQRSTUVWXYZ', ' abcd efghijklmnopqrstuvwxyz'), ' continue ')) and not(@disabled)]"
-
-
-            print("Checking for Next/Continue button...")
-            try:
-                # Use find_elements to avoid immediate NoSuchElementException if button is absent
-                potential_next_buttons = driver.find_elements(By.XPATH, next_button_xpath)
-
-                # Find the first visible and enabled button
-                for btn in potential_next_buttons:
-                     if btn.is_displayed() and btn.is_enabled():
-                         next_button = btn
-                         break # Found a suitable next button
-
-            except Exception as e:
-                 print(f"  • Error while searching for potential next buttons: {e}")
-                 # If finding elements fails broadly, assume no next button can be found
-                 pass # Continue to check if next_button was found
-
-
-            if next_button:
-                btn_display_text = next_button.text or next_button.get_attribute("value") or "Next/Continue Button"
-                print(f"Found '{btn_display_text.strip()}' button. Attempting to click...")
-                try:
-                    # Wait for the specific next button found to be clickable
-                    WebDriverWait(driver, 10).until(
-                         EC.element_to_be_clickable(next_button)
-                    )
-                    next_button.click()
-                    print("Clicked Next/Continue button.")
-                    page_num += 1
-                    # Add a wait for the *next* page to load, e.g., wait for the form to reappear or a new element specific to the next page
-                    print("Waiting for the next page to load...")
-                    # Waiting for the form again is a general approach, but a more specific element is better if known.
-                    WebDriverWait(driver, 20).until(
-                         EC.presence_of_element_located((By.TAG_NAME, "form"))
-                    )
-                    print("Next page loaded.")
-                    time.sleep(2) # Short sleep after load for stability
-
-                    continue  # process the next page
-
-                except StaleElementReferenceException:
-                    print("  • Next/Continue button became stale before clicking, re-trying page processing.")
-                    # If the button becomes stale right before clicking, the page might have already changed
-                    # or be in the process. We can try to re-process the current (potentially new) page.
-                    continue # Go to the next iteration of the main while loop
-
-                except (TimeoutException, ElementClickInterceptedException) as e:
-                    print(f"  • Failed to click next button within timeout or click intercepted: {e}")
-                    print("Likely reached the last page or encountered an unclickable element. Stopping.")
-                    break # Exit the loop if click fails
-
-                except Exception as e:
-                    print(f"  • An unexpected error occurred while trying to click the next button: {e}")
-                    break # Exit the loop on unexpected errors
-
-            else:
-                print("\nNo clickable 'Next' or 'Continue' button found. Finished form automation or reached the end.")
-                break # Exit the loop if no next button is found
+        fill_all_pages(driver, resume_path, project_index=project_index)
 
     except WebDriverException as e:
         print(f"\nAn error occurred with the WebDriver: {e}")
@@ -0,0 +1,213 @@
+import os
+import json
+import time
+import uuid
+import asyncio
+import hashlib
+import sqlite3
+import threading
+from concurrent.futures import Future
+
+from fastapi.concurrency import run_in_threadpool
+
+
+def user_identity(user):
+    """Who is applying: the email when there is one, otherwise name and phone."""
+    get = user.get if isinstance(user, dict) else lambda name: getattr(user, name, None)
+    identity = get("email") or "|".join(str(get(name) or "") for name in ("firstName", "lastName", "phone"))
+    return identity.strip().lower()
+
+
+def idempotency_key(user, job_id, apply_url, client_key=None):
+    """
+    Stable key for "this user applying to this job at this URL".
+
+    The user is identified by email when there is one, otherwise by name
+    and phone, so a double-click or a retry maps to the same key. A client's
+    Idempotency-Key header replaces job and URL but is still scoped to the
+    user, so two users sending the same header never share a result.
+    """
+    if client_key is not None:
+        raw = "\n".join([user_identity(user), "client", client_key])
+    else:
+        raw = "\n".join([user_identity(user), str(job_id), apply_url or ""])
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class SqliteIdempotencyStore:
+    """
+    Claims and results shared by every API worker using the same database file.
+
+    A key is claimed atomically (BEGIN IMMEDIATE); other workers wait for its
+    result instead of running it again. A claim older than `lease` seconds is
+    considered abandoned (its worker died) and can be taken over.
+    """
+
+    def __init__(self, path, lease=600, ttl=3600):
+        self.path = path
+        self.lease = lease
+        self.ttl = ttl
+        self.owner = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        with self._connect() as db:
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS idempotency ("
+                " key TEXT PRIMARY KEY, status TEXT NOT NULL, owner TEXT, result TEXT, updated REAL NOT NULL)"
+            )
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30, isolation_level=None)
+
+    def claim(self, key, retry_failed=True):
+        """
+        Returns ("claimed", None) if this worker should run key, otherwise
+        (status, result) of the execution that owns it ("running", "done" or "failed").
+
+        A failed result is run again unless retry_failed is False, which is
+        what a worker that was waiting on that very execution passes.
+        """
+        now = time.time()
+        db = self._connect()
+        try:
+            db.execute("BEGIN IMMEDIATE")
+            row = db.execute("SELECT status, result, updated FROM idempotency WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                status, result, updated = row
+                running = status == "running" and now - updated < self.lease
+                done = status == "done" and now - updated < self.ttl
+                failed = status == "failed" and not retry_failed
+                if running or done or failed:
+                    db.execute("COMMIT")
+                    return status, json.loads(result) if result else None
+            db.execute(
+                "INSERT OR REPLACE INTO idempotency (key, status, owner, result, updated) VALUES (?, 'running', ?, NULL, ?)",
+                (key, self.owner, now),
+            )
+            db.execute("COMMIT")
+            return "claimed", None
+        except Exception:
+            db.execute("ROLLBACK")
+            raise
+        finally:
+            db.close()
+
+    def finish(self, key, result, succeeded):
+        with self._connect() as db:
+            db.execute(
+                "UPDATE idempotency SET status = ?, result = ?, updated = ? WHERE key = ? AND owner = ?",
+                ("done" if succeeded else "failed", json.dumps(result), time.time(), key, self.owner),
+            )
+
+    def release(self, key):
+        """Drops an unfinished claim (the execution raised) so a retry can run it."""
+        with self._connect() as db:
+            db.execute("DELETE FROM idempotency WHERE key = ? AND owner = ? AND status = 'running'", (key, self.owner))
+
+
+class IdempotencyRegistry:
+    """
+    Runs each idempotency key at most once at a time, and remembers successful
+    results for `ttl` seconds.
+
+    Duplicates arriving while a key is running attach to the running execution
+    and get its result. In-process that's a shared Future; with a store (see
+    SqliteIdempotencyStore) the claim also holds across API workers, and
+    workers that didn't win it poll the store for the result.
+
+    Args:
+        store: Optional shared store for multi-worker deployments.
+        ttl: Seconds a successful result is replayed to retries.
+        poll_interval: Seconds between store checks while another worker runs a key.
+    """
+
+    def __init__(self, store=None, ttl=3600, poll_interval=0.5):
+        self.store = store
+        self.ttl = ttl
+        self.poll_interval = poll_interval
+        self.lock = threading.Lock()
+        self.running = {}     # key -> Future shared by duplicates in this process
+        self.completed = {}   # key -> (result, finished_at) for successful runs
+
+    @classmethod
+    def from_env(cls):
+        """Shares claims through the SQLite file in IDEMPOTENCY_DB when set."""
+        path = os.environ.get("IDEMPOTENCY_DB")
+        ttl = float(os.environ.get("IDEMPOTENCY_TTL_S", 3600))
+        return cls(SqliteIdempotencyStore(path, ttl=ttl) if path else None, ttl=ttl)
+
+    def _completed(self, key):
+        with self.lock:
+            entry = self.completed.get(key)
+            if entry and time.time() - entry[1] < self.ttl:
+                return entry[0]
+            self.completed.pop(key, None)
+            return None
+
+    def _remember(self, key, result):
+        now = time.time()
+        with self.lock:
+            # Entries are in the order they finished, so the expired ones are at the front
+            while self.completed:
+                oldest = next(iter(self.completed))
+                if now - self.completed[oldest][1] < self.ttl:
+                    break
+                del self.completed[oldest]
+            self.completed.pop(key, None)
+            self.completed[key] = (result, now)
+
+    async def execute(self, key, run, succeeded=lambda result: bool(result.get("success"))):
+        """
+        Awaits run() for key unless it is already running or recently succeeded.
+
+        Returns:
+            (result, deduplicated): deduplicated is True when the result came
+            from another execution rather than a new run.
+        """
+        result = self._completed(key)
+        if result is not None:
+            return result, True
+
+        with self.lock:
+            future = self.running.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self.running[key] = future
+        if not owner:
+            return await asyncio.wrap_future(future), True
+
+        try:
+            result, deduplicated = await self._run_claimed(key, run, succeeded)
+            if succeeded(result):
+                self._remember(key, result)
+            future.set_result(result)
+            return result, deduplicated
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self.lock:
+                self.running.pop(key, None)
+
+    async def _run_claimed(self, key, run, succeeded):
+        if self.store is None:
+            return await run(), False
+        status, result = await run_in_threadpool(self.store.claim, key)
+        while status == "running":
+            # Another worker is running it; share its outcome, whatever it is
+            await asyncio.sleep(self.poll_interval)
+            status, result = await run_in_threadpool(self.store.claim, key, False)
+        if status != "claimed":
+            return result, True
+        try:
+            result = await run()
+        except BaseException:
+            await run_in_threadpool(self.store.release, key)
+            raise
+        await run_in_threadpool(self.store.finish, key, result, succeeded(result))
+        return result, False
+
+    def summary(self):
+        with self.lock:
+            return {"running": len(self.running), "completed": len(self.completed),
+                    "shared": self.store.path if self.store else None}
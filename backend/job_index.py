@@ -0,0 +1,241 @@
+import re
+import json
+import uuid
+import threading
+from datetime import datetime, date
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+# Query parameters that only track where a click came from
+TRACKING_PARAMS = {
+    "gh_src", "src", "source", "ref", "referrer", "from", "trk", "trackingid",
+    "fbclid", "gclid", "mc_cid", "mc_eid", "lever-source", "lever-origin",
+}
+
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "in", "is",
+    "it", "of", "on", "or", "our", "that", "the", "to", "we", "will", "with", "you", "your",
+}
+
+TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#]*(?:\.[a-z0-9]+)*")
+
+
+def tokenize(text):
+    """Lowercased word tokens, keeping things like c++, c#, node.js intact."""
+    if not text:
+        return []
+    return [t for t in TOKEN_RE.findall(text.lower()) if t not in STOPWORDS]
+
+
+def canonical_url(url):
+    """Normalizes an apply URL so tracking variants of the same link compare equal."""
+    if not url:
+        return None
+    parts = urlsplit(url.strip())
+    if not parts.netloc:
+        return None
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    query = [
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not k.lower().startswith("utm_") and k.lower() not in TRACKING_PARAMS
+    ]
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit(("https", host, path, urlencode(sorted(query)), ""))
+
+
+def fingerprint(job):
+    """(company, positionName, location) with case, punctuation and spacing ignored."""
+    fields = (job.get("company"), job.get("positionName"), job.get("location"))
+    if not all(fields):
+        return None
+    return "|".join(" ".join(tokenize(str(f))) for f in fields)
+
+
+def posted_date(job):
+    """Best-effort posting date: postingDateParsed, else an ISO postedAt. None if unknown."""
+    for key in ("postingDateParsed", "postedAt"):
+        value = job.get(key)
+        if not value or not isinstance(value, str):
+            continue
+        try:
+            return datetime.fromisoformat(value.replace("Z", "+00:00")).date()
+        except ValueError:
+            continue  # Relative strings like "30+ days ago"
+    return None
+
+
+def job_types(job):
+    value = job.get("jobType") or []
+    if isinstance(value, str):
+        value = [value]
+    return {t.lower() for t in value}
+
+
+class JobIndex:
+    """
+    Accumulates jobs from every search, deduplicated, with an inverted index
+    over title and description for local full-text and filter queries.
+
+    A job is the same posting as one already indexed if it shares its id, its
+    canonical apply URL, or its (company, positionName, location) fingerprint.
+    Duplicates are merged into the existing entry (newer fields win) instead of
+    being stored again.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.docs = {}           # doc number -> job dict
+        self.by_id = {}          # job id -> doc number
+        self.by_url = {}         # canonical apply URL -> doc number
+        self.by_fingerprint = {}  # fingerprint -> doc number
+        self.title_postings = {}  # token -> set of doc numbers
+        self.text_postings = {}   # token -> set of doc numbers (title + description)
+        self.dates = {}          # doc number -> posting date
+        self.next_doc = 0
+        # Cache validators: the generation is bumped on every change, and the
+        # instance tells this process's index apart from other API workers'
+        self.generation = 0
+        self.instance = uuid.uuid4().hex
+
+    def __len__(self):
+        return len(self.docs)
+
+    def _keys(self, job):
+        url = canonical_url(job.get("externalApplyLink") or job.get("url"))
+        return job.get("id"), url, fingerprint(job)
+
+    def _find(self, job_id, url, fp):
+        for doc, mapping in ((job_id, self.by_id), (url, self.by_url), (fp, self.by_fingerprint)):
+            if doc is not None and doc in mapping:
+                return mapping[doc]
+        return None
+
+    def _unindex(self, doc):
+        job = self.docs[doc]
+        for token in set(tokenize(job.get("positionName"))):
+            self.title_postings.get(token, set()).discard(doc)
+        for token in set(tokenize(job.get("positionName")) + tokenize(job.get("description"))):
+            self.text_postings.get(token, set()).discard(doc)
+
+    def _index(self, doc):
+        job = self.docs[doc]
+        title_tokens = tokenize(job.get("positionName"))
+        for token in set(title_tokens):
+            self.title_postings.setdefault(token, set()).add(doc)
+        for token in set(title_tokens + tokenize(job.get("description"))):
+            self.text_postings.setdefault(token, set()).add(doc)
+        self.dates[doc] = posted_date(job)
+
+    def add(self, job):
+        """
+        Adds one job, merging it into an existing entry if it's a duplicate.
+
+        Returns:
+            True if the job was new, False if it was merged into a known one.
+        """
+        job_id, url, fp = self._keys(job)
+        with self.lock:
+            doc = self._find(job_id, url, fp)
+            is_new = doc is None
+            if is_new:
+                doc = self.next_doc
+                self.next_doc += 1
+                self.docs[doc] = dict(job)
+            else:
+                self._unindex(doc)
+                # Keep the first id we saw so clients holding it still resolve
+                merged = {**self.docs[doc], **{k: v for k, v in job.items() if v is not None}}
+                merged["id"] = self.docs[doc].get("id", job_id)
+                self.docs[doc] = merged
+            for key, mapping in ((job_id, self.by_id), (url, self.by_url), (fp, self.by_fingerprint)):
+                if key is not None:
+                    mapping.setdefault(key, doc)
+            self._index(doc)
+            self.generation += 1
+        return is_new
+
+    def add_many(self, jobs):
+        """Adds jobs, returning how many were new."""
+        return sum(1 for job in jobs if self.add(job))
+
+    def get(self, job_id):
+        with self.lock:
+            doc = self.by_id.get(job_id)
+            return dict(self.docs[doc]) if doc is not None else None
+
+    def search(self, query=None, job_type=None, location=None, posted_after=None, posted_before=None,
+               skills=None, limit=50):
+        """
+        Finds indexed jobs matching all query words and filters.
+
+        Args:
+            query: Free text; every word must appear in the title or description.
+            job_type: e.g. "Full-time", matched case-insensitively against jobType.
+            location: Substring of the job location ("remote", "MA", ...).
+            posted_after / posted_before: date or ISO date strings, inclusive.
+                Jobs without a parseable posting date are excluded when set.
+            skills: Skill ids (see skills.py) the job must all be tagged with.
+            limit: Maximum number of jobs to return.
+
+        Returns:
+            Jobs ranked by how many query words hit the title, newest first.
+        """
+        tokens = list(dict.fromkeys(tokenize(query)))
+        posted_after = _as_date(posted_after)
+        posted_before = _as_date(posted_before)
+        location = location.lower() if location else None
+        job_type = job_type.lower() if job_type else None
+        skills = set(skills) if skills else None
+
+        with self.lock:
+            if tokens:
+                # Intersect rarest first so the candidate set shrinks fast
+                postings = sorted((self.text_postings.get(t, set()) for t in tokens), key=len)
+                candidates = set(postings[0])
+                for posting in postings[1:]:
+                    candidates &= posting
+            else:
+                candidates = set(self.docs)
+
+            results = []
+            for doc in candidates:
+                job = self.docs[doc]
+                if job_type and job_type not in job_types(job):
+                    continue
+                if location and location not in (job.get("location") or "").lower():
+                    continue
+                if skills and not skills.issubset(job.get("skills") or ()):
+                    continue
+                posted = self.dates.get(doc)
+                if (posted_after or posted_before) and posted is None:
+                    continue
+                if posted_after and posted < posted_after:
+                    continue
+                if posted_before and posted > posted_before:
+                    continue
+                title_hits = sum(1 for t in tokens if doc in self.title_postings.get(t, ()))
+                results.append((-title_hits, -(posted or date.min).toordinal(), doc))
+
+            results.sort()
+            return [dict(self.docs[doc]) for _, _, doc in results[:limit]]
+
+    def save(self, path):
+        """Writes the indexed jobs to a JSON file (the index is rebuilt on load)."""
+        with self.lock:
+            jobs = [self.docs[doc] for doc in sorted(self.docs)]
+        with open(path, "w") as f:
+            json.dump(jobs, f)
+
+    @classmethod
+    def load(cls, path):
+        index = cls()
+        with open(path) as f:
+            index.add_many(json.load(f))
+        return index
+
+
+def _as_date(value):
+    if value is None or isinstance(value, date):
+        return value
+    return date.fromisoformat(value)
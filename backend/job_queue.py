@@ -0,0 +1,384 @@
+import os
+import json
+import time
+import uuid
+import socket
+import sqlite3
+from collections.abc import MutableMapping
+
+# Task states: queued -> leased -> done | failed; a leased task whose lease runs out
+# (its worker crashed or hung) goes back to queued until max_attempts is reached
+TASK_STATES = ("queued", "leased", "done", "failed")
+
+
+def worker_identity():
+    """Default worker id: host, pid and a random suffix, so restarts never reuse a lease."""
+    return f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+
+
+class LeasedTask:
+    def __init__(self, task_id, job_id, payload, attempts):
+        self.id = task_id
+        self.job_id = job_id
+        self.payload = payload
+        self.attempts = attempts
+
+
+class StatusMap(MutableMapping):
+    """
+    application_status backed by a queue, so the API serving /apply/{job_id}/status
+    sees what the worker running the application wrote.
+    """
+
+    def __init__(self, queue):
+        self.queue = queue
+
+    def __getitem__(self, job_id):
+        status = self.queue.get_status(job_id)
+        if status is None:
+            raise KeyError(job_id)
+        return status
+
+    def __setitem__(self, job_id, status):
+        self.queue.set_status(job_id, status)
+
+    def __delitem__(self, job_id):
+        self.queue.delete_status(job_id)
+
+    def __iter__(self):
+        return iter(self.queue.status_ids())
+
+    def __len__(self):
+        return len(self.queue.status_ids())
+
+
+class SqliteQueue:
+    """
+    Durable application queue in one SQLite file, for a single machine (API
+    and workers on the same disk) or for trying worker mode locally.
+
+    lease() hands the oldest queued task to a worker for `lease` seconds; the
+    worker extends it with heartbeat() while it runs and ends it with
+    finish(). Leases that run out are requeued by the next lease() call, or
+    failed after max_attempts. Statuses and worker heartbeats live here too.
+
+    Payloads hold the applicant's profile, so they are cleared as soon as a
+    task is finished, and finished tasks are deleted keep_finished seconds
+    later (long enough for the API to read their result).
+    """
+
+    def __init__(self, path, max_attempts=3, keep_finished=3600):
+        self.path = path
+        self.max_attempts = max_attempts
+        self.keep_finished = keep_finished
+        with self._connect() as db:
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS tasks ("
+                " id TEXT PRIMARY KEY, job_id TEXT NOT NULL, payload TEXT NOT NULL, state TEXT NOT NULL,"
+                " worker TEXT, lease_until REAL, attempts INTEGER NOT NULL DEFAULT 0, result TEXT,"
+                " created REAL NOT NULL, updated REAL NOT NULL)"
+            )
+            db.execute("CREATE INDEX IF NOT EXISTS tasks_state ON tasks (state, created)")
+            db.execute("CREATE TABLE IF NOT EXISTS statuses (job_id TEXT PRIMARY KEY, status TEXT NOT NULL)")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS workers (id TEXT PRIMARY KEY, info TEXT NOT NULL, last_seen REAL NOT NULL)"
+            )
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30, isolation_level=None)
+
+    def enqueue(self, job_id, payload):
+        task_id = uuid.uuid4().hex
+        now = time.time()
+        with self._connect() as db:
+            db.execute(
+                "INSERT INTO tasks (id, job_id, payload, state, created, updated) VALUES (?, ?, ?, 'queued', ?, ?)",
+                (task_id, job_id, json.dumps(payload), now, now),
+            )
+        return task_id
+
+    def _requeue_expired(self, db, now):
+        """Requeues (or fails) tasks whose worker stopped heartbeating. Runs inside the caller's transaction."""
+        expired = db.execute(
+            "SELECT id, job_id, attempts, worker FROM tasks WHERE state = 'leased' AND lease_until < ?", (now,)
+        ).fetchall()
+        for task_id, job_id, attempts, worker in expired:
+            if attempts >= self.max_attempts:
+                result = {"success": False, "message": f"Application failed: worker lost {attempts} times"}
+                db.execute("UPDATE tasks SET state = 'failed', payload = 'null', result = ?, updated = ? WHERE id = ?",
+                           (json.dumps(result), now, task_id))
+                status = {"status": "failed", "message": result["message"], "timestamp": now}
+            else:
+                db.execute("UPDATE tasks SET state = 'queued', worker = NULL, lease_until = NULL, updated = ? "
+                           "WHERE id = ?", (now, task_id))
+                status = {"status": "queued", "message": f"Worker {worker} stopped responding, requeued",
+                          "timestamp": now}
+            db.execute("INSERT OR REPLACE INTO statuses (job_id, status) VALUES (?, ?)", (job_id, json.dumps(status)))
+            print(f"Lease on task {task_id} (job {job_id}) expired: {status['status']}")
+
+    def _purge_finished(self, db, now):
+        db.execute("DELETE FROM tasks WHERE state IN ('done', 'failed') AND updated < ?", (now - self.keep_finished,))
+
+    def lease(self, worker_id, lease=60):
+        """The oldest queued task, leased to worker_id for `lease` seconds, or None."""
+        now = time.time()
+        db = self._connect()
+        try:
+            db.execute("BEGIN IMMEDIATE")
+            self._requeue_expired(db, now)
+            self._purge_finished(db, now)
+            row = db.execute(
+                "SELECT id, job_id, payload, attempts FROM tasks WHERE state = 'queued' ORDER BY created LIMIT 1"
+            ).fetchone()
+            if row is not None:
+                db.execute(
+                    "UPDATE tasks SET state = 'leased', worker = ?, lease_until = ?, attempts = attempts + 1, "
+                    "updated = ? WHERE id = ?", (worker_id, now + lease, now, row[0]),
+                )
+            db.execute("COMMIT")
+        except Exception:
+            db.execute("ROLLBACK")
+            raise
+        finally:
+            db.close()
+        if row is None:
+            return None
+        return LeasedTask(row[0], row[1], json.loads(row[2]), row[3] + 1)
+
+    def heartbeat(self, worker_id, task_ids=(), lease=60, info=None):
+        """
+        Extends worker_id's leases on task_ids and records that it is alive.
+
+        Returns:
+            The task ids it still holds; a missing one was requeued after its lease ran out.
+        """
+        now = time.time()
+        held = set()
+        with self._connect() as db:
+            for task_id in task_ids:
+                cursor = db.execute(
+                    "UPDATE tasks SET lease_until = ?, updated = ? WHERE id = ? AND worker = ? AND state = 'leased'",
+                    (now + lease, now, task_id, worker_id),
+                )
+                if cursor.rowcount:
+                    held.add(task_id)
+            db.execute("INSERT OR REPLACE INTO workers (id, info, last_seen) VALUES (?, ?, ?)",
+                       (worker_id, json.dumps(info or {}), now))
+        return held
+
+    def finish(self, task_id, worker_id, result, succeeded):
+        """Records the result and clears the payload, unless the lease was lost (the task then belongs
+        to another worker). Returns whether it was recorded."""
+        with self._connect() as db:
+            cursor = db.execute(
+                "UPDATE tasks SET state = ?, payload = 'null', result = ?, lease_until = NULL, updated = ? "
+                "WHERE id = ? AND worker = ? AND state = 'leased'",
+                ("done" if succeeded else "failed", json.dumps(result), time.time(), task_id, worker_id),
+            )
+            return bool(cursor.rowcount)
+
+    def result(self, task_id):
+        """(state, result) of a task; result is None until it is done or failed."""
+        with self._connect() as db:
+            row = db.execute("SELECT state, result FROM tasks WHERE id = ?", (task_id,)).fetchone()
+        if row is None:
+            return None, None
+        return row[0], json.loads(row[1]) if row[1] else None
+
+    def retire(self, worker_id):
+        with self._connect() as db:
+            db.execute("DELETE FROM workers WHERE id = ?", (worker_id,))
+
+    def get_status(self, job_id):
+        with self._connect() as db:
+            row = db.execute("SELECT status FROM statuses WHERE job_id = ?", (job_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def set_status(self, job_id, status):
+        with self._connect() as db:
+            db.execute("INSERT OR REPLACE INTO statuses (job_id, status) VALUES (?, ?)", (job_id, json.dumps(status)))
+
+    def delete_status(self, job_id):
+        with self._connect() as db:
+            if not db.execute("DELETE FROM statuses WHERE job_id = ?", (job_id,)).rowcount:
+                raise KeyError(job_id)
+
+    def status_ids(self):
+        with self._connect() as db:
+            return [row[0] for row in db.execute("SELECT job_id FROM statuses")]
+
+    def summary(self, alive_within=60):
+        with self._connect() as db:
+            counts = dict(db.execute("SELECT state, COUNT(*) FROM tasks GROUP BY state").fetchall())
+            workers = db.execute("SELECT id, info, last_seen FROM workers WHERE last_seen > ?",
+                                 (time.time() - alive_within,)).fetchall()
+        return {
+            "backend": "sqlite",
+            "path": self.path,
+            "tasks": {state: counts.get(state, 0) for state in TASK_STATES},
+            "workers": {worker_id: {**json.loads(info), "last_seen": last_seen} for worker_id, info, last_seen in workers},
+        }
+
+
+# Atomically moves the next queued task into the lease set. KEYS: queued list, lease zset.
+# ARGV: lease deadline, worker id, task hash key prefix.
+LEASE_SCRIPT = """
+local task_id = redis.call('RPOP', KEYS[1])
+if not task_id then return nil end
+redis.call('ZADD', KEYS[2], ARGV[1], task_id)
+redis.call('HSET', ARGV[3] .. task_id, 'state', 'leased', 'worker', ARGV[2])
+redis.call('HINCRBY', ARGV[3] .. task_id, 'attempts', 1)
+return task_id
+"""
+
+# Runs only while ARGV[1] still holds the lease on KEYS[1] (task hash); KEYS[2]: lease zset.
+# ARGV[2] == 'extend': push the deadline to ARGV[3]; otherwise finish with state ARGV[2], result ARGV[3],
+# dropping the payload and expiring the task ARGV[4] seconds later.
+OWNED_SCRIPT = """
+if redis.call('HGET', KEYS[1], 'worker') ~= ARGV[1] or redis.call('HGET', KEYS[1], 'state') ~= 'leased' then
+  return 0
+end
+local task_id = redis.call('HGET', KEYS[1], 'id')
+if ARGV[2] == 'extend' then
+  redis.call('ZADD', KEYS[2], ARGV[3], task_id)
+else
+  redis.call('HSET', KEYS[1], 'state', ARGV[2], 'result', ARGV[3])
+  redis.call('HDEL', KEYS[1], 'payload')
+  redis.call('EXPIRE', KEYS[1], ARGV[4])
+  redis.call('ZREM', KEYS[2], task_id)
+end
+return 1
+"""
+
+
+class RedisQueue:
+    """
+    The same queue on Redis (or anything speaking its protocol), for API and
+    worker nodes on different machines. Needs the redis package.
+
+    Tasks are hashes, queued ids a list and leases a sorted set scored by
+    deadline; leasing and lease-checked updates are Lua scripts, so they are
+    atomic across workers. Finished tasks lose their payload and expire
+    after keep_finished seconds.
+    """
+
+    def __init__(self, url, max_attempts=3, prefix="apply", keep_finished=3600):
+        import redis
+        self.url = url
+        self.max_attempts = max_attempts
+        self.keep_finished = keep_finished
+        self.prefix = prefix
+        self.redis = redis.Redis.from_url(url, decode_responses=True)
+        self.lease_script = self.redis.register_script(LEASE_SCRIPT)
+        self.owned_script = self.redis.register_script(OWNED_SCRIPT)
+
+    def _key(self, name):
+        return f"{self.prefix}:{name}"
+
+    def _task_key(self, task_id):
+        return self._key(f"task:{task_id}")
+
+    def enqueue(self, job_id, payload):
+        task_id = uuid.uuid4().hex
+        pipe = self.redis.pipeline()
+        pipe.hset(self._task_key(task_id), mapping={
+            "id": task_id, "job_id": job_id, "payload": json.dumps(payload), "state": "queued",
+            "attempts": 0, "created": time.time(),
+        })
+        pipe.lpush(self._key("queued"), task_id)
+        pipe.execute()
+        return task_id
+
+    def _requeue_expired(self, now):
+        for task_id in self.redis.zrangebyscore(self._key("leases"), 0, now):
+            if not self.redis.zrem(self._key("leases"), task_id):
+                continue  # Another worker got to it first
+            job_id, attempts, worker = self.redis.hmget(self._task_key(task_id), "job_id", "attempts", "worker")
+            if int(attempts or 0) >= self.max_attempts:
+                result = {"success": False, "message": f"Application failed: worker lost {attempts} times"}
+                pipe = self.redis.pipeline()
+                pipe.hset(self._task_key(task_id), mapping={"state": "failed", "result": json.dumps(result)})
+                pipe.hdel(self._task_key(task_id), "payload")
+                pipe.expire(self._task_key(task_id), int(self.keep_finished))
+                pipe.execute()
+                status = {"status": "failed", "message": result["message"], "timestamp": now}
+            else:
+                self.redis.hset(self._task_key(task_id), "state", "queued")
+                self.redis.rpush(self._key("queued"), task_id)  # Back at the head of the queue
+                status = {"status": "queued", "message": f"Worker {worker} stopped responding, requeued",
+                          "timestamp": now}
+            self.set_status(job_id, status)
+            print(f"Lease on task {task_id} (job {job_id}) expired: {status['status']}")
+
+    def lease(self, worker_id, lease=60):
+        now = time.time()
+        self._requeue_expired(now)
+        task_id = self.lease_script(keys=[self._key("queued"), self._key("leases")],
+                                    args=[now + lease, worker_id, self._key("task:")])
+        if task_id is None:
+            return None
+        job_id, payload, attempts = self.redis.hmget(self._task_key(task_id), "job_id", "payload", "attempts")
+        return LeasedTask(task_id, job_id, json.loads(payload), int(attempts))
+
+    def heartbeat(self, worker_id, task_ids=(), lease=60, info=None):
+        now = time.time()
+        held = {task_id for task_id in task_ids
+                if self.owned_script(keys=[self._task_key(task_id), self._key("leases")],
+                                     args=[worker_id, "extend", now + lease, 0])}
+        self.redis.hset(self._key("workers"), worker_id, json.dumps({**(info or {}), "last_seen": now}))
+        return held
+
+    def finish(self, task_id, worker_id, result, succeeded):
+        return bool(self.owned_script(keys=[self._task_key(task_id), self._key("leases")],
+                                      args=[worker_id, "done" if succeeded else "failed", json.dumps(result),
+                                            int(self.keep_finished)]))
+
+    def result(self, task_id):
+        state, result = self.redis.hmget(self._task_key(task_id), "state", "result")
+        return state, json.loads(result) if result else None
+
+    def retire(self, worker_id):
+        self.redis.hdel(self._key("workers"), worker_id)
+
+    def get_status(self, job_id):
+        status = self.redis.hget(self._key("status"), job_id)
+        return json.loads(status) if status else None
+
+    def set_status(self, job_id, status):
+        self.redis.hset(self._key("status"), job_id, json.dumps(status))
+
+    def delete_status(self, job_id):
+        if not self.redis.hdel(self._key("status"), job_id):
+            raise KeyError(job_id)
+
+    def status_ids(self):
+        return self.redis.hkeys(self._key("status"))
+
+    def summary(self, alive_within=60):
+        counts = {state: 0 for state in TASK_STATES}
+        counts["queued"] = self.redis.llen(self._key("queued"))
+        counts["leased"] = self.redis.zcard(self._key("leases"))
+        cutoff = time.time() - alive_within
+        workers = {worker_id: info for worker_id, info in
+                   ((w, json.loads(i)) for w, i in self.redis.hgetall(self._key("workers")).items())
+                   if info["last_seen"] > cutoff}
+        # Finished tasks aren't indexed; only the live part of the queue is counted
+        return {"backend": "redis", "url": self.url, "tasks": counts, "workers": workers}
+
+
+def queue_from_env():
+    """
+    The application queue named by APPLY_QUEUE: a redis:// (or rediss://) URL,
+    or the path of a SQLite file. None (applications run in the API process)
+    when unset. APPLY_QUEUE_MAX_ATTEMPTS bounds requeues after lost workers;
+    APPLY_QUEUE_KEEP_S is how long finished tasks are kept.
+    """
+    target = os.environ.get("APPLY_QUEUE")
+    if not target:
+        return None
+    options = {"max_attempts": int(os.environ.get("APPLY_QUEUE_MAX_ATTEMPTS", 3)),
+               "keep_finished": float(os.environ.get("APPLY_QUEUE_KEEP_S", 3600))}
+    if target.startswith(("redis://", "rediss://", "unix://")):
+        return RedisQueue(target, **options)
+    return SqliteQueue(target, **options)
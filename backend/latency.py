@@ -0,0 +1,183 @@
+import os
+import json
+import time
+import threading
+import weakref
+from collections import deque
+from urllib.parse import urlsplit
+
+# Seconds to wait per operation before anything has been learned about a host
+# (the values that used to be hard-coded), and the bounds learned waits stay in
+DEFAULT_WAITS = {
+    "page_load": 20,     # <body> after driver.get()
+    "form": 15,          # <form> on an application page
+    "visible": 5,        # a field becoming visible
+    "clickable": 5,      # a field becoming clickable
+    "file_input": 10,    # a resume <input type=file>
+    "next_button": 10,   # the Next/Continue button becoming clickable
+    "next_page": 20,     # <form> after clicking Next/Continue
+}
+FLOORS = {"page_load": 3, "form": 1.5, "visible": 0.3, "clickable": 0.3, "file_input": 0.5,
+          "next_button": 0.5, "next_page": 2}
+CEILINGS = {"page_load": 60, "form": 45, "visible": 15, "clickable": 15, "file_input": 20,
+            "next_button": 20, "next_page": 60}
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list."""
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * (len(sorted_values) - 1)))))
+    return sorted_values[index]
+
+
+def host_of(url):
+    host = urlsplit(url or "").hostname or "unknown"
+    return host[4:] if host.startswith("www.") else host
+
+
+class LatencyTracker:
+    """
+    Learns how long each ATS host takes for each kind of wait, and sizes
+    WebDriverWait budgets from it.
+
+    Every successful wait() records how long the condition took to hold,
+    keeping the last `window` samples per (host, operation). Once a host has
+    min_samples for an operation, its budget is p95 * margin, kept between
+    that operation's floor and ceiling: a field that isn't there on a fast
+    host fails after a fraction of a second instead of the old fixed 5-20s,
+    and a slow host gets more than the fixed value. Until then the default
+    (the old fixed value) is used. A wait that times out is recorded as a
+    censored sample at the budget it had (it took at least that long), so a
+    host that keeps timing out has its budget grow, up to the ceiling,
+    instead of failing at the same too-short budget forever.
+
+    Args:
+        window: Samples kept per host and operation.
+        min_samples: Samples needed before the learned budget is used.
+        margin: Multiplier applied to p95.
+        path: Optional JSON file the samples are loaded from and saved to.
+    """
+
+    def __init__(self, window=200, min_samples=5, margin=3.0, path=None):
+        self.window = window
+        self.min_samples = min_samples
+        self.margin = margin
+        self.path = path
+        self.lock = threading.Lock()
+        self.samples = {}    # (host, operation) -> deque of seconds
+        self.timeouts = {}   # (host, operation) -> count
+        # Host of the page each driver is on, so waits don't need an extra current_url round trip
+        self.driver_hosts = weakref.WeakKeyDictionary()
+        if path and os.path.exists(path):
+            self.load(path)
+
+    @classmethod
+    def from_env(cls):
+        """Persists samples to LATENCY_STATS_PATH when set; margin from LATENCY_MARGIN."""
+        return cls(margin=float(os.environ.get("LATENCY_MARGIN", 3.0)), path=os.environ.get("LATENCY_STATS_PATH"))
+
+    def note_page(self, driver, url=None):
+        """Remembers which host driver is on (reads current_url once if url isn't given)."""
+        if url is None:
+            try:
+                url = driver.current_url
+            except Exception:
+                url = None
+        host = host_of(url)
+        try:
+            self.driver_hosts[driver] = host
+        except TypeError:
+            pass  # Not weak-referenceable (e.g. a test double); callers pass host explicitly then
+        return host
+
+    def host_for(self, driver):
+        try:
+            host = self.driver_hosts.get(driver)
+        except TypeError:
+            host = None
+        return host or self.note_page(driver)
+
+    def record(self, host, operation, seconds):
+        with self.lock:
+            samples = self.samples.get((host, operation))
+            if samples is None:
+                samples = self.samples[(host, operation)] = deque(maxlen=self.window)
+            samples.append(seconds)
+
+    def stats(self, host, operation):
+        """(p50, p95, samples) for host and operation; percentiles are None without samples."""
+        with self.lock:
+            values = sorted(self.samples.get((host, operation), ()))
+        if not values:
+            return None, None, 0
+        return percentile(values, 0.5), percentile(values, 0.95), len(values)
+
+    def budget(self, host, operation):
+        """Seconds a wait for operation on host may take."""
+        default = DEFAULT_WAITS.get(operation, 10)
+        _, p95, count = self.stats(host, operation)
+        if count < self.min_samples:
+            return default
+        return min(CEILINGS.get(operation, default * 3), max(FLOORS.get(operation, 0.5), p95 * self.margin))
+
+    def wait(self, driver, operation, condition, host=None):
+        """
+        WebDriverWait(driver, budget).until(condition), timed and recorded.
+
+        Raises:
+            TimeoutException: If condition doesn't hold within the host's budget.
+        """
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.common.exceptions import TimeoutException
+
+        host = host or self.host_for(driver)
+        budget = self.budget(host, operation)
+        # Poll often enough that short budgets and fast hosts are measured precisely
+        poll = max(0.05, min(0.5, budget / 20))
+        started = time.perf_counter()
+        try:
+            result = WebDriverWait(driver, budget, poll_frequency=poll).until(condition)
+        except TimeoutException:
+            with self.lock:
+                self.timeouts[(host, operation)] = self.timeouts.get((host, operation), 0) + 1
+            self.record(host, operation, budget)
+            raise
+        self.record(host, operation, time.perf_counter() - started)
+        return result
+
+    def summary(self):
+        with self.lock:
+            keys = sorted(set(self.samples) | set(self.timeouts))
+        summary = {}
+        for host, operation in keys:
+            p50, p95, count = self.stats(host, operation)
+            summary.setdefault(host, {})[operation] = {
+                "p50_s": round(p50, 3) if p50 is not None else None,
+                "p95_s": round(p95, 3) if p95 is not None else None,
+                "samples": count,
+                "timeouts": self.timeouts.get((host, operation), 0),
+                "budget_s": round(self.budget(host, operation), 2),
+            }
+        return summary
+
+    def save(self, path=None):
+        path = path or self.path
+        if not path:
+            return
+        with self.lock:
+            data = {f"{host} {operation}": list(samples) for (host, operation), samples in self.samples.items()}
+        tmp = f"{path}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp, path)
+
+    def load(self, path):
+        with open(path) as f:
+            data = json.load(f)
+        with self.lock:
+            for key, values in data.items():
+                host, operation = key.rsplit(" ", 1)
+                self.samples[(host, operation)] = deque(values, maxlen=self.window)
+
+
+# Shared by the form filler and the apply API in this process
+latency_tracker = LatencyTracker.from_env()
@@ -0,0 +1,74 @@
+from typing import Dict, Any, List, Optional, Union
+
+from pydantic import BaseModel
+
+# Define models
+class JobSearch(BaseModel):
+    search: str
+    location: str
+
+class UserData(BaseModel):
+    firstName: Optional[str] = None
+    lastName: Optional[str] = None
+    email: Optional[str] = None
+    phone: Optional[str] = None
+    githubUsername: Optional[str] = None
+    street: Optional[str] = None
+    city: Optional[str] = None
+    state: Optional[str] = None
+    zipCode: Optional[str] = None
+    country: Optional[str] = None
+    github: Optional[str] = None
+    linkedin: Optional[str] = None
+    devpost: Optional[str] = None
+    bio: Optional[str] = None
+
+    class Config:
+        # Extra profile fields are kept, the field matcher maps them by name
+        extra = "allow"
+
+class JobData(BaseModel):
+    id: str
+    company: str
+    positionName: str
+    externalApplyLink: Optional[str] = None
+    url: Optional[str] = None
+
+    class Config:
+        # Clients may post a whole job listing; only the fields above are needed to apply
+        extra = "ignore"
+
+class JobSummary(BaseModel):
+    """The fields of a job the frontend's job list and job pages use."""
+    id: str
+    company: Optional[str] = None
+    positionName: Optional[str] = None
+    location: Optional[str] = None
+    description: Optional[str] = None
+    descriptionHTML: Optional[str] = None
+    jobType: Optional[Union[List[str], str]] = None
+    salary: Optional[str] = None
+    postedAt: Optional[str] = None
+    isExpired: Optional[bool] = None
+    url: Optional[str] = None
+    externalApplyLink: Optional[str] = None
+    # Match score of normalized jobs
+    value: Optional[int] = None
+    # Ids of the skills the job mentions (names from GET /skills)
+    skills: Optional[List[int]] = None
+
+JOB_SUMMARY_FIELDS = tuple(getattr(JobSummary, "model_fields", None) or JobSummary.__fields__)
+
+class ApplicationRequest(BaseModel):
+    job: JobData
+    # Either the whole profile, or a profile saved with PUT /profiles/{userId}
+    user: Optional[UserData] = None
+    profileId: Optional[str] = None
+    profileVersion: Optional[int] = None
+
+class ApplicationResponse(BaseModel):
+    success: bool
+    message: str
+    job_id: str
+    company: str
+    details: Optional[Dict[str, Any]] = None
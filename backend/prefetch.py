@@ -0,0 +1,168 @@
+import os
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from apply_links import job_apply_url
+from form_analysis import FormAnalyzer
+from rate_limits import client_id
+
+
+def _lower_priority():
+    """Thread initializer: on Linux, nice only the calling thread so the API stays responsive."""
+    try:
+        os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), 10)
+    except (AttributeError, OSError):
+        pass
+
+
+def prefetch_group(request):
+    """
+    Who a prefetch batch belongs to: the same identity rate limits use, so
+    X-Client-Id only counts when RATE_LIMIT_TRUST_CLIENT_ID says a gateway sets
+    it (otherwise anyone could cancel another client's batch by sending its id).
+    """
+    admission = getattr(request.app.state, "admission", None)
+    return client_id(request.scope, admission.trust_client_id if admission else False)
+
+
+class FormPrefetcher:
+    """
+    Warms up /apply for the jobs a user is most likely to pick next.
+
+    After a search, prefetch() queues the top-ranked jobs on a couple of
+    low-priority worker threads. Each job gets its apply URL resolved (filling
+    the ApplyLinkResolver cache /apply reads from) and, when that URL is the
+    form itself, the form analyzed statically into a field schema. Jobs are
+    grouped per client: a new search from the same client, or an /apply,
+    cancels whatever is still queued for it.
+
+    Args:
+        resolver: The app's ApplyLinkResolver (its pooled session is reused).
+        analyzer: FormAnalyzer for the schemas (default: one on the resolver's session).
+        top_n: Jobs prefetched per search when the caller doesn't say.
+        max_workers: Prefetch threads.
+        ttl: Seconds a prefetched schema stays cached.
+    """
+
+    def __init__(self, resolver, analyzer=None, top_n=5, max_workers=2, ttl=6 * 3600):
+        self.resolver = resolver
+        self.analyzer = analyzer or FormAnalyzer(timeout=resolver.timeout, session=resolver.session)
+        self.top_n = top_n
+        self.ttl = ttl
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="prefetch",
+                                           initializer=_lower_priority)
+        self.lock = threading.Lock()
+        self.schemas = {}   # job_id -> prefetched entry
+        self.groups = {}    # group -> (cancel Event, [Future])
+        self.stats = {"queued": 0, "completed": 0, "cancelled": 0, "hits": 0}
+
+    @classmethod
+    def from_env(cls, resolver, analyzer=None):
+        """Configured by PREFETCH_TOP_N (0 = only when /jobs asks for it) and PREFETCH_WORKERS."""
+        return cls(
+            resolver,
+            analyzer,
+            top_n=int(os.environ.get("PREFETCH_TOP_N", 0)),
+            max_workers=int(os.environ.get("PREFETCH_WORKERS", 2)),
+        )
+
+    def prefetch(self, jobs, group, top_n=None):
+        """
+        Queues the first top_n jobs (in ranked order) and cancels the group's previous batch.
+
+        Returns:
+            The number of jobs queued.
+        """
+        top_n = self.top_n if top_n is None else top_n
+        self.cancel(group)
+        cancelled = threading.Event()
+        futures = []
+        for job in list(jobs)[:top_n]:
+            job_id = job.get("id") if isinstance(job, dict) else getattr(job, "id", None)
+            if not job_id or self.cached(job_id):
+                continue
+            futures.append(self.executor.submit(self._prefetch_job, job_id, job_apply_url(job), cancelled))
+        with self.lock:
+            if futures:
+                self.groups[group] = (cancelled, futures)
+            self.stats["queued"] += len(futures)
+        for future in futures:
+            future.add_done_callback(lambda _: self._finish_group(group, cancelled))
+        return len(futures)
+
+    def _finish_group(self, group, cancelled):
+        """Forgets a group once every job of its batch is done, so idle clients don't pile up."""
+        with self.lock:
+            batch = self.groups.get(group)
+            if batch is not None and batch[0] is cancelled and all(future.done() for future in batch[1]):
+                del self.groups[group]
+
+    def cancel(self, group):
+        """Drops the group's queued jobs and stops the running ones at their next step."""
+        with self.lock:
+            cancelled, futures = self.groups.pop(group, (None, []))
+        if cancelled is None:
+            return 0
+        cancelled.set()
+        dropped = sum(1 for future in futures if future.cancel())
+        with self.lock:
+            self.stats["cancelled"] += dropped
+        return dropped
+
+    def _prefetch_job(self, job_id, url, cancelled):
+        if cancelled.is_set():
+            return None
+        resolution = self.resolver.resolve(job_id, url)
+        entry = {
+            "job_id": job_id,
+            "url": resolution["url"],
+            "is_form": resolution["is_form"],
+            "ats": resolution["ats"],
+            "fields": None,
+            "complete": False,
+            "error": resolution["error"],
+            "prefetched_at": time.time(),
+        }
+        if resolution["is_form"] and not resolution["error"] and not cancelled.is_set():
+            analysis = self.analyzer.analyze(resolution["url"])
+            entry.update(fields=analysis["fields"], complete=analysis["complete"], error=analysis["error"])
+        with self.lock:
+            now = time.time()
+            # Expired schemas of jobs nobody applied to are only dropped here
+            for stale in [key for key, cached in self.schemas.items() if now - cached["prefetched_at"] >= self.ttl]:
+                del self.schemas[stale]
+            self.schemas[job_id] = entry
+            self.stats["completed"] += 1
+        return entry
+
+    def cached(self, job_id):
+        """The prefetched entry for a job id if it hasn't expired."""
+        with self.lock:
+            entry = self.schemas.get(job_id)
+            if entry and time.time() - entry["prefetched_at"] < self.ttl:
+                return entry
+            self.schemas.pop(job_id, None)
+            return None
+
+    def take(self, job_id, group=None):
+        """
+        What /apply uses: the prefetched entry (or None), after cancelling the
+        rest of the group's batch since the user has picked a job.
+        """
+        if group is not None:
+            self.cancel(group)
+        entry = self.cached(job_id)
+        if entry:
+            with self.lock:
+                self.stats["hits"] += 1
+        return entry
+
+    def summary(self):
+        with self.lock:
+            return {**self.stats, "cached": len(self.schemas), "groups": len(self.groups)}
+
+    def shutdown(self):
+        for group in list(self.groups):
+            self.cancel(group)
+        self.executor.shutdown(wait=False)
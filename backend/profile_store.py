@@ -0,0 +1,289 @@
+import os
+import hmac
+import json
+import time
+import hashlib
+import secrets
+import sqlite3
+import tempfile
+import threading
+from collections import OrderedDict
+
+from field_matcher import profile_values
+from models import UserData
+
+# Resume types accepted by the ATS upload fields we fill
+RESUME_EXTENSIONS = {".pdf", ".doc", ".docx", ".txt", ".rtf", ".odt"}
+
+
+class ProfileNotFound(LookupError):
+    """Raised when a user has no profile, or not the requested version."""
+
+
+def normalize_profile(data):
+    """
+    Validates a profile through UserData and returns it as a plain dict with
+    surrounding whitespace stripped, the email lowercased and empty values
+    (and any client-sent resumePath) dropped.
+    """
+    user = UserData(**data)
+    raw = user.model_dump() if hasattr(user, "model_dump") else user.dict()
+    # The resume comes from the blob store, not a path on the client's machine
+    raw.pop("resumePath", None)
+    profile = {}
+    for key, value in raw.items():
+        if isinstance(value, str):
+            value = value.strip()
+        if value in (None, ""):
+            continue
+        profile[key] = value
+    if "email" in profile:
+        profile["email"] = profile["email"].lower()
+    return profile
+
+
+class ProfileVersion:
+    """
+    One immutable version of a user's profile, with everything /apply needs
+    precomputed: the validated UserData, the field map match_fields uses, and
+    the resume's path in the blob store (checked to exist when it was loaded).
+    """
+
+    def __init__(self, user_id, version, profile, resume_digest, resume_path, created):
+        self.user_id = user_id
+        self.version = version
+        self.profile = profile
+        self.resume_digest = resume_digest
+        self.resume_path = resume_path
+        self.created = created
+        self.user = UserData(**profile)
+        self.values = profile_values(self.user)
+
+    def summary(self):
+        return {
+            "userId": self.user_id,
+            "version": self.version,
+            "profile": self.profile,
+            "resumeDigest": self.resume_digest,
+            "fields": sorted(self.values),
+            "created": self.created,
+        }
+
+
+class ProfileStore:
+    """
+    Versioned user profiles and a content-addressed resume store.
+
+    Saving a profile validates and normalizes it once and stores it as a new
+    version; saving the same content again returns the existing version.
+    /apply then only needs a profile id (and optionally a version) instead of
+    the whole profile, and the ProfileVersion built for it, with its field map
+    and resume path, is cached in memory since versions never change.
+
+    Resumes are stored once per content as <directory>/blobs/<digest[:2]>/<digest><ext>;
+    a profile version refers to its resume by digest.
+
+    Profiles live in SQLite, so every API worker using the same directory
+    sees the same versions.
+
+    User ids are chosen by clients, so each profile has an owner token:
+    issue_token() hands one out (only its hash is stored) when a profile is
+    first created, and owns() checks it before a profile is read, changed or
+    applied with.
+
+    Args:
+        directory: Where profiles.db and the resume blobs are kept.
+        cache_size: ProfileVersions kept in memory.
+        max_resume_bytes: Largest resume accepted.
+    """
+
+    def __init__(self, directory, cache_size=256, max_resume_bytes=10 * 1024 * 1024):
+        self.directory = directory
+        self.blob_dir = os.path.join(directory, "blobs")
+        self.path = os.path.join(directory, "profiles.db")
+        self.cache_size = cache_size
+        self.max_resume_bytes = max_resume_bytes
+        self.lock = threading.Lock()
+        self.cache = OrderedDict()   # (user_id, version) -> ProfileVersion
+        os.makedirs(self.blob_dir, exist_ok=True)
+        with self._connect() as db:
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS profiles ("
+                " user_id TEXT NOT NULL, version INTEGER NOT NULL, profile TEXT NOT NULL,"
+                " digest TEXT NOT NULL, resume TEXT, created REAL NOT NULL,"
+                " PRIMARY KEY (user_id, version))"
+            )
+            db.execute("CREATE TABLE IF NOT EXISTS owners (user_id TEXT PRIMARY KEY, token_hash TEXT NOT NULL)")
+
+    @classmethod
+    def from_env(cls):
+        """Configured by PROFILE_STORE_DIR."""
+        return cls(os.environ.get("PROFILE_STORE_DIR", os.path.join(tempfile.gettempdir(), "job-app-profiles")))
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30, isolation_level=None)
+
+    @staticmethod
+    def _token_hash(token):
+        return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+    def issue_token(self, user_id):
+        """
+        A new owner token for user_id, or None when the id is taken (it has an
+        owner, or versions saved before owner tokens existed).
+        """
+        token = secrets.token_urlsafe(32)
+        db = self._connect()
+        try:
+            db.execute("BEGIN IMMEDIATE")
+            taken = db.execute("SELECT 1 FROM owners WHERE user_id = ? UNION ALL "
+                               "SELECT 1 FROM profiles WHERE user_id = ? LIMIT 1", (user_id, user_id)).fetchone()
+            if taken is None:
+                db.execute("INSERT INTO owners (user_id, token_hash) VALUES (?, ?)", (user_id, self._token_hash(token)))
+            db.execute("COMMIT")
+        except Exception:
+            db.execute("ROLLBACK")
+            raise
+        finally:
+            db.close()
+        return None if taken else token
+
+    def release(self, user_id):
+        """Gives up a just-issued owner token whose first save failed, so the id can be created again."""
+        with self._connect() as db:
+            db.execute("DELETE FROM owners WHERE user_id = ? AND NOT EXISTS "
+                       "(SELECT 1 FROM profiles WHERE user_id = ?)", (user_id, user_id))
+
+    def owns(self, user_id, token):
+        """Whether token is user_id's owner token."""
+        if not token:
+            return False
+        with self._connect() as db:
+            row = db.execute("SELECT token_hash FROM owners WHERE user_id = ?", (user_id,)).fetchone()
+        return row is not None and hmac.compare_digest(row[0], self._token_hash(token))
+
+    def put_resume(self, data, filename="resume.pdf"):
+        """
+        Stores resume bytes under their SHA-256 digest (once per content).
+
+        Returns:
+            The resume's id in the store: its digest plus the file extension.
+
+        Raises:
+            ValueError: If the file is empty, too large or not a resume type.
+        """
+        ext = os.path.splitext(filename or "")[1].lower() or ".pdf"
+        if ext not in RESUME_EXTENSIONS:
+            raise ValueError(f"Unsupported resume type {ext} (use {', '.join(sorted(RESUME_EXTENSIONS))})")
+        if not data:
+            raise ValueError("Empty resume")
+        if len(data) > self.max_resume_bytes:
+            raise ValueError(f"Resume is larger than {self.max_resume_bytes // (1024 * 1024)} MB")
+        digest = hashlib.sha256(data).hexdigest()
+        path = os.path.join(self.blob_dir, digest[:2], f"{digest}{ext}")
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp = f"{path}.tmp{os.getpid()}-{threading.get_ident()}"
+            with open(tmp, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        return f"{digest}{ext}"
+
+    def resume_path(self, resume_digest):
+        """Absolute path of a stored resume, or None if it doesn't exist."""
+        name = os.path.basename(resume_digest or "")
+        if not name or not name.split(".")[0].isalnum():
+            return None
+        path = os.path.join(self.blob_dir, name[:2], name)
+        return path if os.path.exists(path) else None
+
+    def put(self, user_id, data, resume_digest=None):
+        """
+        Saves a new version of user_id's profile, unless it is identical to
+        the latest one. resume_digest defaults to the latest version's resume.
+
+        Returns:
+            The ProfileVersion (new or latest).
+
+        Raises:
+            ValueError: If resume_digest isn't in the blob store.
+            pydantic.ValidationError: If data isn't a valid profile.
+        """
+        profile = normalize_profile(data)
+        db = self._connect()
+        try:
+            db.execute("BEGIN IMMEDIATE")
+            latest = db.execute(
+                "SELECT version, digest, resume FROM profiles WHERE user_id = ? ORDER BY version DESC LIMIT 1",
+                (user_id,),
+            ).fetchone()
+            if resume_digest is None and latest is not None:
+                resume_digest = latest[2]
+            if resume_digest is not None and self.resume_path(resume_digest) is None:
+                raise ValueError(f"Unknown resume {resume_digest}")
+            encoded = json.dumps(profile, sort_keys=True, separators=(",", ":"))
+            digest = hashlib.sha256(f"{encoded}\n{resume_digest or ''}".encode("utf-8")).hexdigest()
+            if latest is not None and latest[1] == digest:
+                version = latest[0]
+            else:
+                version = (latest[0] + 1) if latest is not None else 1
+                db.execute(
+                    "INSERT INTO profiles (user_id, version, profile, digest, resume, created) VALUES (?, ?, ?, ?, ?, ?)",
+                    (user_id, version, encoded, digest, resume_digest, time.time()),
+                )
+            db.execute("COMMIT")
+        except Exception:
+            db.execute("ROLLBACK")
+            raise
+        finally:
+            db.close()
+        return self.get(user_id, version)
+
+    def get(self, user_id, version=None):
+        """
+        A version of user_id's profile (the latest when version is None).
+
+        Raises:
+            ProfileNotFound: If there is no such profile or version.
+        """
+        if version is not None:
+            with self.lock:
+                cached = self.cache.get((user_id, version))
+                if cached is not None:
+                    self.cache.move_to_end((user_id, version))
+                    return cached
+        with self._connect() as db:
+            if version is None:
+                row = db.execute(
+                    "SELECT version, profile, resume, created FROM profiles WHERE user_id = ?"
+                    " ORDER BY version DESC LIMIT 1", (user_id,),
+                ).fetchone()
+            else:
+                row = db.execute(
+                    "SELECT version, profile, resume, created FROM profiles WHERE user_id = ? AND version = ?",
+                    (user_id, version),
+                ).fetchone()
+        if row is None:
+            raise ProfileNotFound(f"No profile {user_id}" + (f" version {version}" if version else ""))
+        version, encoded, resume_digest, created = row
+        with self.lock:
+            cached = self.cache.get((user_id, version))
+            if cached is not None:
+                return cached
+        entry = ProfileVersion(user_id, version, json.loads(encoded), resume_digest,
+                               self.resume_path(resume_digest), created)
+        with self.lock:
+            self.cache[(user_id, version)] = entry
+            while len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)
+        return entry
+
+    def versions(self, user_id):
+        with self._connect() as db:
+            return [
+                {"version": version, "resumeDigest": resume, "created": created}
+                for version, resume, created in db.execute(
+                    "SELECT version, resume, created FROM profiles WHERE user_id = ? ORDER BY version", (user_id,)
+                )
+            ]
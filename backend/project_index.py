@@ -0,0 +1,243 @@
+import re
+import sys
+import json
+import math
+import mmap
+import heapq
+import struct
+from array import array
+from collections import Counter, defaultdict
+
+from job_index import tokenize
+
+# Scraped keys that aren't prose sections
+NON_SECTION_KEYS = {"title", "built_with", "Built With", "Try it out"}
+
+# "What's next for Tadpool n1" -> "What's next"
+SECTION_SUFFIX_RE = re.compile(r"^(what's next) for .*$", re.IGNORECASE)
+
+# Textarea questions a project write-up answers; "Why us?" or "Anything else?" get the default
+PROJECT_QUESTION_RE = re.compile(
+    r"\b(projects?|built|build(ing)?|experience|hackathons?|portfolio|accomplish(ed|ment)s?|achievements?|"
+    r"proud|technical(ly)?|challeng(e|es|ing)|worked on|developed|created|implemented|problem you solved)\b",
+    re.IGNORECASE)
+
+# Lowest BM25 score a passage needs before it is written into an application
+MIN_ANSWER_SCORE = 3.0
+
+MAGIC = b"BM25IDX1"
+# magic, passages, terms, postings, meta bytes, text bytes, avgdl, k1, b
+HEADER = struct.Struct("<8sIIIIIfff")
+
+
+def section_name(key):
+    """Folds per-project headings like "What's next for X" into one section name."""
+    match = SECTION_SUFFIX_RE.match(key.strip())
+    return match.group(1) if match else key.strip()
+
+
+def project_passages(projects):
+    """
+    Splits scraped projects (projects.json: slug -> {title, <section>: text, ...})
+    into (slug, section, title, text) passages, one per non-empty section.
+    """
+    for slug, project in projects.items():
+        title = project.get("title") or slug
+        for key, text in project.items():
+            if key in NON_SECTION_KEYS or not isinstance(text, str) or not text.strip():
+                continue
+            yield slug, section_name(key), title, text.strip()
+
+
+def _pad4(data):
+    return data + b"\0" * (-len(data) % 4)
+
+
+def build_index(projects, k1=1.2, b=0.75):
+    """
+    Builds the serialized BM25 index over every project section.
+
+    Layout (little endian): HEADER, JSON metadata (terms, passages), then
+    uint32 term offsets, uint32 posting doc ids, float32 posting weights,
+    uint32 text offsets and the UTF-8 passage texts. Each posting weight is
+    the term's full BM25 contribution to that passage (idf and length norm
+    applied at build time), so a query only sums weights. Everything after
+    the metadata is read in place from the memory map.
+
+    Returns:
+        The index as bytes.
+    """
+    docs = []
+    postings = defaultdict(list)
+    lengths = []
+    for slug, section, title, text in project_passages(projects):
+        doc_id = len(docs)
+        docs.append([slug, section, title])
+        # The heading counts too, so "challenges you faced" finds "Challenges we ran into"
+        counts = Counter(tokenize(f"{section} {text}"))
+        lengths.append(sum(counts.values()))
+        for term, tf in counts.items():
+            postings[term].append((doc_id, tf))
+
+    n_docs = len(docs)
+    avgdl = (sum(lengths) / n_docs) if n_docs else 0.0
+    terms = sorted(postings)
+    norms = [k1 * (1 - b + b * length / (avgdl or 1)) for length in lengths]
+    offsets = array("I", [0])
+    doc_ids = array("I")
+    weights = array("f")
+    for term in terms:
+        entries = postings[term]
+        df = len(entries)
+        idf = math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+        for doc_id, tf in entries:
+            doc_ids.append(doc_id)
+            weights.append(idf * tf * (k1 + 1) / (tf + norms[doc_id]))
+        offsets.append(len(doc_ids))
+
+    texts = array("I", [0])
+    blob = bytearray()
+    for slug, section, title, text in project_passages(projects):
+        blob += text.encode("utf-8")
+        texts.append(len(blob))
+
+    meta = _pad4(json.dumps({"terms": terms, "docs": docs}, separators=(",", ":")).encode("utf-8"))
+    header = HEADER.pack(MAGIC, n_docs, len(terms), len(doc_ids), len(meta), len(blob), avgdl, k1, b)
+    return b"".join([header, meta, offsets.tobytes(), doc_ids.tobytes(), weights.tobytes(),
+                     texts.tobytes(), bytes(blob)])
+
+
+class ProjectIndex:
+    """
+    BM25 search over project sections, answering form questions like
+    "Tell us about a project you're proud of" with the best matching passages.
+
+    The index is built once (build_index / `python project_index.py build`)
+    and loaded with load(), which memory-maps the file: postings, weights and
+    texts are read in place, so loading is cheap and processes share pages.
+    """
+
+    def __init__(self, buffer, mapped=None):
+        self._mapped = mapped
+        (magic, self.n_docs, n_terms, n_postings, meta_len, text_len,
+         self.avgdl, self.k1, self.b) = HEADER.unpack_from(buffer, 0)
+        if magic != MAGIC:
+            raise ValueError("Not a project index file")
+        view = memoryview(buffer)
+        position = HEADER.size
+        meta = json.loads(bytes(view[position:position + meta_len]).rstrip(b"\0").decode("utf-8"))
+        position += meta_len
+        self.terms = {term: i for i, term in enumerate(meta["terms"])}
+        self.docs = meta["docs"]
+
+        def take(fmt, count):
+            nonlocal position
+            size = 4 * count
+            chunk = view[position:position + size].cast(fmt)
+            position += size
+            return chunk
+
+        self.offsets = take("I", n_terms + 1)
+        self.doc_ids = take("I", n_postings)
+        self.weights = take("f", n_postings)
+        self.text_offsets = take("I", self.n_docs + 1)
+        self.texts = view[position:position + text_len]
+
+    @classmethod
+    def from_projects(cls, projects, **kwargs):
+        return cls(build_index(projects, **kwargs))
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(mapped, mapped)
+
+    def text(self, doc_id):
+        start, end = self.text_offsets[doc_id], self.text_offsets[doc_id + 1]
+        return bytes(self.texts[start:end]).decode("utf-8")
+
+    def search(self, question, k=3):
+        """
+        The k passages that best answer question.
+
+        Returns:
+            List of dicts with slug, section, title, text and score, best first.
+        """
+        scores = defaultdict(float)
+        for term in set(tokenize(question)):
+            term_id = self.terms.get(term)
+            if term_id is None:
+                continue
+            start, end = self.offsets[term_id], self.offsets[term_id + 1]
+            for doc_id, weight in zip(self.doc_ids[start:end], self.weights[start:end]):
+                scores[doc_id] += weight
+        best = heapq.nlargest(k, scores.items(), key=lambda item: item[1])
+        return [
+            {"slug": self.docs[d][0], "section": self.docs[d][1], "title": self.docs[d][2],
+             "text": self.text(d), "score": round(score, 4)}
+            for d, score in best
+        ]
+
+    def answer(self, question, max_chars=1500, min_score=MIN_ANSWER_SCORE):
+        """
+        Text for a textarea asking question: the best passage, prefixed with
+        its project, or None when the question isn't about projects or
+        experience or no passage scores at least min_score.
+        """
+        if not question or not PROJECT_QUESTION_RE.search(question):
+            return None
+        hits = self.search(question, k=1)
+        if not hits or hits[0]["score"] < min_score:
+            return None
+        hit = hits[0]
+        text = f"{hit['title']}: {hit['text']}"
+        if len(text) > max_chars:
+            text = text[:max_chars].rsplit(" ", 1)[0] + "..."
+        return text
+
+    def close(self):
+        if self._mapped is not None:
+            # Views into the map must be released before it can be closed
+            for view in (self.offsets, self.doc_ids, self.weights, self.text_offsets, self.texts):
+                view.release()
+            self._mapped.close()
+            self._mapped = None
+
+
+def main():
+    import time
+    import argparse
+    parser = argparse.ArgumentParser(description="Build or query the BM25 index over scraped Devpost projects")
+    sub = parser.add_subparsers(dest="command", required=True)
+    build = sub.add_parser("build", help="Index a projects.json file")
+    build.add_argument("projects", nargs="?", default="projects.json")
+    build.add_argument("-o", "--output", default="projects.bm25")
+    query = sub.add_parser("query", help="Find the best passages for a question")
+    query.add_argument("question")
+    query.add_argument("-i", "--index", default="projects.bm25")
+    query.add_argument("-k", type=int, default=3)
+    args = parser.parse_args()
+
+    if args.command == "build":
+        with open(args.projects) as f:
+            data = build_index(json.load(f))
+        with open(args.output, "wb") as f:
+            f.write(data)
+        print(f"Wrote {len(data)} bytes to {args.output}")
+        return
+
+    started = time.perf_counter()
+    index = ProjectIndex.load(args.index)
+    loaded = time.perf_counter()
+    hits = index.search(args.question, k=args.k)
+    searched = time.perf_counter()
+    for hit in hits:
+        print(f"{hit['score']:>7.3f}  {hit['title']} / {hit['section']}")
+        print(f"         {hit['text'][:160]}")
+    print(f"{index.n_docs} passages, load {(loaded - started) * 1000:.2f} ms, "
+          f"search {(searched - loaded) * 1000:.3f} ms", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
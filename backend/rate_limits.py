@@ -0,0 +1,245 @@
+import os
+import json
+import math
+import time
+import sqlite3
+import threading
+
+# Requests that start expensive work, by endpoint class: search = an Apify actor run, apply = a Chrome process
+ENDPOINT_CLASSES = {
+    ("POST", "/jobs"): "search",
+    ("POST", "/jobs/stream"): "search",
+    ("POST", "/apply"): "apply",
+}
+
+# (requests per minute, burst) per user and for the whole deployment
+DEFAULT_LIMITS = {
+    "search": {"user": (6, 3), "global": (60, 20)},
+    "apply": {"user": (4, 2), "global": (20, 5)},
+}
+
+
+def refill(tokens, updated, now, per_minute, burst):
+    """Tokens in a bucket at time now, after refilling at per_minute since updated."""
+    return min(burst, tokens + (now - updated) * per_minute / 60.0)
+
+
+def client_id(scope, trust_header=False):
+    """
+    Who a request counts against: the client address. Behind a reverse proxy,
+    run uvicorn with --proxy-headers (and --forwarded-allow-ips) so that is the
+    real client. The X-Client-Id header is used only with trust_header, when a
+    trusted gateway in front of the API sets it from an authenticated identity;
+    otherwise a client could send a fresh id per request and dodge its limit.
+    """
+    if trust_header:
+        for name, value in scope.get("headers") or ():
+            if name == b"x-client-id" and value:
+                return value.decode("latin-1")
+    client = scope.get("client")
+    return client[0] if client else "anonymous"
+
+
+class MemoryBuckets:
+    """Token buckets for a single process."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.buckets = {}   # key -> (tokens, updated)
+
+    def take(self, buckets, now=None):
+        """
+        Takes one token from every (key, per_minute, burst) bucket, or from none.
+
+        Returns:
+            (None, 0) when admitted, otherwise (key of the first empty bucket,
+            seconds until it has a token again).
+        """
+        now = time.time() if now is None else now
+        with self.lock:
+            levels = []
+            for key, per_minute, burst in buckets:
+                tokens, updated = self.buckets.get(key, (burst, now))
+                tokens = refill(tokens, updated, now, per_minute, burst)
+                if tokens < 1:
+                    return key, (1 - tokens) * 60.0 / per_minute
+                levels.append((key, tokens))
+            for key, tokens in levels:
+                self.buckets[key] = (tokens - 1, now)
+            return None, 0
+
+    def prune(self, max_idle=3600):
+        """Forgets buckets untouched for max_idle seconds (they would be full again anyway)."""
+        cutoff = time.time() - max_idle
+        with self.lock:
+            for key in [k for k, (_, updated) in self.buckets.items() if updated < cutoff]:
+                del self.buckets[key]
+
+
+class SqliteBuckets:
+    """
+    Token buckets shared by every API worker using the same database file,
+    so limits hold for the deployment rather than per process.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with self._connect() as db:
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("CREATE TABLE IF NOT EXISTS buckets (key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL)")
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=5, isolation_level=None)
+
+    def take(self, buckets, now=None):
+        now = time.time() if now is None else now
+        db = self._connect()
+        try:
+            db.execute("BEGIN IMMEDIATE")
+            levels = []
+            for key, per_minute, burst in buckets:
+                row = db.execute("SELECT tokens, updated FROM buckets WHERE key = ?", (key,)).fetchone()
+                tokens = refill(*(row or (burst, now)), now, per_minute, burst)
+                if tokens < 1:
+                    db.execute("COMMIT")
+                    return key, (1 - tokens) * 60.0 / per_minute
+                levels.append((key, tokens - 1, now))
+            db.executemany("INSERT OR REPLACE INTO buckets (key, tokens, updated) VALUES (?, ?, ?)", levels)
+            db.execute("COMMIT")
+            return None, 0
+        except Exception:
+            db.execute("ROLLBACK")
+            raise
+        finally:
+            db.close()
+
+    def prune(self, max_idle=3600):
+        with self._connect() as db:
+            db.execute("DELETE FROM buckets WHERE updated < ?", (time.time() - max_idle,))
+
+
+class AdmissionController:
+    """
+    Decides whether a request that starts a search or an application may run.
+
+    Every endpoint class has a per-user and a global token bucket; a request
+    needs a token from both. Buckets live in memory, or in a shared SQLite
+    file (RATE_LIMIT_DB) when several workers serve the API.
+
+    Args:
+        limits: {endpoint class: {"user": (per_minute, burst), "global": (per_minute, burst)}}.
+        buckets: MemoryBuckets or SqliteBuckets.
+    """
+
+    def __init__(self, limits=None, buckets=None, trust_client_id=False):
+        self.limits = limits or DEFAULT_LIMITS
+        self.buckets = buckets or MemoryBuckets()
+        self.trust_client_id = trust_client_id
+        self.lock = threading.Lock()
+        self.stats = {name: {"admitted": 0, "rejected": 0} for name in self.limits}
+        self.last_pruned = time.time()
+
+    @classmethod
+    def from_env(cls):
+        """
+        Configured by RATE_LIMIT_<CLASS>_PER_MIN / _BURST (per user) and
+        RATE_LIMIT_<CLASS>_GLOBAL_PER_MIN / _GLOBAL_BURST, with CLASS SEARCH or
+        APPLY, RATE_LIMIT_DB for buckets shared across workers, and
+        RATE_LIMIT_TRUST_CLIENT_ID=on to key users by X-Client-Id (only when a
+        trusted gateway sets that header).
+        Returns None when RATE_LIMITS=off.
+        """
+        if os.environ.get("RATE_LIMITS", "on").lower() in ("0", "off", "false"):
+            return None
+        limits = {}
+        for name, scopes in DEFAULT_LIMITS.items():
+            prefix = f"RATE_LIMIT_{name.upper()}"
+            limits[name] = {
+                "user": (float(os.environ.get(f"{prefix}_PER_MIN", scopes["user"][0])),
+                         float(os.environ.get(f"{prefix}_BURST", scopes["user"][1]))),
+                "global": (float(os.environ.get(f"{prefix}_GLOBAL_PER_MIN", scopes["global"][0])),
+                           float(os.environ.get(f"{prefix}_GLOBAL_BURST", scopes["global"][1]))),
+            }
+        path = os.environ.get("RATE_LIMIT_DB")
+        trust = os.environ.get("RATE_LIMIT_TRUST_CLIENT_ID", "off").lower() in ("1", "on", "true")
+        return cls(limits, SqliteBuckets(path) if path else MemoryBuckets(), trust_client_id=trust)
+
+    def admit(self, endpoint_class, user):
+        """
+        Returns:
+            (None, 0) when the request may run, otherwise ("user" or "global",
+            seconds to wait before retrying).
+        """
+        (user_rate, user_burst), (global_rate, global_burst) = (
+            self.limits[endpoint_class]["user"], self.limits[endpoint_class]["global"]
+        )
+        user_key = f"{endpoint_class}:user:{user}"
+        empty, retry_after = self.buckets.take([
+            (user_key, user_rate, user_burst),
+            (f"{endpoint_class}:global", global_rate, global_burst),
+        ])
+        with self.lock:
+            self.stats[endpoint_class]["rejected" if empty else "admitted"] += 1
+            prune = time.time() - self.last_pruned > 600
+            if prune:
+                self.last_pruned = time.time()
+        if prune:
+            self.buckets.prune()
+        if empty is None:
+            return None, 0
+        return ("user" if empty == user_key else "global"), retry_after
+
+    def summary(self):
+        with self.lock:
+            return {
+                "limits": self.limits,
+                "stats": {name: dict(counts) for name, counts in self.stats.items()},
+                "shared": getattr(self.buckets, "path", None),
+                "keyed_by": "X-Client-Id" if self.trust_client_id else "client address",
+            }
+
+
+class AdmissionMiddleware:
+    """
+    ASGI middleware that answers over-limit search and apply requests with
+    429 and Retry-After before they reach FastAPI (no body parsing, no
+    Apify run, no browser). Every other request passes straight through.
+    """
+
+    def __init__(self, app, controller):
+        self.app = app
+        self.controller = controller
+
+    async def __call__(self, scope, receive, send):
+        endpoint_class = None
+        if scope["type"] == "http":
+            endpoint_class = ENDPOINT_CLASSES.get((scope["method"], scope["path"].rstrip("/") or "/"))
+        if endpoint_class is None:
+            return await self.app(scope, receive, send)
+
+        user = client_id(scope, self.controller.trust_client_id)
+        if isinstance(self.controller.buckets, SqliteBuckets):
+            from fastapi.concurrency import run_in_threadpool
+            rejected, retry_after = await run_in_threadpool(self.controller.admit, endpoint_class, user)
+        else:
+            rejected, retry_after = self.controller.admit(endpoint_class, user)
+        if rejected is None:
+            return await self.app(scope, receive, send)
+
+        seconds = max(1, math.ceil(retry_after))
+        who = "you" if rejected == "user" else "all users"
+        body = json.dumps({
+            "detail": f"Too many {endpoint_class} requests from {who}, retry in {seconds}s",
+            "scope": rejected,
+            "retry_after": seconds,
+        }).encode("utf-8")
+        await send({
+            "type": "http.response.start",
+            "status": 429,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(seconds).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
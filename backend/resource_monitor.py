@@ -0,0 +1,218 @@
+import os
+import time
+import threading
+
+from browser_processes import process_tree_usage
+
+
+class BrowserBudgetExceeded(Exception):
+    """Raised when a new browser session would push us over the memory budget."""
+
+
+class SessionUsage:
+    def __init__(self, key):
+        self.key = key
+        self.driver = None
+        self.root_pid = None
+        self.started_at = time.time()
+        self.last_active = self.started_at
+        self.rss_mb = 0.0
+        self.peak_rss_mb = 0.0
+        self.cpu_s = 0.0
+        self.cpu_percent = 0.0
+        self.processes = 0
+        self.sampled_at = None
+
+    def as_dict(self):
+        now = time.time()
+        return {
+            "rss_mb": round(self.rss_mb, 1),
+            "peak_rss_mb": round(self.peak_rss_mb, 1),
+            "cpu_s": round(self.cpu_s, 2),
+            "cpu_percent": round(self.cpu_percent, 1),
+            "processes": self.processes,
+            "age_s": round(now - self.started_at, 1),
+            "idle_s": round(now - self.last_active, 1),
+        }
+
+
+class ResourceMonitor:
+    """
+    Per-session memory/CPU accounting for browser sessions, with a global
+    memory budget and an idle timeout.
+
+    acquire() reserves room for a session before Chrome is started. If the
+    sessions already open (measured) plus one more (estimated from what
+    sessions actually use) wouldn't fit in the budget, it waits up to
+    queue_timeout for room, then raises BrowserBudgetExceeded. A sampler
+    thread measures each chromedriver/Chrome process tree every `interval`
+    seconds. Sessions whose browser has used next to no CPU for longer than
+    idle_timeout are handed to on_idle and then quit.
+
+    Args:
+        budget_mb: Total RSS all browser sessions may use.
+        idle_timeout: Seconds without activity before a session is killed (0 = never).
+        queue_timeout: Seconds acquire() waits for room (0 = reject immediately).
+        session_estimate_mb: Starting guess for a new session's footprint.
+        interval: Seconds between samples.
+        on_idle: Callback(key) run before an idle session's driver is quit.
+    """
+
+    # Below this share of one core between samples a browser counts as idle
+    IDLE_CPU_PERCENT = 2.0
+
+    def __init__(self, budget_mb=4096, idle_timeout=1800, queue_timeout=0, session_estimate_mb=350,
+                 interval=5.0, on_idle=None):
+        self.budget_mb = budget_mb
+        self.idle_timeout = idle_timeout
+        self.queue_timeout = queue_timeout
+        self.session_estimate_mb = session_estimate_mb
+        self.interval = interval
+        self.on_idle = on_idle
+        self.sessions = {}
+        self.condition = threading.Condition()
+        self.stopping = threading.Event()
+        self.thread = None
+        self.rejected = 0
+
+    @classmethod
+    def from_env(cls, **kwargs):
+        """Budget from BROWSER_MEMORY_BUDGET_MB, BROWSER_IDLE_TIMEOUT_S and BROWSER_QUEUE_TIMEOUT_S."""
+        return cls(
+            budget_mb=float(os.environ.get("BROWSER_MEMORY_BUDGET_MB", 4096)),
+            idle_timeout=float(os.environ.get("BROWSER_IDLE_TIMEOUT_S", 1800)),
+            queue_timeout=float(os.environ.get("BROWSER_QUEUE_TIMEOUT_S", 0)),
+            **kwargs,
+        )
+
+    def _committed_mb(self):
+        # Sessions not measured yet count at the estimate
+        return sum(max(s.rss_mb, self.session_estimate_mb if s.sampled_at is None else 0)
+                   for s in self.sessions.values())
+
+    def acquire(self, key, timeout=None):
+        """
+        Reserves budget for a new session under key.
+
+        Raises:
+            BrowserBudgetExceeded: If there is no room within the timeout.
+        """
+        timeout = self.queue_timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        with self.condition:
+            while self._committed_mb() + self.session_estimate_mb > self.budget_mb:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self.rejected += 1
+                    raise BrowserBudgetExceeded(
+                        f"Browser memory budget reached ({self._committed_mb():.0f} of {self.budget_mb:.0f} MB "
+                        f"in use by {len(self.sessions)} sessions)"
+                    )
+                self.condition.wait(remaining)
+            self.sessions[key] = SessionUsage(key)
+        self._ensure_sampler()
+
+    def track(self, key, driver):
+        """Attaches the started driver to a reserved session so it can be measured."""
+        with self.condition:
+            session = self.sessions.get(key)
+            if session is None:
+                return
+            session.driver = driver
+            process = getattr(getattr(driver, "service", None), "process", None)
+            session.root_pid = process.pid if process else None
+
+    def touch(self, key):
+        """Marks a session as active right now (resets its idle clock)."""
+        with self.condition:
+            if key in self.sessions:
+                self.sessions[key].last_active = time.time()
+
+    def release(self, key):
+        """Frees a session's budget (browser closed or never started)."""
+        with self.condition:
+            session = self.sessions.pop(key, None)
+            self.condition.notify_all()
+        return session
+
+    def usage(self, key):
+        with self.condition:
+            session = self.sessions.get(key)
+            return session.as_dict() if session else None
+
+    def summary(self):
+        with self.condition:
+            return {
+                "budget_mb": self.budget_mb,
+                "committed_mb": round(self._committed_mb(), 1),
+                "session_estimate_mb": round(self.session_estimate_mb, 1),
+                "sessions": len(self.sessions),
+                "rejected": self.rejected,
+                "idle_timeout_s": self.idle_timeout,
+                "per_session": {key: s.as_dict() for key, s in self.sessions.items()},
+            }
+
+    def sample(self):
+        """Measures every session once, then kills the ones idle for too long."""
+        with self.condition:
+            sessions = [s for s in self.sessions.values() if s.root_pid is not None]
+
+        now = time.time()
+        idle = []
+        for session in sessions:
+            usage = process_tree_usage(session.root_pid)
+            if session.sampled_at is not None:
+                elapsed = now - session.sampled_at
+                session.cpu_percent = 100.0 * max(usage["cpu_s"] - session.cpu_s, 0.0) / max(elapsed, 1e-6)
+                if session.cpu_percent >= self.IDLE_CPU_PERCENT:
+                    session.last_active = now
+            session.rss_mb = usage["rss_mb"]
+            session.peak_rss_mb = max(session.peak_rss_mb, usage["rss_mb"])
+            session.cpu_s = usage["cpu_s"]
+            session.processes = usage["processes"]
+            session.sampled_at = now
+            if self.idle_timeout and now - session.last_active > self.idle_timeout:
+                idle.append(session)
+
+        with self.condition:
+            # Learn what a session really costs (running average of peaks)
+            measured = [s.peak_rss_mb for s in self.sessions.values() if s.peak_rss_mb]
+            if measured:
+                self.session_estimate_mb = 0.8 * self.session_estimate_mb + 0.2 * (sum(measured) / len(measured))
+            self.condition.notify_all()
+
+        for session in idle:
+            print(f"Browser session {session.key} idle for over {self.idle_timeout:.0f}s, closing it")
+            if self.on_idle:
+                try:
+                    self.on_idle(session.key)
+                except Exception as e:
+                    print(f"Error in idle callback for {session.key}: {e}")
+            try:
+                session.driver.quit()
+            except Exception:
+                pass
+            self.release(session.key)
+
+    def _ensure_sampler(self):
+        with self.condition:
+            if self.thread is None or not self.thread.is_alive():
+                self.stopping.clear()
+                self.thread = threading.Thread(target=self._run, name="resource-monitor", daemon=True)
+                self.thread.start()
+
+    def stop(self):
+        self.stopping.set()
+        if self.thread:
+            self.thread.join(timeout=self.interval + 1)
+
+    def _run(self):
+        while not self.stopping.wait(self.interval):
+            try:
+                self.sample()
+            except Exception as e:
+                print(f"Error sampling browser resources: {e}")
+            with self.condition:
+                if not self.sessions:
+                    self.thread = None
+                    return
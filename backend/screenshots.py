@@ -0,0 +1,204 @@
+import io
+import os
+import time
+import base64
+import hashlib
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+
+try:
+    from PIL import Image
+except ImportError:  # Without Pillow screenshots are stored as the PNG Chrome returns
+    Image = None
+
+MEDIA_TYPES = {"webp": "image/webp", "jpeg": "image/jpeg", "png": "image/png"}
+
+
+class ScreenshotStore:
+    """
+    Captures browser screenshots without slowing down form filling, and keeps
+    them in a size- and age-bounded content-addressed directory.
+
+    capture() only issues a CDP Page.captureScreenshot on the calling thread.
+    Decoding, re-encoding (WebP or JPEG plus an optional thumbnail, when Pillow
+    is installed), hashing and writing happen on a small thread pool. Files are
+    stored as <dir>/<digest[:2]>/<digest>.<ext>, so identical screenshots are
+    stored once. After each write the oldest files are evicted until the store
+    is under max_bytes, and anything older than retention seconds is dropped.
+
+    Args:
+        directory: Where screenshots are kept.
+        image_format: "webp", "jpeg" or "png".
+        quality: Encoder quality for webp/jpeg.
+        thumbnail_width: Also store a thumbnail this wide (0 = no thumbnails).
+        max_bytes: Total size the store may reach.
+        retention: Seconds a screenshot is kept.
+        workers: Encoder threads.
+    """
+
+    def __init__(self, directory, image_format="webp", quality=70, thumbnail_width=320,
+                 max_bytes=500 * 1024 * 1024, retention=7 * 24 * 3600, workers=2):
+        self.directory = directory
+        self.image_format = image_format if Image else "png"
+        self.quality = quality
+        self.thumbnail_width = thumbnail_width if Image else 0
+        self.max_bytes = max_bytes
+        self.retention = retention
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="screenshot")
+        self.lock = threading.Lock()
+        self.pending = {}   # key -> Future of the stored entry
+        self.entries = {}   # key -> stored entry
+        self.files = {}     # path -> (mtime, size)
+        os.makedirs(directory, exist_ok=True)
+        self._scan()
+
+    @classmethod
+    def from_env(cls):
+        """Configured by SCREENSHOT_DIR, SCREENSHOT_FORMAT, SCREENSHOT_MAX_MB and SCREENSHOT_RETENTION_S."""
+        return cls(
+            directory=os.environ.get("SCREENSHOT_DIR", os.path.join(tempfile.gettempdir(), "job-app-screenshots")),
+            image_format=os.environ.get("SCREENSHOT_FORMAT", "webp"),
+            max_bytes=int(float(os.environ.get("SCREENSHOT_MAX_MB", 500)) * 1024 * 1024),
+            retention=float(os.environ.get("SCREENSHOT_RETENTION_S", 7 * 24 * 3600)),
+        )
+
+    def _scan(self):
+        """Picks up files left by a previous process so eviction accounts for them."""
+        for root, _, names in os.walk(self.directory):
+            for name in names:
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                self.files[path] = (stat.st_mtime, stat.st_size)
+
+    def path_for(self, digest, thumbnail=False):
+        """Where a stored screenshot lives, or None if it doesn't exist (any format)."""
+        if not digest.isalnum():
+            return None
+        suffix = ".thumb" if thumbnail else ""
+        for ext in MEDIA_TYPES:
+            path = os.path.join(self.directory, digest[:2], f"{digest}{suffix}.{ext}")
+            if os.path.exists(path):
+                return path
+        return None
+
+    def capture(self, driver, key):
+        """
+        Grabs a screenshot of the current page and queues it for encoding.
+
+        Returns:
+            A Future resolving to the stored entry (digest, format, bytes, ...).
+        """
+        data = driver.execute_cdp_cmd("Page.captureScreenshot", {"format": "png"})["data"]
+        future = self.executor.submit(self._store, key, data)
+        with self.lock:
+            self.pending[key] = future
+        future.add_done_callback(lambda done: done.exception() and self._forget(key, done))
+        return future
+
+    def _forget(self, key, future):
+        """Drops a failed or abandoned encode from pending, unless a newer capture replaced it."""
+        with self.lock:
+            if self.pending.get(key) is future:
+                del self.pending[key]
+
+    def _encode(self, png_bytes):
+        if not Image:
+            return png_bytes, None
+        image = Image.open(io.BytesIO(png_bytes)).convert("RGB")
+        out = io.BytesIO()
+        image.save(out, format=self.image_format.upper(), quality=self.quality)
+        thumb = None
+        if self.thumbnail_width and image.width > self.thumbnail_width:
+            image.thumbnail((self.thumbnail_width, self.thumbnail_width * image.height // image.width))
+            thumb_out = io.BytesIO()
+            image.save(thumb_out, format=self.image_format.upper(), quality=self.quality)
+            thumb = thumb_out.getvalue()
+        return out.getvalue(), thumb
+
+    def _write(self, path, data):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        if not os.path.exists(path):
+            tmp = f"{path}.tmp{threading.get_ident()}"
+            with open(tmp, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        with self.lock:
+            self.files[path] = (time.time(), len(data))
+
+    def _store(self, key, b64_data):
+        encoded, thumb = self._encode(base64.b64decode(b64_data))
+        digest = hashlib.sha256(encoded).hexdigest()
+        ext = self.image_format
+        self._write(os.path.join(self.directory, digest[:2], f"{digest}.{ext}"), encoded)
+        if thumb:
+            self._write(os.path.join(self.directory, digest[:2], f"{digest}.thumb.{ext}"), thumb)
+        entry = {
+            "key": key,
+            "digest": digest,
+            "format": ext,
+            "media_type": MEDIA_TYPES[ext],
+            "bytes": len(encoded),
+            "thumbnail": thumb is not None,
+            "created": time.time(),
+        }
+        with self.lock:
+            self.entries[key] = entry
+            self.pending.pop(key, None)
+        self.evict()
+        return entry
+
+    def get(self, key, timeout=5.0):
+        """The stored entry for key, waiting for a pending encode up to timeout; None if there is none."""
+        with self.lock:
+            entry = self.entries.get(key)
+            future = self.pending.get(key)
+        if entry is None and future is not None:
+            try:
+                entry = future.result(timeout=timeout)
+            except FutureTimeout:
+                print(f"Screenshot {key} still encoding after {timeout}s")
+                self._forget(key, future)
+                return None
+            except Exception as e:
+                print(f"Screenshot {key} could not be stored: {e}")
+                self._forget(key, future)
+                return None
+        if entry and not self.path_for(entry["digest"]):
+            return None  # Evicted since
+        return entry
+
+    def evict(self):
+        """Drops expired files, then the oldest ones until the store fits in max_bytes."""
+        now = time.time()
+        with self.lock:
+            files = sorted(self.files.items(), key=lambda item: item[1][0])
+            total = sum(size for _, (_, size) in files)
+            doomed = []
+            for path, (mtime, size) in files:
+                if now - mtime > self.retention or total > self.max_bytes:
+                    doomed.append(path)
+                    total -= size
+            for path in doomed:
+                del self.files[path]
+            # Forget the applications whose screenshot went with the files
+            gone = {os.path.basename(path).split(".", 1)[0] for path in doomed}
+            for key in [key for key, entry in self.entries.items() if entry["digest"] in gone]:
+                del self.entries[key]
+        for path in doomed:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        return len(doomed)
+
+    def usage(self):
+        with self.lock:
+            return {"files": len(self.files), "bytes": sum(size for _, size in self.files.values()),
+                    "max_bytes": self.max_bytes, "format": self.image_format}
+
+    def shutdown(self):
+        self.executor.shutdown(wait=True)
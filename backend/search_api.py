@@ -0,0 +1,263 @@
+import os
+import time
+from random import randint
+
+from datetime import date
+from typing import List, Optional
+
+from fastapi import APIRouter, Body, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+
+from fast_json import FastJSONResponse, dumps, parse_fields, project_job, project_jobs
+from conditional import conditional, etag_for, not_modified, not_modified_response
+from models import JobSearch, JobSummary
+from skills import skill_tagger
+
+APIFY_TOKEN = os.environ.get("APIFY_TOKEN", "apify_api_U1UYuCx46PyRSPFWvdugKAdMfOpYxc2NLRgX")
+
+# Indeed scraper actor on Apify
+INDEED_ACTOR_ID = "hMvNSpz3JnHgl5jkh"
+
+# Run statuses after which no more items will be added to the dataset
+TERMINAL_RUN_STATUSES = ("SUCCEEDED", "FAILED", "TIMED-OUT", "ABORTED")
+
+router = APIRouter()
+
+
+class JobStreamTimeout(Exception):
+    """Raised when a streamed actor run misses its first-result deadline or overall timeout."""
+
+
+def create_apify_client():
+    """Creates the Apify client. Imported lazily so the module loads fast.
+
+    Set APIFY_FAKE=1 to get the in-process FakeApifyClient instead (no network, no quota).
+    """
+    if os.environ.get("APIFY_FAKE"):
+        from fake_apify import FakeApifyClient
+        return FakeApifyClient()
+    from apify_client import ApifyClient
+    return ApifyClient(APIFY_TOKEN)
+
+
+def build_run_input(search: str, location: str, max_items: int = 50):
+    return {
+        "position": search,
+        "country": "US",
+        "location": location,
+        "maxItems": max_items,
+        # "parseCompanyDetails": True,
+        "saveOnlyUniqueItems": True,
+        # "followApplyRedirects": True,
+    }
+
+
+# Function to get jobs from Apify
+def get_jobs(client, search: str, location: str):
+    """Get jobs from the Indeed scraper on Apify, tagged with their skill ids."""
+    run = client.actor(INDEED_ACTOR_ID).call(run_input=build_run_input(search, location))
+    return (skill_tagger.tag_job(item) for item in client.dataset(run["defaultDatasetId"]).iterate_items())
+
+
+def stream_jobs(client, search: str, location: str, max_items: int = 50, enough: int = None,
+                first_result_timeout: float = 60.0, timeout: float = 300.0,
+                poll_interval: float = 1.0, normalize: bool = True):
+    """
+    Starts the Indeed actor without waiting for it and yields jobs as they land
+    in its default dataset, tagged with their skill ids.
+
+    The dataset is tailed by offset, so every item is read exactly once. The run
+    is aborted as soon as `enough` items have been yielded, when a deadline is
+    missed, or when the caller stops iterating early.
+
+    Args:
+        client: ApifyClient (or FakeApifyClient).
+        max_items: maxItems passed to the actor.
+        enough: Stop (and abort the run) after this many items. Defaults to max_items.
+        first_result_timeout: Seconds to wait for the first item.
+        timeout: Seconds the whole stream may take.
+        poll_interval: Seconds between dataset polls while nothing new arrived.
+        normalize: Yield normalize_job() dicts instead of raw dataset items.
+
+    Raises:
+        JobStreamTimeout: If a deadline passes before the run is done.
+    """
+    enough = min(enough or max_items, max_items)
+    run = client.actor(INDEED_ACTOR_ID).start(run_input=build_run_input(search, location, max_items))
+    run_client = client.run(run["id"])
+    dataset = client.dataset(run["defaultDatasetId"])
+
+    started = time.monotonic()
+    offset = 0
+    run_finished = False
+    try:
+        while True:
+            page = dataset.list_items(offset=offset, limit=enough - offset)
+            for item in page.items:
+                offset += 1
+                skill_tagger.tag_job(item)
+                yield normalize_job(item) if normalize else item
+            if offset >= enough or run_finished:
+                return
+
+            elapsed = time.monotonic() - started
+            if offset == 0 and elapsed > first_result_timeout:
+                raise JobStreamTimeout(f"No results within {first_result_timeout:g}s")
+            if elapsed > timeout:
+                raise JobStreamTimeout(f"Job search did not finish within {timeout:g}s ({offset} jobs received)")
+
+            if page.items:
+                continue  # More may already be waiting, read again right away
+            # Drain once more after the run ends, items may land just before it does
+            run_finished = run_client.get()["status"] in TERMINAL_RUN_STATUSES
+            if not run_finished:
+                time.sleep(poll_interval)
+    finally:
+        if not run_finished:
+            # Enough items, a missed deadline or the client went away: stop paying for the run
+            try:
+                run_client.abort()
+            except Exception as e:
+                print(f"Error aborting actor run {run['id']}: {e}")
+
+
+def normalize_job(job):
+    """Reduces a raw Indeed dataset item to the fields the job list shows."""
+    return {
+        "company": job["company"],
+        "description": job["description"],
+        "id": job["id"],
+        "isExpired": job["isExpired"],
+        "jobType": job["jobType"],
+        "location": job["location"],
+        "positionName": job["positionName"],
+        "postedAt": job["postedAt"],
+        "url": job["url"] or job["externalApplyLink"],
+        "skills": job.get("skills"),
+        "value": randint(30, 95)
+    }
+
+
+def start_prefetch(request, jobs, top_n=None):
+    """Hands the top jobs to the form prefetcher, if this process has one."""
+    prefetcher = getattr(request.app.state, "form_prefetcher", None)
+    if prefetcher is None:
+        return 0
+    from prefetch import prefetch_group
+    return prefetcher.prefetch(jobs, prefetch_group(request), top_n)
+
+
+def requested_fields(fields):
+    """parse_fields() for a query parameter, as a 400 instead of a ValueError."""
+    try:
+        return parse_fields(fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.post("/jobs", response_model=List[JobSummary])
+async def jobs_endpoint(request: Request, job_search: JobSearch = Body(...),
+                        prefer_local: bool = False, min_local_results: int = 10,
+                        prefetch: Optional[int] = None, fields: Optional[str] = None):
+    """Get jobs matching the search criteria.
+
+    Each job is reduced to the JobSummary fields, or to just the comma separated
+    `fields` (e.g. fields=id,company,positionName for a compact list).
+
+    With prefer_local=true the local job index answers instead of a new actor
+    run whenever it already holds at least min_local_results matches.
+
+    When the apply component runs in the same process, the application forms
+    of the first `prefetch` jobs (default PREFETCH_TOP_N) are resolved in the
+    background so a following /apply starts warm.
+
+    The response carries an ETag of the result set; a repeated search sending it
+    back in If-None-Match gets an empty 304 instead of the same list again.
+    """
+    # Get the search parameters from the request body
+    search, location = job_search.search, job_search.location
+    fields = requested_fields(fields)
+    job_index = request.app.state.job_index
+
+    if prefer_local:
+        jobs = job_index.search(search, location=location)
+        if len(jobs) >= min_local_results:
+            start_prefetch(request, jobs, prefetch)
+            return conditional(request, FastJSONResponse(project_jobs(jobs, fields)))
+
+    client = request.app.state.apify_client
+
+    # The actor run blocks until the scrape is done, so keep it off the event loop
+    jobs = await run_in_threadpool(lambda: list(get_jobs(client, search, location)))
+
+    if request.app.state.normalize_jobs:
+        jobs = [normalize_job(job) for job in jobs]
+
+    job_index.add_many(jobs)
+    start_prefetch(request, jobs, prefetch)
+    return conditional(request, FastJSONResponse(project_jobs(jobs, fields)))
+
+
+@router.get("/jobs/local", response_model=List[JobSummary])
+async def local_jobs_endpoint(request: Request, q: Optional[str] = None, jobType: Optional[str] = None,
+                              location: Optional[str] = None, postedAfter: Optional[date] = None,
+                              postedBefore: Optional[date] = None, limit: int = 50,
+                              fields: Optional[str] = None, skills: Optional[str] = None):
+    """Search every job seen so far without starting an actor run.
+
+    skills is a comma separated list of skill names or aliases (see /skills)
+    that every returned job must mention.
+
+    Answers with 304 when If-None-Match shows the client has the result already:
+    the ETag covers the query and this process's index (instance and
+    generation), so this is decided before searching or serializing anything.
+    There is no Last-Modified, since behind several API workers a date can't
+    tell their indexes apart."""
+    job_index = request.app.state.job_index
+    etag = etag_for(job_index.instance, job_index.generation, request.url.query)
+    if not_modified(request, etag):
+        return not_modified_response(etag)
+    fields = requested_fields(fields)
+    try:
+        skill_ids = skill_tagger.ids_for(skills.split(",")) if skills else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    jobs = job_index.search(
+        q, job_type=jobType, location=location,
+        posted_after=postedAfter, posted_before=postedBefore, skills=skill_ids, limit=limit,
+    )
+    return conditional(request, FastJSONResponse(project_jobs(jobs, fields)), etag)
+
+
+@router.get("/skills")
+async def skills_endpoint():
+    """The skill vocabulary: the names behind the skill ids stored with jobs."""
+    return [{"id": skill_id, "name": name} for skill_id, name in enumerate(skill_tagger.names)]
+
+
+@router.post("/jobs/stream")
+async def jobs_stream_endpoint(request: Request, job_search: JobSearch = Body(...), limit: int = 50,
+                               first_result_timeout: float = 60.0, timeout: float = 300.0,
+                               fields: Optional[str] = None):
+    """Stream jobs as newline-delimited JSON while the actor run is still going."""
+    fields = requested_fields(fields)
+    client = request.app.state.apify_client
+    job_index = request.app.state.job_index
+    jobs = stream_jobs(client, job_search.search, job_search.location, max_items=limit,
+                       first_result_timeout=first_result_timeout, timeout=timeout,
+                       normalize=request.app.state.normalize_jobs)
+
+    def lines():
+        try:
+            for job in jobs:
+                job_index.add(job)
+                yield dumps(project_job(job, fields)) + b"\n"
+        except JobStreamTimeout as e:
+            yield dumps({"error": str(e)}) + b"\n"
+        finally:
+            # Runs when the client disconnects too, which aborts the actor run
+            jobs.close()
+
+    # A sync iterator is consumed in the threadpool, so polling Apify doesn't block the loop
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
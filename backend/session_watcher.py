@@ -0,0 +1,141 @@
+import time
+import threading
+
+from browser_processes import can_inspect_processes, driver_pids, pid_alive
+
+
+class WatchedSession:
+    def __init__(self, key, driver, on_closed, probe=None):
+        self.key = key
+        self.driver = driver
+        self.on_closed = on_closed
+        # Set for a tab in a shared browser, whose processes outlive the session
+        self.probe = probe
+        self.registered_at = time.time()
+        process = getattr(getattr(driver, "service", None), "process", None)
+        self.chromedriver_pid = process.pid if process else None
+        # Looked up on the first sweep, off the request path
+        self.browser_pids = []
+
+
+class SessionWatcher:
+    """
+    One background thread that notices when users close their browser windows,
+    for every open application at once.
+
+    Each sweep checks sessions at the process level first (is chromedriver or
+    Chrome gone?), which costs no WebDriver commands. Only a bounded number of
+    sessions per sweep, taken round-robin, get an actual WebDriver probe, to
+    catch a closed window whose Chrome process keeps running (macOS). Idle
+    overhead therefore stays flat however many sessions are open.
+
+    Args:
+        interval: Seconds between sweeps.
+        probe_budget: Max WebDriver liveness probes per sweep.
+    """
+
+    def __init__(self, interval=2.0, probe_budget=4):
+        self.interval = interval
+        self.probe_budget = probe_budget
+        self.sessions = {}
+        self.lock = threading.Lock()
+        self.stopping = threading.Event()
+        self.thread = None
+        self.probe_cursor = 0
+        self.process_checks = can_inspect_processes()
+
+    def register(self, key, driver, on_closed, probe=None):
+        """
+        Starts watching driver. on_closed(key) is called from the watcher thread
+        once its browser is gone, so it should be quick (e.g. a status update).
+
+        For a tab in a shared browser (see tab_pool), pass probe: a callable
+        returning True once the tab is closed. It replaces the process checks
+        and the window probe, and the shared driver isn't quit on close.
+        """
+        session = WatchedSession(key, driver, on_closed, probe)
+        with self.lock:
+            self.sessions[key] = session
+            if self.thread is None or not self.thread.is_alive():
+                self.stopping.clear()
+                self.thread = threading.Thread(target=self._run, name="session-watcher", daemon=True)
+                self.thread.start()
+
+    def unregister(self, key):
+        with self.lock:
+            return self.sessions.pop(key, None)
+
+    def __len__(self):
+        return len(self.sessions)
+
+    def stop(self):
+        self.stopping.set()
+        if self.thread:
+            self.thread.join(timeout=self.interval + 1)
+
+    def _process_gone(self, session):
+        """True/False from process state, or None if that can't tell us."""
+        if not self.process_checks or session.chromedriver_pid is None or session.probe:
+            return None
+        if not pid_alive(session.chromedriver_pid):
+            return True
+        if not session.browser_pids:
+            # Not looked up yet, or Chrome hadn't been forked on the last sweep
+            session.chromedriver_pid, session.browser_pids = driver_pids(session.driver)
+        if session.browser_pids and not any(pid_alive(pid) for pid in session.browser_pids):
+            return True
+        return None
+
+    def _window_gone(self, session):
+        if session.probe:
+            return session.probe()
+        try:
+            return not session.driver.window_handles
+        except Exception:
+            # The driver raises once the last window is closed
+            return True
+
+    def sweep(self):
+        """Checks every session once and returns the keys found closed."""
+        with self.lock:
+            sessions = list(self.sessions.values())
+        if not sessions:
+            return []
+
+        closed = [s for s in sessions if self._process_gone(s)]
+        alive = [s for s in sessions if s not in closed]
+
+        # Spend the WebDriver probe budget round-robin over what's left
+        if alive:
+            start = self.probe_cursor % len(alive)
+            probes = (alive[start:] + alive[:start])[:self.probe_budget]
+            self.probe_cursor = start + len(probes)
+            closed.extend(s for s in probes if self._window_gone(s))
+
+        for session in closed:
+            if self.unregister(session.key) is None:
+                continue
+            try:
+                session.on_closed(session.key)
+            except Exception as e:
+                print(f"Error in close callback for {session.key}: {e}")
+            if session.probe:
+                continue  # Other tabs still use the browser
+            try:
+                # Browser is gone, this just stops the leftover chromedriver
+                session.driver.quit()
+            except Exception:
+                pass
+        return [s.key for s in closed]
+
+    def _run(self):
+        while not self.stopping.wait(self.interval):
+            try:
+                self.sweep()
+            except Exception as e:
+                print(f"Error while checking browser sessions: {e}")
+            with self.lock:
+                if not self.sessions:
+                    # Nothing left to watch; register() starts a new thread when needed
+                    self.thread = None
+                    return
@@ -0,0 +1,256 @@
+import time
+
+from job_index import TOKEN_RE
+
+# Curated skill vocabulary: (name, aliases). A skill's id is its position in
+# this list and ids are stored with jobs and projects, so only ever append.
+# Aliases are matched as whole words, case-insensitively, in free text.
+SKILLS = [
+    ("Python", ("python", "python3")),
+    ("JavaScript", ("javascript", "js", "ecmascript", "es6")),
+    ("TypeScript", ("typescript",)),
+    ("Java", ("java",)),
+    ("C++", ("c++", "cpp")),
+    ("C#", ("c#", "csharp")),
+    ("C", ()),
+    ("Go", ("golang",)),
+    ("Rust", ("rust",)),
+    ("Ruby", ("ruby",)),
+    ("PHP", ("php",)),
+    ("Swift", ("swiftui", "swift ui", "swift programming")),
+    ("Kotlin", ("kotlin",)),
+    ("Scala", ("scala",)),
+    ("R", ("rstudio",)),
+    ("SQL", ("sql",)),
+    ("HTML", ("html", "html5")),
+    ("CSS", ("css", "css3")),
+    ("Solidity", ("solidity",)),
+    ("Bash", ("bash", "shell scripting")),
+    ("React", ("react", "reactjs", "react.js")),
+    ("React Native", ("react native",)),
+    ("Next.js", ("next.js", "nextjs", "next js")),
+    ("Vue", ("vue", "vuejs", "vue.js")),
+    ("Angular", ("angular", "angularjs")),
+    ("Svelte", ("svelte", "sveltekit")),
+    ("Node.js", ("node.js", "nodejs", "node js")),
+    ("Express", ("express.js", "expressjs")),
+    ("Django", ("django",)),
+    ("Flask", ("flask",)),
+    ("FastAPI", ("fastapi",)),
+    ("Spring", ("spring boot", "springboot", "spring framework")),
+    ("Ruby on Rails", ("ruby on rails", "rubyonrails")),
+    (".NET", ("dotnet", "asp.net", "net core", "net framework")),
+    ("Tailwind CSS", ("tailwind", "tailwindcss")),
+    ("Redux", ("redux",)),
+    ("GraphQL", ("graphql",)),
+    ("REST APIs", ("rest api", "rest apis", "restful")),
+    ("gRPC", ("grpc",)),
+    ("Flutter", ("flutter",)),
+    ("PostgreSQL", ("postgresql", "postgres")),
+    ("MySQL", ("mysql",)),
+    ("SQLite", ("sqlite",)),
+    ("MongoDB", ("mongodb", "mongo")),
+    ("Redis", ("redis",)),
+    ("Elasticsearch", ("elasticsearch", "elastic search", "opensearch")),
+    ("Firebase", ("firebase", "firestore")),
+    ("Supabase", ("supabase",)),
+    ("DynamoDB", ("dynamodb",)),
+    ("Snowflake", ("snowflake",)),
+    ("Kafka", ("kafka",)),
+    ("Spark", ("pyspark", "apache spark", "spark sql")),
+    ("Airflow", ("airflow",)),
+    ("AWS", ("aws", "amazon web services", "ec2", "aws lambda")),
+    ("Google Cloud", ("gcp", "google cloud", "google cloud platform")),
+    ("Azure", ("azure",)),
+    ("Docker", ("docker", "dockerfile")),
+    ("Kubernetes", ("kubernetes", "k8s")),
+    ("Terraform", ("terraform",)),
+    ("Linux", ("linux", "unix")),
+    ("Git", ("git", "github", "gitlab")),
+    ("CI/CD", ("ci/cd", "ci cd", "continuous integration", "github actions", "jenkins")),
+    ("Vercel", ("vercel",)),
+    ("Machine Learning", ("machine learning", "ml")),
+    ("Deep Learning", ("deep learning", "neural network", "neural networks")),
+    ("PyTorch", ("pytorch",)),
+    ("TensorFlow", ("tensorflow", "keras")),
+    ("scikit-learn", ("scikit-learn", "sklearn", "scikit learn")),
+    ("Pandas", ("pandas",)),
+    ("NumPy", ("numpy",)),
+    ("NLP", ("nlp", "natural language processing")),
+    ("Computer Vision", ("computer vision", "opencv")),
+    ("LLMs", ("llm", "llms", "large language model", "large language models", "gpt", "openai", "langchain")),
+    ("Data Analysis", ("data analysis", "data analytics")),
+    ("Tableau", ("tableau",)),
+    ("Power BI", ("power bi", "powerbi")),
+    ("Excel", ("microsoft excel", "ms excel", "excel spreadsheets", "vba")),
+    ("Figma", ("figma",)),
+    ("Unity", ("unity3d", "unity engine", "unity game engine")),
+    ("Solana", ("solana",)),
+    ("Ethereum", ("ethereum", "web3", "web3.js")),
+    ("Blockchain", ("blockchain",)),
+    ("iOS", ("ios",)),
+    ("Android", ("android",)),
+    ("Selenium", ("selenium",)),
+    ("Jest", ("jest",)),
+    ("Pytest", ("pytest",)),
+    ("Agile", ("agile", "scrum")),
+    ("Microservices", ("microservices", "microservice")),
+    ("Arduino", ("arduino",)),
+    ("Raspberry Pi", ("raspberry pi",)),
+    ("MATLAB", ("matlab",)),
+]
+
+# Names and aliases too ambiguous for prose ("go", "excel at", ".net" tokenizes to "net"),
+# only accepted as a whole Devpost "built with" tag
+TAG_ONLY_ALIASES = {"go": "Go", "r": "R", "c": "C", ".net": ".NET", "net": ".NET", "express": "Express",
+                    "spring": "Spring", "node": "Node.js", "next": "Next.js", "swift": "Swift",
+                    "spark": "Spark", "excel": "Excel", "unity": "Unity", "rails": "Ruby on Rails",
+                    "ts": "TypeScript", "torch": "PyTorch"}
+
+
+def words(text):
+    """The tokens skill aliases are matched on: lowercased words keeping c++, c#, node.js intact."""
+    return TOKEN_RE.findall(text.lower()) if text else []
+
+
+class SkillTagger:
+    """
+    Tags free text with skill ids in one pass, using an Aho-Corasick automaton
+    whose alphabet is words rather than characters.
+
+    Every alias is a word sequence ("react native", "next.js"); the automaton
+    over all of them is walked once per document, following failure links
+    instead of re-scanning, so the cost is linear in the document's length
+    whatever the size of the vocabulary. Matching on words gives whole-word
+    matches for free ("go" never matches inside "good").
+
+    Args:
+        skills: [(name, aliases)] in id order.
+        tag_only: {alias: name} accepted only as an exact tag.
+    """
+
+    def __init__(self, skills=SKILLS, tag_only=TAG_ONLY_ALIASES):
+        self.names = [name for name, _ in skills]
+        self.tag_only = tag_only
+        ids = {name: skill_id for skill_id, name in enumerate(self.names)}
+        self.goto = [{}]       # state -> {word: state}
+        self.fail = [0]
+        self.output = [()]     # state -> skill ids recognised on reaching it
+        self.tags = {}         # exact tag -> skill id
+        for skill_id, (name, aliases) in enumerate(skills):
+            for alias in (name.lower(),) + tuple(aliases):
+                self.tags[alias.lower()] = skill_id
+                self._add(words(alias), skill_id)
+        for alias, name in tag_only.items():
+            self.tags[alias] = ids[name]
+        self._build_failure_links()
+
+    def _add(self, alias_words, skill_id):
+        if not alias_words or (len(alias_words) == 1 and alias_words[0] in self.tag_only):
+            return
+        state = 0
+        for word in alias_words:
+            following = self.goto[state].get(word)
+            if following is None:
+                following = len(self.goto)
+                self.goto[state][word] = following
+                self.goto.append({})
+                self.fail.append(0)
+                self.output.append(())
+            state = following
+        if skill_id not in self.output[state]:
+            self.output[state] += (skill_id,)
+
+    def _build_failure_links(self):
+        queue = list(self.goto[0].values())
+        for state in queue:
+            for word, following in self.goto[state].items():
+                queue.append(following)
+                # Longest proper suffix of this state's words that is also a prefix of some alias
+                fallback = self.fail[state]
+                while fallback and word not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[following] = self.goto[fallback].get(word, 0)
+                self.output[following] += tuple(s for s in self.output[self.fail[following]]
+                                                 if s not in self.output[following])
+
+    def tag_text(self, *texts):
+        """Sorted ids of the skills mentioned in texts."""
+        goto, fail, output = self.goto, self.fail, self.output
+        found = set()
+        for text in texts:
+            state = 0
+            for word in words(text):
+                while state and word not in goto[state]:
+                    state = fail[state]
+                state = goto[state].get(word, 0)
+                if output[state]:
+                    found.update(output[state])
+        return sorted(found)
+
+    def tag_tags(self, tags):
+        """Sorted skill ids for discrete tags (e.g. Devpost "built with"), exact first, then as text."""
+        found = set()
+        for tag in tags or ():
+            skill_id = self.tags.get(tag.strip().lower())
+            if skill_id is not None:
+                found.add(skill_id)
+            else:
+                found.update(self.tag_text(tag))
+        return sorted(found)
+
+    def tag_job(self, job):
+        """Stores the skill ids of a job's title and description under "skills"; returns the job."""
+        job["skills"] = self.tag_text(job.get("positionName"), job.get("description"))
+        return job
+
+    def tag_project(self, project):
+        """Skill ids of a scraped Devpost project: its built-with tags and every text section."""
+        texts = [value for key, value in project.items()
+                 if isinstance(value, str) and key not in ("title", "url")]
+        return sorted(set(self.tag_tags(project.get("built_with"))) | set(self.tag_text(*texts)))
+
+    def names_for(self, skill_ids):
+        return [self.names[skill_id] for skill_id in skill_ids]
+
+    def ids_for(self, names):
+        """Skill ids for names or aliases ("nextjs", "Next.js"); unknown names raise ValueError."""
+        ids = []
+        for name in names:
+            skill_id = self.tags.get(name.strip().lower())
+            if skill_id is None:
+                raise ValueError(f"Unknown skill: {name}")
+            ids.append(skill_id)
+        return ids
+
+
+# Compiled once per process
+skill_tagger = SkillTagger()
+
+
+def main():
+    """Tags every job in a JSON file (e.g. a saved JOB_INDEX_PATH) and reports how long it took."""
+    import json
+    import argparse
+    parser = argparse.ArgumentParser(description="Tag jobs with skills and time it")
+    parser.add_argument("jobs", help="JSON list of jobs")
+    parser.add_argument("-r", "--repeat", type=int, default=1, help="Tag the list this many times")
+    args = parser.parse_args()
+
+    with open(args.jobs) as f:
+        jobs = json.load(f) * args.repeat
+    started = time.perf_counter()
+    for job in jobs:
+        skill_tagger.tag_job(job)
+    elapsed = time.perf_counter() - started
+    print(f"Tagged {len(jobs)} jobs in {elapsed * 1000:.1f} ms ({elapsed / len(jobs) * 1e6:.1f} µs per job)")
+    counts = {}
+    for job in jobs:
+        for skill_id in job["skills"]:
+            counts[skill_id] = counts.get(skill_id, 0) + 1
+    for skill_id, count in sorted(counts.items(), key=lambda item: -item[1])[:15]:
+        print(f"  {skill_tagger.names[skill_id]:<20} {count}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,248 @@
+import os
+import threading
+from contextlib import contextmanager
+
+
+class TabSession:
+    """
+    One application running as a tab of a shared browser.
+
+    WebDriver commands always go to the driver's current window, so a tab
+    must be activated (which takes its browser's lock and switches to its
+    window) before it is driven, and deactivated afterwards. Other tabs of
+    the same browser wait meanwhile; tabs of other browsers don't.
+    """
+
+    def __init__(self, key, browser, handle, context_id=None):
+        self.key = key
+        self.browser = browser
+        self.handle = handle
+        self.context_id = context_id
+
+    def activate(self):
+        """Takes the browser for this tab and returns its driver, switched to the tab."""
+        self.browser.lock.acquire()
+        try:
+            self.browser.driver.switch_to.window(self.handle)
+        except Exception:
+            self.browser.lock.release()
+            raise
+        return self.browser.driver
+
+    def deactivate(self):
+        self.browser.lock.release()
+
+    @contextmanager
+    def active(self):
+        driver = self.activate()
+        try:
+            yield driver
+        finally:
+            self.deactivate()
+
+
+class SharedBrowser:
+    def __init__(self, key):
+        self.key = key
+        self.driver = None
+        self.home_handle = None
+        self.lock = threading.Lock()   # held while one of its tabs is being driven
+        self.tabs = {}                 # application key -> TabSession
+        self.reserved = 1              # tabs being opened; counts against the limit
+
+
+class TabPool:
+    """
+    Runs several applications as tabs inside one Chrome instead of one Chrome
+    process tree each.
+
+    open() puts an application into the fullest browser that still has room
+    for another tab (at most tabs_per_browser), launching a new browser only
+    when all are full. With isolate=True every tab gets its own browser
+    context (Target.createBrowserContext), so applications don't share
+    cookies, storage or logins, like separate incognito windows. When a
+    browser's last tab is closed the browser is quit.
+
+    Args:
+        launch: Callable(browser_key) that starts a browser and returns its driver.
+        tabs_per_browser: Applications per browser.
+        isolate: Separate browser context per tab (otherwise plain tabs of one profile).
+        on_browser_closed: Callback(browser_key) after a browser was quit.
+    """
+
+    def __init__(self, launch, tabs_per_browser=4, isolate=True, on_browser_closed=None):
+        self.launch = launch
+        self.tabs_per_browser = tabs_per_browser
+        self.isolate = isolate
+        self.on_browser_closed = on_browser_closed
+        self.lock = threading.Lock()
+        self.browsers = {}   # browser key -> SharedBrowser
+        self.sessions = {}   # application key -> TabSession
+        self.launched = 0
+
+    @classmethod
+    def from_env(cls, launch, **kwargs):
+        """
+        Configured by APPLY_TABS_PER_BROWSER and APPLY_TAB_ISOLATION (on by
+        default). Returns None when APPLY_TABS_PER_BROWSER is 1 or less, which
+        keeps one browser per application.
+        """
+        tabs = int(os.environ.get("APPLY_TABS_PER_BROWSER", 1))
+        if tabs <= 1:
+            return None
+        isolate = os.environ.get("APPLY_TAB_ISOLATION", "on").lower() not in ("0", "off", "false")
+        return cls(launch, tabs_per_browser=tabs, isolate=isolate, **kwargs)
+
+    def _reserve(self):
+        """A browser with room for one more tab (reserved for the caller) and whether it must be launched."""
+        with self.lock:
+            candidates = [b for b in self.browsers.values()
+                          if b.driver is not None and len(b.tabs) + b.reserved < self.tabs_per_browser]
+            if candidates:
+                # Fill browsers up before starting new ones
+                browser = max(candidates, key=lambda b: len(b.tabs) + b.reserved)
+                browser.reserved += 1
+                return browser, False
+            self.launched += 1
+            browser = SharedBrowser(f"browser-{os.getpid()}-{self.launched}")
+            self.browsers[browser.key] = browser
+            return browser, True
+
+    def _unreserve(self, browser):
+        with self.lock:
+            browser.reserved -= 1
+            empty = browser.driver is None or (not browser.tabs and not browser.reserved)
+            if empty:
+                self.browsers.pop(browser.key, None)
+        if empty:
+            self._quit(browser)
+
+    def _open_window(self, driver):
+        """Creates the tab's window. Returns (window handle, browser context id or None)."""
+        if self.isolate:
+            try:
+                context_id = driver.execute_cdp_cmd("Target.createBrowserContext", {})["browserContextId"]
+                target_id = driver.execute_cdp_cmd(
+                    "Target.createTarget", {"url": "about:blank", "browserContextId": context_id}
+                )["targetId"]
+                # ChromeDriver window handles are target ids (prefixed "CDwindow-" by old versions)
+                handle = next((h for h in driver.window_handles if h.endswith(target_id)), target_id)
+                return handle, context_id
+            except Exception as e:
+                print(f"Isolated browser context not available, using a plain tab: {e}")
+        driver.switch_to.new_window("tab")
+        return driver.current_window_handle, None
+
+    def open(self, key):
+        """
+        Opens a tab for application key, launching a browser if every one is full.
+
+        Returns:
+            The TabSession; activate() it to drive the tab.
+        """
+        browser, launch = self._reserve()
+        try:
+            if launch:
+                browser.driver = self.launch(browser.key)
+                browser.home_handle = browser.driver.current_window_handle
+            with browser.lock:
+                handle, context_id = self._open_window(browser.driver)
+        except Exception:
+            self._unreserve(browser)
+            raise
+        session = TabSession(key, browser, handle, context_id)
+        with self.lock:
+            browser.reserved -= 1
+            browser.tabs[key] = session
+            self.sessions[key] = session
+        return session
+
+    def get(self, key):
+        with self.lock:
+            return self.sessions.get(key)
+
+    def is_closed(self, key):
+        """True once the user closed the tab's window (or its whole browser)."""
+        session = self.get(key)
+        if session is None:
+            return True
+        try:
+            return session.handle not in session.browser.driver.window_handles
+        except Exception:
+            return True
+
+    def close(self, key):
+        """
+        Closes the tab for key (if still open) and quits its browser when it was the last one.
+
+        The tab is forgotten at once, but closing its window needs the
+        browser's lock, which another tab's fill may hold for a long time;
+        that part runs on its own thread so callers such as the session
+        watcher never wait for it.
+        """
+        with self.lock:
+            session = self.sessions.pop(key, None)
+            if session is None:
+                return
+            browser = session.browser
+            browser.tabs.pop(key, None)
+            empty = not browser.tabs and not browser.reserved
+            if empty:
+                self.browsers.pop(browser.key, None)
+        if empty:
+            self._quit(browser)
+            return
+        threading.Thread(target=self._close_window, args=(session,), name=f"close-tab-{key}", daemon=True).start()
+
+    def _close_window(self, session):
+        browser = session.browser
+        try:
+            with browser.lock:
+                driver = browser.driver
+                if session.context_id:
+                    # Closes the context's windows along with its cookies and storage
+                    driver.execute_cdp_cmd("Target.disposeBrowserContext", {"browserContextId": session.context_id})
+                elif session.handle in driver.window_handles:
+                    driver.switch_to.window(session.handle)
+                    driver.close()
+                driver.switch_to.window(browser.home_handle)
+        except Exception as e:
+            print(f"Error closing tab for {session.key}: {e}")
+
+    def _quit(self, browser):
+        if browser.driver is not None:
+            try:
+                browser.driver.quit()
+            except Exception:
+                pass
+        if self.on_browser_closed:
+            self.on_browser_closed(browser.key)
+
+    def drop_browser(self, browser_key):
+        """
+        Forgets a browser that was shut down from outside (e.g. for idling).
+
+        Returns:
+            The application keys whose tabs were in it.
+        """
+        with self.lock:
+            browser = self.browsers.pop(browser_key, None)
+            if browser is None:
+                return []
+            for key in browser.tabs:
+                self.sessions.pop(key, None)
+            return list(browser.tabs)
+
+    def is_browser(self, key):
+        with self.lock:
+            return key in self.browsers
+
+    def summary(self):
+        with self.lock:
+            return {
+                "tabs_per_browser": self.tabs_per_browser,
+                "isolated": self.isolate,
+                "browsers": {key: sorted(b.tabs) for key, b in self.browsers.items()},
+                "tabs": len(self.sessions),
+                "browsers_launched": self.launched,
+            }
@@ -0,0 +1,39 @@
+import os
+import sys
+
+import pytest
+
+# The backend modules are imported top-level, as main.py does
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fixture_server import DEVPOST_FIXTURES_DIR, start_fixture_server  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def api(tmp_path_factory):
+    """A TestClient for the whole app, with the fake Apify client and every store in a temp dir."""
+    root = tmp_path_factory.mktemp("api")
+    for name, value in (("APIFY_FAKE", "1"), ("RATE_LIMITS", "off"), ("PROFILE_STORE_DIR", root / "profiles"),
+                        ("SCREENSHOT_DIR", root / "screenshots"), ("CHROME_PROFILE_DIR", root / "chrome"),
+                        ("PROJECT_INDEX_PATH", root / "projects.bm25")):
+        os.environ.setdefault(name, str(value))
+    from fastapi.testclient import TestClient
+    import main
+    with TestClient(main.app) as client:
+        yield client
+
+
+@pytest.fixture(scope="session")
+def ats_server():
+    """Base URL of the ATS fixture server (fixtures/ats)."""
+    server, base_url = start_fixture_server()
+    yield base_url
+    server.shutdown()
+
+
+@pytest.fixture(scope="session")
+def devpost_server():
+    """Base URL of the saved Devpost portfolio pages (fixtures/devpost)."""
+    server, base_url = start_fixture_server(directory=DEVPOST_FIXTURES_DIR)
+    yield base_url
+    server.shutdown()
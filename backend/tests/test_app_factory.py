@@ -0,0 +1,35 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app_factory import create_app, parse_components, parse_origins
+
+
+def test_components_and_origins_are_parsed():
+    assert parse_components(" search , apply,") == ("search", "apply")
+    with pytest.raises(ValueError, match="Unknown app components: browser"):
+        parse_components("search,browser")
+    assert parse_origins("https://a.example/, https://b.example") == ["https://a.example", "https://b.example"]
+
+
+def test_search_only_app_mounts_just_the_search_routes(monkeypatch):
+    monkeypatch.setenv("APIFY_FAKE", "1")
+    monkeypatch.setenv("RATE_LIMITS", "off")
+    monkeypatch.delenv("JOB_INDEX_PATH", raising=False)
+    app = create_app(["search"])
+    paths = set(app.openapi()["paths"])
+    assert "/jobs/local" in paths and "/apply" not in paths
+    with TestClient(app) as client:
+        assert client.get("/").json()["components"] == ["search"]
+        assert client.get("/jobs/local").json() == []
+        assert client.post("/apply", json={}).status_code in (404, 405)
+
+
+def test_job_index_is_saved_on_shutdown(monkeypatch, tmp_path):
+    path = tmp_path / "jobs.json"
+    monkeypatch.setenv("APIFY_FAKE", "1")
+    monkeypatch.setenv("RATE_LIMITS", "off")
+    monkeypatch.setenv("JOB_INDEX_PATH", str(path))
+    with TestClient(create_app(["search"])) as client:
+        client.app.state.job_index.add({"id": "kept", "positionName": "Saved engineer"})
+    with TestClient(create_app(["search"])) as client:
+        assert [job["id"] for job in client.get("/jobs/local?q=saved").json()] == ["kept"]
@@ -0,0 +1,68 @@
+import requests
+
+from apply_links import ApplyLinkResolver
+
+
+def resolver():
+    # A plain session: the fixture server is on loopback, which public_session refuses
+    return ApplyLinkResolver(session=requests.Session(), max_workers=2)
+
+
+def test_follows_redirects_and_apply_links_to_the_form(ats_server):
+    result = resolver().resolve("job-1", f"{ats_server}/redirect/2?to=/careers.html")
+    assert result["is_form"]
+    assert result["url"] == f"{ats_server}/greenhouse.html"
+    assert result["error"] is None
+    # Both redirect chains: the job page's and the one behind its Apply link
+    assert result["chain"][0] == f"{ats_server}/redirect/2?to=/careers.html"
+    assert f"{ats_server}/careers.html" in result["chain"]
+    assert result["chain"][-1] == f"{ats_server}/greenhouse.html"
+
+
+def test_form_page_resolves_to_itself(ats_server):
+    result = resolver().resolve("job-1", f"{ats_server}/ashby.html")
+    assert result["is_form"]
+    assert result["chain"] == [f"{ats_server}/ashby.html"]
+
+
+def test_cache_is_keyed_by_job_and_url(ats_server):
+    links = resolver()
+    first = links.resolve("job-1", f"{ats_server}/careers.html")
+    assert links.cached("job-1", f"{ats_server}/careers.html") is first
+    # The same job id with another URL is resolved from that URL, never answered from the cache
+    assert links.cached("job-1", f"{ats_server}/ashby.html") is None
+    other = links.resolve("job-1", f"{ats_server}/ashby.html")
+    assert other["url"] == f"{ats_server}/ashby.html"
+    assert links.resolve("job-1", f"{ats_server}/careers.html") is first
+
+
+def test_failures_are_reported_and_not_cached(ats_server):
+    links = resolver()
+    result = links.resolve("job-1", f"{ats_server}/missing.html")
+    assert result["error"]
+    assert not result["is_form"]
+    assert links.cached("job-1", f"{ats_server}/missing.html") is None
+
+
+def test_resolve_many(ats_server):
+    results = resolver().resolve_many([("a", f"{ats_server}/careers.html"), ("b", f"{ats_server}/ashby.html")])
+    assert results["a"]["url"] == f"{ats_server}/greenhouse.html"
+    assert results["b"]["url"] == f"{ats_server}/ashby.html"
+
+
+def test_cache_is_bounded_least_recently_used_first():
+    # Greenhouse job URLs are forms already, so these resolve without any request
+    links = ApplyLinkResolver(session=requests.Session(), cache_size=2)
+    urls = [f"https://boards.greenhouse.io/acme/jobs/{n}" for n in range(3)]
+    links.resolve("a", urls[0])
+    links.resolve("b", urls[1])
+    links.cached("a", urls[0])
+    links.resolve("c", urls[2])
+    assert list(links.cache) == [("a", urls[0]), ("c", urls[2])]
+
+
+def test_expired_resolutions_are_swept_on_insert():
+    links = ApplyLinkResolver(session=requests.Session(), ttl=60)
+    links.resolve("old", "https://boards.greenhouse.io/acme/jobs/1")["resolved_at"] -= 120
+    links.resolve("new", "https://boards.greenhouse.io/acme/jobs/2")
+    assert [job_id for job_id, _ in links.cache] == ["new"]
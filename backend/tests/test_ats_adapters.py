@@ -0,0 +1,90 @@
+import pytest
+
+from ats_adapters import ATSAdapter, AshbyAdapter, GreenhouseAdapter, SAMPLE_PROFILE, adapter_for
+
+GREENHOUSE_URL = "https://boards.greenhouse.io/veracode/jobs/7843495002"
+ASHBY_URL = "https://jobs.ashbyhq.com/Jerry/9458cca3-9c58-4aad-a579-7f5720c7ec87/application"
+
+
+@pytest.fixture
+def resume(tmp_path):
+    path = tmp_path / "resume.pdf"
+    path.write_bytes(b"%PDF-1.4\n% sample resume\n%%EOF\n")
+    return str(path)
+
+
+@pytest.fixture
+def greenhouse(ats_server):
+    return GreenhouseAdapter("local", f"{ats_server}/greenhouse-api")
+
+
+@pytest.fixture
+def ashby(ats_server):
+    return AshbyAdapter("local", f"{ats_server}/ashby-api")
+
+
+def test_greenhouse_submission(greenhouse, resume):
+    result = greenhouse.submit(GREENHOUSE_URL, SAMPLE_PROFILE, resume)
+    assert result["submitted"], result["error"]
+    assert result["response"]["fields"]["first_name"] == "Ada"
+    assert result["response"]["fields"]["email"] == "ada@example.com"
+    assert result["response"]["files"]["resume"]["filename"] == "resume.pdf"
+
+
+def test_greenhouse_without_resume_falls_back(greenhouse):
+    result = greenhouse.submit(GREENHOUSE_URL, SAMPLE_PROFILE)
+    assert not result["submitted"]
+    assert result["missing"] == ["Resume/CV"]
+
+
+def test_ashby_submission(ashby, resume):
+    result = ashby.submit(ASHBY_URL, SAMPLE_PROFILE, resume)
+    assert result["submitted"], result["error"]
+    submitted = result["response"]["results"]["submittedValues"]
+    assert "Ada Lovelace" in submitted.values()
+    assert "ada@example.com" in submitted.values()
+    assert list(result["response"]["results"]["files"]) == ["resume_0"]
+
+
+def test_ashby_missing_required_answers(ashby, resume):
+    result = ashby.submit(ASHBY_URL, {"firstName": "Ada"}, resume)
+    assert not result["submitted"]
+    assert "Email" in result["missing"]
+
+
+def test_unknown_posting_is_unsupported(ashby, resume):
+    result = ashby.submit("https://jobs.ashbyhq.com/Jerry/not-a-posting", SAMPLE_PROFILE, resume)
+    assert not result["submitted"]
+    assert "posting id" in result["error"]
+
+
+def test_api_errors_are_reported(ats_server, resume):
+    adapter = GreenhouseAdapter("local", f"{ats_server}/nowhere")
+    result = adapter.submit(GREENHOUSE_URL, SAMPLE_PROFILE, resume)
+    assert not result["submitted"]
+    assert result["error"].startswith("greenhouse API error")
+
+
+def test_adapter_for_needs_an_api_key(monkeypatch, ats_server):
+    monkeypatch.delenv("GREENHOUSE_API_KEY", raising=False)
+    assert adapter_for(GREENHOUSE_URL) is None
+    monkeypatch.setenv("GREENHOUSE_API_KEY", "local")
+    monkeypatch.setenv("GREENHOUSE_API_BASE", f"{ats_server}/greenhouse-api")
+    adapter = adapter_for(GREENHOUSE_URL)
+    assert isinstance(adapter, GreenhouseAdapter)
+    assert adapter.api_base == f"{ats_server}/greenhouse-api"
+    assert adapter_for("https://example.com/careers/1") is None
+
+
+def test_adapters_must_implement_the_provider_hooks():
+    with pytest.raises(TypeError):
+        ATSAdapter("key", "https://example.com")
+
+    class Partial(ATSAdapter):
+        provider = "partial"
+
+        def job_reference(self, url):
+            return url
+
+    with pytest.raises(TypeError):
+        Partial("key", "https://example.com")
@@ -0,0 +1,26 @@
+import os
+
+from chrome_profiles import ProfileTemplate
+
+
+def test_session_dirs_stay_inside_sessions_dir(tmp_path):
+    template = ProfileTemplate(str(tmp_path / "chrome"), harvest_delay=0)
+    outside = tmp_path / "chrome" / "template"
+    for key in ("../../template", "/etc", "job/../../x", "job-1"):
+        session_dir = template.clone(key)
+        assert os.path.dirname(session_dir) == template.sessions_dir
+        assert os.path.isfile(os.path.join(session_dir, "profile", "First Run"))
+        template.release(key, harvest=False, wait=True)
+        assert not os.path.exists(session_dir)
+    # Releasing a traversal key removed only its own clone, never the template
+    assert (outside / "profile" / "First Run").is_file()
+    assert template.sessions == {} and os.listdir(template.sessions_dir) == []
+
+
+def test_each_session_gets_its_own_dir(tmp_path):
+    template = ProfileTemplate(str(tmp_path / "chrome"))
+    first = template.clone("job-1")
+    second = template.clone("job-2")
+    assert first != second
+    assert template.chrome_arguments(first)[0] == f"--user-data-dir={os.path.join(first, 'profile')}"
+    assert template.stats["clones"] == 2
@@ -0,0 +1,74 @@
+from fastapi import FastAPI
+from fastapi.responses import Response
+from fastapi.testclient import TestClient
+
+from compression import CompressionMiddleware, accepted_encodings, choose_encoding
+from conditional import etag_for
+
+
+def test_etags_are_weak_and_stable():
+    assert etag_for("a", 1) == etag_for("a", 1)
+    assert etag_for("a", 1) != etag_for("a1")
+    assert etag_for(b"body").startswith('W/"')
+
+
+def test_accept_encoding_parsing():
+    assert accepted_encodings("gzip;q=0, br, deflate;q=0.5") == {"br", "deflate"}
+    assert choose_encoding("deflate") is None
+    assert choose_encoding("gzip, deflate") == "gzip"
+
+
+def small_app():
+    app = FastAPI()
+
+    @app.get("/big")
+    def big():
+        return {"items": ["x" * 50] * 100}
+
+    @app.get("/small")
+    def small():
+        return {"ok": True}
+
+    @app.get("/image")
+    def image():
+        return Response(b"\x89PNG" * 500, media_type="image/png")
+
+    app.add_middleware(CompressionMiddleware, minimum_size=1024)
+    return TestClient(app)
+
+
+def test_only_large_compressible_bodies_are_compressed():
+    client = small_app()
+    big = client.get("/big", headers={"Accept-Encoding": "gzip"})
+    assert big.headers["content-encoding"] == "gzip" and "Accept-Encoding" in big.headers["vary"]
+    assert len(big.json()["items"]) == 100
+    assert int(big.headers["content-length"]) < 1000
+    assert "content-encoding" not in client.get("/small", headers={"Accept-Encoding": "gzip"}).headers
+    assert "content-encoding" not in client.get("/image", headers={"Accept-Encoding": "gzip"}).headers
+    assert "content-encoding" not in client.get("/big", headers={"Accept-Encoding": "identity"}).headers
+
+
+def test_local_jobs_answer_304_and_compress(api):
+    job_index = api.app.state.job_index
+    for n in range(40):
+        job_index.add({"id": f"etag-{n}", "positionName": f"Conditional engineer {n}", "company": "Acme",
+                       "location": "Remote", "url": f"https://example.com/etag/{n}"})
+    url = "/jobs/local?q=conditional&limit=40"
+    first = api.get(url, headers={"Accept-Encoding": "gzip"})
+    assert first.status_code == 200 and len(first.json()) == 40
+    assert first.headers["content-encoding"] == "gzip"
+    etag = first.headers["etag"]
+    assert etag.startswith('W/"') and first.headers["cache-control"] == "no-cache"
+
+    # The ETag describes the content, so it is the same whether or not the body was compressed
+    plain = api.get(url, headers={"Accept-Encoding": "identity"})
+    assert plain.headers["etag"] == etag and "content-encoding" not in plain.headers
+
+    cached = api.get(url, headers={"Accept-Encoding": "gzip", "If-None-Match": etag})
+    assert cached.status_code == 304 and cached.content == b""
+    assert cached.headers["etag"] == etag and "content-encoding" not in cached.headers
+
+    job_index.add({"id": "etag-new", "positionName": "Conditional lead", "url": "https://example.com/etag/new"})
+    changed = api.get(url, headers={"If-None-Match": etag})
+    assert changed.status_code == 200 and changed.headers["etag"] != etag
+
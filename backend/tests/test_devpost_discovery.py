@@ -0,0 +1,47 @@
+import time
+
+from devpost_scraper import RateLimiter, get_project_links, make_session, parse_portfolio_page
+
+
+class CountingSession:
+    """Wraps a session to record which pages were requested."""
+
+    def __init__(self):
+        self.session = make_session()
+        self.pages = []
+
+    def get(self, url, params=None, **kwargs):
+        self.pages.append((params or {}).get("page", 1))
+        return self.session.get(url, params=params, **kwargs)
+
+
+def test_finds_projects_on_every_page_in_order(devpost_server):
+    session = CountingSession()
+    links = get_project_links("voomp", base_url=devpost_server, session=session, rate=0)
+    slugs = [link.rsplit("/", 1)[1] for link in links]
+    assert slugs == [
+        "hackmit-scheduler", "pantry-pal", "study-buddy-ai", "green-commute",
+        "voice-notes-summarizer", "ar-campus-tour", "budget-bot",
+        "open-transit-map", "plant-doctor",
+    ]
+    assert sorted(session.pages) == [1, 2, 3]
+
+
+def test_relative_links_resolve_against_the_base_url():
+    html = '<a class="link-to-software" href="/software/x"></a><a class="link-to-software" href="https://devpost.com/software/y"></a>'
+    projects, last_page = parse_portfolio_page(html, "http://127.0.0.1:9")
+    assert projects == ["http://127.0.0.1:9/software/x", "https://devpost.com/software/y"]
+    assert last_page == 1
+
+
+def test_last_page_comes_from_the_pagination():
+    html = '<nav class="pagination"><a href="/u?page=2">2</a><a href="/u?page=7">7</a><a href="/u?page=next">Next</a></nav>'
+    assert parse_portfolio_page(html)[1] == 7
+
+
+def test_rate_limiter_spaces_out_requests():
+    limiter = RateLimiter(50)
+    started = time.monotonic()
+    for _ in range(6):
+        limiter.wait()
+    assert time.monotonic() - started >= 5 / 50 * 0.9
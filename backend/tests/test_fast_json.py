@@ -0,0 +1,37 @@
+import json
+from datetime import date
+
+import pytest
+
+from fast_json import FastJSONResponse, dumps, parse_fields, project_jobs
+from models import JOB_SUMMARY_FIELDS
+
+
+def test_dumps_is_compact_utf8_and_handles_dates():
+    encoded = dumps({"city": "Zürich", "posted": date(2026, 1, 2)})
+    assert json.loads(encoded) == {"city": "Zürich", "posted": "2026-01-02"}
+    assert b": " not in encoded
+
+
+def test_response_renders_with_dumps():
+    assert FastJSONResponse([{"id": "1"}]).body == dumps([{"id": "1"}])
+
+
+def test_fields_are_validated_and_deduplicated():
+    assert parse_fields(None) == JOB_SUMMARY_FIELDS
+    assert parse_fields("id, company,id") == ("id", "company")
+    with pytest.raises(ValueError, match="Unknown job fields: salaryRaw"):
+        parse_fields("id,salaryRaw")
+
+
+def test_projection_keeps_only_summary_fields():
+    raw = {"id": "1", "company": "Acme", "crawlerState": {"page": 3}, "positionName": "Dev"}
+    projected = project_jobs([raw])[0]
+    assert set(projected) == set(JOB_SUMMARY_FIELDS) and "crawlerState" not in projected
+    assert project_jobs([raw], ("id", "company")) == [{"id": "1", "company": "Acme"}]
+
+
+def test_local_jobs_honour_the_fields_parameter(api):
+    api.app.state.job_index.add({"id": "fields-1", "positionName": "Projection tester", "company": "Acme"})
+    assert api.get("/jobs/local?q=projection&fields=id,company").json() == [{"id": "fields-1", "company": "Acme"}]
+    assert api.get("/jobs/local?fields=nope").status_code == 400
@@ -0,0 +1,58 @@
+import pytest
+
+from field_matcher import _compiled_for, match_descriptor, match_fields, profile_values
+
+USER = {"firstName": "Ada", "lastName": "Lovelace", "email": "ada@example.com", "phone": "555-0100",
+        "city": "London", "state": "", "githubUsername": "ada"}
+
+
+@pytest.mark.parametrize("descriptor, attribute", [
+    ({"label": "First Name"}, "firstName"),
+    ({"label": "Last name"}, "lastName"),
+    ({"name": "candidateEmail", "label": "Contact"}, "email"),
+    ({"label": "Anything", "autocomplete": "section-a family-name"}, "lastName"),
+    ({"label": "Reach me", "type": "tel"}, "phone"),
+    ({"label": "First day you can start"}, None),
+])
+def test_match_descriptor(descriptor, attribute):
+    assert match_descriptor(descriptor)[0] == attribute
+
+
+def test_autocomplete_beats_labels():
+    assert match_descriptor({"label": "Email", "autocomplete": "given-name"}) == ("firstName", 1.0)
+
+
+def test_profile_values_derives_fields():
+    values = profile_values(USER)
+    assert values["fullName"] == "Ada Lovelace"
+    assert values["githubUrl"] == "https://github.com/ada"
+    assert values["location"] == "London"
+    assert "state" not in values
+
+
+def test_each_attribute_fills_one_field():
+    descriptors = [{"name": "email_2", "placeholder": "email"}, {"label": "Email"}, {"label": "First name"}]
+    matches = match_fields(descriptors, USER)
+    assert [(m["index"], m["attribute"]) for m in matches] == [(1, "email"), (2, "firstName")]
+
+
+def test_only_text_like_fields_are_matched():
+    descriptors = [
+        {"tag": "input", "type": "checkbox", "label": "Email me about new jobs"},
+        {"tag": "input", "type": "radio", "label": "First name only"},
+        {"tag": "select", "type": "select", "label": "City"},
+        {"tag": "input", "type": "file", "label": "Phone scan"},
+        {"tag": "input", "type": "email", "label": "Email"},
+        {"tag": "textarea", "type": "textarea", "label": "Phone number"},
+    ]
+    matches = match_fields(descriptors, USER)
+    assert [(m["index"], m["attribute"]) for m in matches] == [(4, "email"), (5, "phone")]
+
+
+def test_extra_profile_fields_match_by_name():
+    matches = match_fields([{"label": "Portfolio site"}], {**USER, "portfolioSite": "https://ada.dev"})
+    assert matches[0]["value"] == "https://ada.dev"
+
+
+def test_compiled_tables_are_bounded():
+    assert _compiled_for.cache_info().maxsize == 4096
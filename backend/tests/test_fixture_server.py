@@ -0,0 +1,48 @@
+import os
+
+import requests
+
+from bench_formfiller import compare_results, summarise
+from fixture_server import FIXTURES_DIR, load_manifest
+
+
+def test_every_manifest_fixture_is_served(ats_server):
+    for fixture in load_manifest():
+        assert os.path.isfile(os.path.join(FIXTURES_DIR, fixture["path"]))
+        response = requests.get(f"{ats_server}/{fixture['path']}", timeout=5)
+        assert response.status_code == 200 and "<form" in response.text
+        assert response.headers["Cache-Control"] == "no-cache"
+
+
+def test_static_assets_are_cacheable(ats_server):
+    response = requests.get(f"{ats_server}/static/ats.css", timeout=5)
+    assert response.headers["Cache-Control"] == "public, max-age=86400"
+
+
+def test_redirect_chains_end_at_the_target(ats_server):
+    response = requests.get(f"{ats_server}/redirect/3?to=/ashby.html", timeout=5)
+    assert len(response.history) == 3 and response.url == f"{ats_server}/ashby.html"
+
+
+def test_form_posts_are_accepted(ats_server):
+    response = requests.post(f"{ats_server}/greenhouse.html", data={"first_name": "Ada"}, timeout=5)
+    assert response.json() == {"success": True, "path": "/greenhouse.html"}
+
+
+def run(wall_clock_s, commands=100, filled=10):
+    return {"wall_clock_s": wall_clock_s, "browser_startup_s": 1.0, "webdriver_commands": commands,
+            "peak_rss_mb": 300.0, "fields_filled_correctly": filled, "fields_expected": 10,
+            "pages_expected": 1, "pages_visited": 1, "commands_by_name": {}}
+
+
+def test_summaries_use_medians():
+    summary = summarise([run(1.0), run(9.0), run(2.0)])
+    assert summary["wall_clock_s"] == 2.0 and len(summary["runs"]) == 3
+
+
+def test_regressions_beyond_the_threshold_are_reported():
+    baseline = {"meta": {"revision": "abc123"}, "results": {"greenhouse": summarise([run(2.0)])}}
+    current = {"results": {"greenhouse": summarise([run(2.1, commands=150, filled=8)]), "new": summarise([run(1.0)])}}
+    regressions = compare_results(current, baseline, threshold=0.1)
+    assert [(fixture, metric) for fixture, metric, _, _ in regressions] == [
+        ("greenhouse", "webdriver_commands"), ("greenhouse", "fields_filled_correctly")]
@@ -0,0 +1,78 @@
+import pytest
+import requests
+
+import apply_links
+from apply_links import UnsafeURL, check_public_url, public_session
+from fixture_server import load_manifest
+from form_analysis import FormAnalyzer, analyze_html
+
+SINGLE_PAGE_FIXTURES = [fixture for fixture in load_manifest() if fixture["name"] in ("greenhouse", "ashby")]
+
+
+def field_counts(fields):
+    counts = {"text": 0, "dropdowns": 0, "files": 0}
+    for field in fields:
+        if field["type"] == "file":
+            counts["files"] += 1
+        elif field["tag"] == "select":
+            counts["dropdowns"] += 1
+        else:
+            counts["text"] += 1
+    return counts
+
+
+@pytest.mark.parametrize("fixture", SINGLE_PAGE_FIXTURES, ids=lambda fixture: fixture["name"])
+def test_schema_matches_what_the_browser_fills(ats_server, fixture):
+    result = FormAnalyzer(session=requests.Session()).analyze(f"{ats_server}/{fixture['path']}")
+    assert result["error"] is None
+    assert result["complete"]
+    assert field_counts(result["fields"]) == fixture["expected"][0]
+
+
+def test_descriptors_have_the_browser_extractor_shape(ats_server):
+    fields = FormAnalyzer(session=requests.Session()).analyze(f"{ats_server}/greenhouse.html")["fields"]
+    first_name = next(field for field in fields if field["id"] == "first_name")
+    assert set(first_name) == {"tag", "type", "id", "name", "label", "aria_label", "placeholder",
+                               "autocomplete", "required"}
+    assert first_name["label"].startswith("First Name")
+
+
+def test_job_page_without_a_form_is_incomplete(ats_server):
+    result = FormAnalyzer(session=requests.Session()).analyze(f"{ats_server}/careers.html")
+    assert not result["complete"]
+    assert result["fields"] == []
+
+
+def test_failed_fetch_is_incomplete(ats_server):
+    result = FormAnalyzer(session=requests.Session()).analyze(f"{ats_server}/missing.html")
+    assert not result["complete"]
+    assert result["error"]
+
+
+def test_single_page_app_needs_the_browser():
+    result = analyze_html('<form><input name="q"></form><div id="root"></div>')
+    assert not result["complete"]
+    assert result["reasons"] == ["empty #root mount point (single-page app)"]
+
+
+def test_client_rendered_ats_needs_the_browser():
+    result = analyze_html('<form><input name="q"></form>', "https://acme.wd5.myworkdayjobs.com/en-US/careers/job/1")
+    assert not result["complete"]
+
+
+@pytest.mark.parametrize("url", [
+    "http://127.0.0.1/", "http://localhost:8000/", "http://10.0.0.5/", "http://169.254.169.254/latest/meta-data/",
+    "http://[::1]/", "file:///etc/passwd", "gopher://example.com/",
+])
+def test_private_and_non_http_urls_are_refused(monkeypatch, url):
+    monkeypatch.setattr(apply_links, "ALLOW_PRIVATE_URLS", False)
+    with pytest.raises(UnsafeURL):
+        check_public_url(url)
+
+
+def test_public_session_refuses_loopback(monkeypatch, ats_server):
+    monkeypatch.setattr(apply_links, "ALLOW_PRIVATE_URLS", False)
+    with pytest.raises(UnsafeURL):
+        public_session().get(f"{ats_server}/greenhouse.html")
+    result = FormAnalyzer(session=public_session()).analyze(f"{ats_server}/greenhouse.html")
+    assert result["error"] and not result["fields"]
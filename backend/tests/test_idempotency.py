@@ -0,0 +1,60 @@
+import asyncio
+
+from idempotency import IdempotencyRegistry, SqliteIdempotencyStore, idempotency_key
+
+
+def test_keys_are_scoped_to_the_user():
+    ada = {"email": "Ada@Example.com"}
+    assert idempotency_key(ada, "1", "u") == idempotency_key({"email": "ada@example.com"}, "1", "u")
+    assert idempotency_key(ada, "1", "u") != idempotency_key(ada, "2", "u")
+    assert idempotency_key(ada, "1", "u", "k") != idempotency_key({"email": "eve@example.com"}, "1", "u", "k")
+
+
+def test_duplicates_share_one_run():
+    registry = IdempotencyRegistry()
+    runs = []
+
+    async def run():
+        runs.append(1)
+        await asyncio.sleep(0.05)
+        return {"success": True}
+
+    async def main():
+        return await asyncio.gather(registry.execute("k", run), registry.execute("k", run))
+
+    results = asyncio.run(main())
+    assert len(runs) == 1
+    assert sorted(deduplicated for _, deduplicated in results) == [False, True]
+    assert asyncio.run(registry.execute("k", run)) == ({"success": True}, True)
+
+
+def test_failures_are_not_replayed():
+    registry = IdempotencyRegistry()
+
+    async def run():
+        return {"success": False}
+
+    asyncio.run(registry.execute("k", run))
+    assert registry.completed == {}
+
+
+def test_expired_results_are_evicted_when_a_new_one_is_recorded():
+    registry = IdempotencyRegistry(ttl=60)
+
+    async def run():
+        return {"success": True}
+
+    asyncio.run(registry.execute("old", run))
+    result, finished_at = registry.completed["old"]
+    registry.completed["old"] = (result, finished_at - 120)
+    asyncio.run(registry.execute("new", run))
+    assert list(registry.completed) == ["new"]
+
+
+def test_store_claims_are_shared(tmp_path):
+    path = str(tmp_path / "idempotency.db")
+    first, second = SqliteIdempotencyStore(path), SqliteIdempotencyStore(path)
+    assert first.claim("k") == ("claimed", None)
+    assert second.claim("k") == ("running", None)
+    first.finish("k", {"success": True}, True)
+    assert second.claim("k") == ("done", {"success": True})
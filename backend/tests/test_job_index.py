@@ -0,0 +1,62 @@
+from datetime import date
+
+from job_index import JobIndex, canonical_url, fingerprint, tokenize
+
+JOBS = [
+    {"id": "1", "positionName": "Python Developer", "company": "Acme", "location": "Boston, MA",
+     "description": "Django APIs", "jobType": ["Full-time"], "postingDateParsed": "2026-01-10T00:00:00Z",
+     "url": "https://www.example.com/jobs/1?utm_source=x"},
+    {"id": "2", "positionName": "Frontend Engineer", "company": "Beta", "location": "Remote",
+     "description": "React and some Python tooling", "jobType": "Part-time", "postedAt": "2026-02-01",
+     "url": "https://example.com/jobs/2", "skills": [0, 20]},
+    {"id": "3", "positionName": "Data Analyst", "company": "Gamma", "location": "Remote",
+     "description": "SQL dashboards", "postedAt": "30+ days ago", "url": "https://example.com/jobs/3"},
+]
+
+
+def index():
+    jobs = JobIndex()
+    assert jobs.add_many(JOBS) == 3
+    return jobs
+
+
+def test_tokens_and_urls_are_normalized():
+    assert tokenize("The C++ and Node.js role") == ["c++", "node.js", "role"]
+    assert canonical_url("http://WWW.Example.com/jobs/1/?gh_src=a&b=2&utm_medium=x") == "https://example.com/jobs/1?b=2"
+    assert fingerprint({"company": "Acme, Inc.", "positionName": "Dev", "location": "Boston"}) == "acme inc|dev|boston"
+    assert fingerprint({"company": "Acme"}) is None
+
+
+def test_duplicates_are_merged():
+    jobs = index()
+    # Same posting under another id: tracking variant of its URL
+    assert not jobs.add({"id": "9", "url": "https://example.com/jobs/1", "salary": "$100k"})
+    # And by fingerprint
+    assert not jobs.add({"id": "8", "company": "ACME", "positionName": "python developer", "location": "Boston MA"})
+    assert len(jobs) == 3
+    merged = jobs.get("1")
+    assert merged["salary"] == "$100k" and merged["id"] == "1"
+
+
+def test_search_ranks_title_hits_first_and_applies_filters():
+    jobs = index()
+    assert [job["id"] for job in jobs.search("python")] == ["1", "2"]
+    assert [job["id"] for job in jobs.search(location="remote")] == ["2", "3"]
+    assert [job["id"] for job in jobs.search(job_type="part-time")] == ["2"]
+    assert [job["id"] for job in jobs.search(posted_after=date(2026, 1, 15))] == ["2"]
+    assert [job["id"] for job in jobs.search(posted_before="2026-01-31")] == ["1"]
+    assert [job["id"] for job in jobs.search(skills=[20])] == ["2"]
+    assert jobs.search("python rust") == []
+    assert len(jobs.search(limit=1)) == 1
+
+
+def test_generation_changes_with_every_add_and_index_round_trips(tmp_path):
+    jobs = index()
+    generation = jobs.generation
+    jobs.add({"id": "4", "positionName": "Go Developer"})
+    assert jobs.generation == generation + 1
+    path = str(tmp_path / "jobs.json")
+    jobs.save(path)
+    loaded = JobIndex.load(path)
+    assert len(loaded) == 4 and loaded.instance != jobs.instance
+    assert [job["id"] for job in loaded.search("python")] == ["1", "2"]
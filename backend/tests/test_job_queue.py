@@ -0,0 +1,115 @@
+import sqlite3
+import time
+
+import pytest
+
+from job_queue import SqliteQueue, StatusMap
+from worker import ApplicationWorker
+
+PAYLOAD = {"job_id": "job-1", "user": {"email": "ada@example.com"}}
+
+
+@pytest.fixture
+def queue(tmp_path):
+    return SqliteQueue(str(tmp_path / "queue.db"), max_attempts=2)
+
+
+def stored_payload(queue, task_id):
+    with sqlite3.connect(queue.path) as db:
+        return db.execute("SELECT payload FROM tasks WHERE id = ?", (task_id,)).fetchone()[0]
+
+
+def test_lease_hands_out_tasks_oldest_first_and_once(queue):
+    first = queue.enqueue("job-1", PAYLOAD)
+    second = queue.enqueue("job-2", PAYLOAD)
+    assert queue.lease("w1").id == first
+    assert queue.lease("w2").id == second
+    assert queue.lease("w3") is None
+
+
+def test_finish_records_the_result_and_clears_the_payload(queue):
+    task_id = queue.enqueue("job-1", PAYLOAD)
+    task = queue.lease("w1")
+    assert task.payload == PAYLOAD and task.attempts == 1
+    assert queue.finish(task_id, "w1", {"success": True}, True)
+    assert queue.result(task_id) == ("done", {"success": True})
+    assert stored_payload(queue, task_id) == "null"
+
+
+def test_expired_lease_is_requeued_and_stale_finish_is_dropped(queue):
+    task_id = queue.enqueue("job-1", PAYLOAD)
+    queue.lease("w1", lease=0.05)
+    time.sleep(0.1)
+    task = queue.lease("w2")
+    assert task.id == task_id and task.attempts == 2
+    assert queue.get_status("job-1")["status"] == "queued"
+    # w1 comes back after its lease ran out: its result belongs to nobody now
+    assert not queue.finish(task_id, "w1", {"success": False}, False)
+    assert queue.heartbeat("w1", [task_id]) == set()
+    assert queue.heartbeat("w2", [task_id]) == {task_id}
+    assert queue.finish(task_id, "w2", {"success": True}, True)
+    assert queue.result(task_id) == ("done", {"success": True})
+
+
+def test_heartbeat_keeps_the_lease(queue):
+    task_id = queue.enqueue("job-1", PAYLOAD)
+    queue.lease("w1", lease=0.2)
+    for _ in range(3):
+        time.sleep(0.1)
+        assert queue.heartbeat("w1", [task_id], lease=0.2) == {task_id}
+    assert queue.lease("w2") is None
+
+
+def test_fails_after_max_attempts(queue):
+    task_id = queue.enqueue("job-1", PAYLOAD)
+    for worker in ("w1", "w2"):
+        queue.lease(worker, lease=0.01)
+        time.sleep(0.05)
+    assert queue.lease("w3") is None
+    state, result = queue.result(task_id)
+    assert state == "failed" and not result["success"]
+    assert queue.get_status("job-1")["status"] == "failed"
+    assert stored_payload(queue, task_id) == "null"
+
+
+def test_finished_tasks_are_deleted_after_keep_finished(tmp_path):
+    queue = SqliteQueue(str(tmp_path / "queue.db"), keep_finished=0.05)
+    task_id = queue.enqueue("job-1", PAYLOAD)
+    queue.lease("w1")
+    queue.finish(task_id, "w1", {"success": True}, True)
+    time.sleep(0.1)
+    queue.lease("w1")
+    assert queue.result(task_id) == (None, None)
+
+
+def test_status_map(queue):
+    statuses = StatusMap(queue)
+    statuses["job-1"] = {"status": "processing"}
+    assert statuses["job-1"] == {"status": "processing"}
+    assert list(statuses) == ["job-1"] and len(statuses) == 1
+    assert statuses.get("job-2") is None
+    del statuses["job-1"]
+    with pytest.raises(KeyError):
+        statuses["job-1"]
+
+
+def test_worker_runs_queued_tasks(queue):
+    seen = []
+
+    def handler(payload):
+        seen.append(payload["job_id"])
+        return {"success": payload["job_id"] != "job-2"}
+
+    worker = ApplicationWorker(queue, slots=2, lease=5, poll_interval=0.02, handler=handler, worker_id="w1")
+    tasks = [queue.enqueue(job_id, {**PAYLOAD, "job_id": job_id}) for job_id in ("job-1", "job-2", "job-3")]
+    worker.start()
+    try:
+        deadline = time.time() + 5
+        while time.time() < deadline and any(queue.result(t)[0] not in ("done", "failed") for t in tasks):
+            time.sleep(0.02)
+    finally:
+        worker.stop()
+    assert sorted(seen) == ["job-1", "job-2", "job-3"]
+    assert [queue.result(t)[0] for t in tasks] == ["done", "failed", "done"]
+    assert worker.completed == 2 and worker.failed == 1
+    assert queue.summary()["workers"] == {}
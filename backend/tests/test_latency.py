@@ -0,0 +1,59 @@
+import pytest
+from selenium.common.exceptions import TimeoutException
+
+from latency import CEILINGS, DEFAULT_WAITS, FLOORS, LatencyTracker, host_of
+
+
+def test_host_of_strips_www():
+    assert host_of("https://www.example.com/jobs/1") == "example.com"
+    assert host_of(None) == "unknown"
+
+
+def test_default_budget_until_enough_samples():
+    tracker = LatencyTracker(min_samples=5)
+    for _ in range(4):
+        tracker.record("fast.example", "visible", 0.01)
+    assert tracker.budget("fast.example", "visible") == DEFAULT_WAITS["visible"]
+
+
+def test_learned_budget_is_clamped():
+    tracker = LatencyTracker(min_samples=5, margin=3.0)
+    for _ in range(5):
+        tracker.record("fast.example", "visible", 0.01)
+        tracker.record("mid.example", "visible", 1.0)
+        tracker.record("slow.example", "visible", 30.0)
+    assert tracker.budget("fast.example", "visible") == FLOORS["visible"]
+    assert tracker.budget("mid.example", "visible") == pytest.approx(3.0)
+    assert tracker.budget("slow.example", "visible") == CEILINGS["visible"]
+
+
+def test_successful_waits_are_recorded():
+    tracker = LatencyTracker()
+    assert tracker.wait(object(), "visible", lambda driver: "ready", host="example.com") == "ready"
+    assert tracker.stats("example.com", "visible")[2] == 1
+
+
+def test_timeouts_grow_the_budget_up_to_the_ceiling():
+    tracker = LatencyTracker(min_samples=5, margin=3.0)
+    for _ in range(5):
+        tracker.record("flaky.example", "visible", 0.01)
+    budgets = [tracker.budget("flaky.example", "visible")]
+    with pytest.raises(TimeoutException):
+        tracker.wait(object(), "visible", lambda driver: False, host="flaky.example")
+    budgets.append(tracker.budget("flaky.example", "visible"))
+    assert budgets == [FLOORS["visible"], pytest.approx(FLOORS["visible"] * 3)]
+    assert tracker.timeouts[("flaky.example", "visible")] == 1
+
+    # Further censored samples at the (growing) budget stop at the ceiling
+    for _ in range(5):
+        tracker.record("flaky.example", "visible", tracker.budget("flaky.example", "visible"))
+    assert tracker.budget("flaky.example", "visible") == CEILINGS["visible"]
+    assert tracker.summary()["flaky.example"]["visible"]["timeouts"] == 1
+
+
+def test_samples_round_trip_through_a_file(tmp_path):
+    path = str(tmp_path / "latency.json")
+    tracker = LatencyTracker(path=path)
+    tracker.record("example.com", "page_load", 1.5)
+    tracker.save()
+    assert LatencyTracker(path=path).stats("example.com", "page_load") == (1.5, 1.5, 1)
@@ -0,0 +1,56 @@
+import time
+import threading
+from types import SimpleNamespace
+
+from prefetch import FormPrefetcher, prefetch_group
+from rate_limits import AdmissionController
+
+
+class FakeResolver:
+    def resolve(self, job_id, url):
+        return {"url": url, "is_form": True, "ats": "greenhouse", "error": None}
+
+
+class FakeAnalyzer:
+    def analyze(self, url):
+        return {"fields": [{"tag": "input", "type": "email", "label": "Email"}], "complete": True, "error": None}
+
+
+def request_from(client_header=None, admission=None):
+    headers = [(b"x-client-id", client_header.encode())] if client_header else []
+    return SimpleNamespace(app=SimpleNamespace(state=SimpleNamespace(admission=admission)),
+                           scope={"headers": headers, "client": ("203.0.113.7", 5000)})
+
+
+def test_groups_ignore_client_ids_unless_trusted():
+    assert prefetch_group(request_from("victim")) == "203.0.113.7"
+    assert prefetch_group(request_from("victim", AdmissionController())) == "203.0.113.7"
+    assert prefetch_group(request_from("victim", AdmissionController(trust_client_id=True))) == "victim"
+
+
+def test_prefetched_schemas_are_taken_once_ready():
+    prefetcher = FormPrefetcher(FakeResolver(), FakeAnalyzer(), top_n=2)
+    try:
+        jobs = [{"id": "a", "url": "https://example.com/a"}, {"id": "b", "url": "https://example.com/b"},
+                {"id": "c", "url": "https://example.com/c"}]
+        assert prefetcher.prefetch(jobs, "client") == 2
+        deadline = time.time() + 5
+        while prefetcher.summary()["completed"] < 2 and time.time() < deadline:
+            time.sleep(0.01)
+        entry = prefetcher.take("a", "client")
+        assert entry["complete"] and entry["fields"][0]["type"] == "email"
+        assert prefetcher.take("c") is None
+        assert prefetcher.summary()["hits"] == 1
+    finally:
+        prefetcher.shutdown()
+
+
+def test_expired_schemas_are_swept_on_insert():
+    prefetcher = FormPrefetcher(FakeResolver(), FakeAnalyzer(), ttl=60)
+    try:
+        prefetcher._prefetch_job("old", "https://example.com/old", threading.Event())
+        prefetcher.schemas["old"]["prefetched_at"] -= 120
+        prefetcher._prefetch_job("new", "https://example.com/new", threading.Event())
+        assert set(prefetcher.schemas) == {"new"}
+    finally:
+        prefetcher.shutdown()
@@ -0,0 +1,118 @@
+import os
+
+import pytest
+
+from profile_store import ProfileNotFound, ProfileStore
+
+PROFILE = {"firstName": " Ada ", "lastName": "Lovelace", "email": "Ada@Example.com", "phone": "",
+           "city": "Boston", "state": "MA"}
+PDF = b"%PDF-1.4\n% resume\n%%EOF\n"
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ProfileStore(str(tmp_path / "profiles"), cache_size=2)
+
+
+def test_profiles_are_normalized_and_versioned(store):
+    first = store.put("ada", PROFILE)
+    assert first.version == 1
+    assert first.profile["firstName"] == "Ada" and first.profile["email"] == "ada@example.com"
+    assert "phone" not in first.profile
+    assert first.values["fullName"] == "Ada Lovelace" and first.values["location"] == "Boston, MA"
+    # Same content after normalization: no new version
+    assert store.put("ada", {**PROFILE, "firstName": "Ada"}).version == 1
+    second = store.put("ada", {**PROFILE, "city": "Cambridge"})
+    assert second.version == 2
+    assert store.get("ada").version == 2
+    assert store.get("ada", 1).profile["city"] == "Boston"
+    assert [v["version"] for v in store.versions("ada")] == [1, 2]
+
+
+def test_missing_profiles_and_versions(store):
+    with pytest.raises(ProfileNotFound):
+        store.get("nobody")
+    store.put("ada", PROFILE)
+    with pytest.raises(ProfileNotFound):
+        store.get("ada", 5)
+
+
+def test_client_sent_resume_path_is_dropped(store):
+    saved = store.put("ada", {**PROFILE, "resumePath": "/etc/passwd"})
+    assert "resumePath" not in saved.profile
+    assert saved.resume_path is None
+
+
+def test_resumes_are_stored_once_by_content(store):
+    digest = store.put_resume(PDF, "cv.PDF")
+    assert digest.endswith(".pdf")
+    assert store.put_resume(PDF, "other.pdf") == digest
+    saved = store.put("ada", PROFILE, digest)
+    assert saved.resume_digest == digest
+    with open(saved.resume_path, "rb") as f:
+        assert f.read() == PDF
+    # Later versions keep the resume unless given another one
+    assert store.put("ada", {**PROFILE, "city": "Cambridge"}).resume_digest == digest
+
+
+@pytest.mark.parametrize("data, filename, message", [
+    (PDF, "resume.exe", "Unsupported resume type"),
+    (b"", "resume.pdf", "Empty resume"),
+    (b"x" * (11 * 1024 * 1024), "resume.pdf", "larger than"),
+])
+def test_resume_validation(store, data, filename, message):
+    with pytest.raises(ValueError, match=message):
+        store.put_resume(data, filename)
+
+
+def test_unknown_or_unsafe_resume_digests_are_rejected(store):
+    with pytest.raises(ValueError, match="Unknown resume"):
+        store.put("ada", PROFILE, "0" * 64 + ".pdf")
+    assert store.resume_path("../../profiles.db") is None
+
+
+def test_versions_are_shared_between_store_instances(store):
+    store.put("ada", PROFILE)
+    other = ProfileStore(store.directory)
+    assert other.get("ada").profile == store.get("ada").profile
+
+
+def test_owner_tokens(store):
+    token = store.issue_token("ada")
+    assert token and store.owns("ada", token)
+    assert not store.owns("ada", "guess") and not store.owns("ada", None)
+    assert store.issue_token("ada") is None
+    # A failed first save gives the id back, but never one with saved versions
+    store.release("ada")
+    token = store.issue_token("ada")
+    store.put("ada", PROFILE)
+    store.release("ada")
+    assert store.owns("ada", token)
+    assert store.issue_token("grace") and os.path.exists(store.path)
+
+
+def test_profile_routes_check_the_owner_token(api):
+    created = api.put("/profiles/owner-test", json={"firstName": "Ada", "email": "ada@example.com"})
+    assert created.status_code == 200
+    token = created.json()["profileToken"]
+    mine = {"X-Profile-Token": token}
+
+    assert api.get("/profiles/owner-test").status_code == 404
+    assert api.get("/profiles/owner-test", headers={"X-Profile-Token": "guess"}).status_code == 404
+    assert api.get("/profiles/owner-test", headers=mine).json()["profile"]["firstName"] == "Ada"
+
+    assert api.put("/profiles/owner-test", json={"firstName": "Eve"}).status_code == 403
+    assert api.post("/profiles/owner-test/resume", content=PDF).status_code == 403
+    updated = api.put("/profiles/owner-test", json={"firstName": "Ada", "city": "Boston"}, headers=mine)
+    assert updated.json()["version"] == 2 and "profileToken" not in updated.json()
+    uploaded = api.post("/profiles/owner-test/resume?filename=cv.pdf", content=PDF, headers=mine)
+    assert uploaded.json()["resumeDigest"].endswith(".pdf")
+
+    job = {"id": "job-1", "company": "Acme", "positionName": "Engineer", "url": "https://example.com/jobs/1"}
+    response = api.post("/apply", json={"job": job, "profileId": "owner-test"})
+    assert response.status_code == 404
+
+
+def test_failed_first_save_does_not_lock_the_id(api):
+    assert api.post("/profiles/fresh-id/resume?filename=cv.exe", content=PDF).status_code == 400
+    assert "profileToken" in api.put("/profiles/fresh-id", json={"firstName": "Ada"}).json()
@@ -0,0 +1,56 @@
+import pytest
+
+from project_index import ProjectIndex, build_index, project_passages, section_name
+
+PROJECTS = {
+    "tadpool": {
+        "title": "Tadpool",
+        "Inspiration": "Swimming coaches track laps on paper clipboards.",
+        "What it does": "Tadpool counts swimming laps with a waterproof sensor and a React dashboard.",
+        "What's next for Tadpool": "Support open water swimming.",
+        "built_with": ["react"],
+    },
+    "ledger": {
+        "title": "Ledger",
+        "What it does": "A budgeting app that reads receipts with OCR and categorizes spending.",
+        "Challenges we ran into": "Receipts photographed at odd angles broke the OCR pipeline.",
+    },
+}
+
+
+def test_passages_skip_non_prose_and_fold_section_names():
+    passages = list(project_passages(PROJECTS))
+    assert ("tadpool", "What's next", "Tadpool", "Support open water swimming.") in passages
+    assert all(section != "built_with" for _, section, _, _ in passages)
+    assert section_name("What's next for Ledger ") == "What's next"
+
+
+def test_search_ranks_the_matching_passage_first():
+    index = ProjectIndex.from_projects(PROJECTS)
+    hits = index.search("receipts OCR")
+    assert hits[0]["slug"] == "ledger" and hits[0]["score"] > hits[-1]["score"] >= 0
+    assert index.search("kubernetes") == []
+
+
+def test_answers_only_project_questions_with_confident_passages():
+    index = ProjectIndex.from_projects(PROJECTS)
+    answer = index.answer("Describe a technical challenge with receipts OCR you solved", min_score=0.5)
+    assert answer.startswith("Ledger: ")
+    assert index.answer("Why do you want to work here? receipts OCR", min_score=0.5) is None
+    assert index.answer("Tell us about a project you built", min_score=100) is None
+    assert index.answer("Describe a project: swimming laps sensor", max_chars=30, min_score=0.5).endswith("...")
+
+
+def test_loads_memory_mapped_from_a_file(tmp_path):
+    path = tmp_path / "projects.bm25"
+    path.write_bytes(build_index(PROJECTS))
+    index = ProjectIndex.load(str(path))
+    try:
+        assert index.search("swimming laps", k=1)[0]["slug"] == "tadpool"
+    finally:
+        index.close()
+
+
+def test_rejects_other_files():
+    with pytest.raises(ValueError):
+        ProjectIndex(b"\0" * 64)
@@ -0,0 +1,70 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from rate_limits import AdmissionController, AdmissionMiddleware, MemoryBuckets, SqliteBuckets, client_id, refill
+
+
+def test_refill_is_capped_at_the_burst():
+    assert refill(0, 0, 30, per_minute=6, burst=3) == 3
+    assert refill(0, 0, 10, per_minute=6, burst=3) == pytest.approx(1)
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def buckets(request, tmp_path):
+    return MemoryBuckets() if request.param == "memory" else SqliteBuckets(str(tmp_path / "buckets.db"))
+
+
+def test_bucket_allows_the_burst_then_refills(buckets):
+    bucket = [("k", 6, 2)]
+    assert buckets.take(bucket, now=100) == (None, 0)
+    assert buckets.take(bucket, now=100) == (None, 0)
+    key, retry_after = buckets.take(bucket, now=100)
+    assert key == "k" and retry_after == pytest.approx(10)
+    assert buckets.take(bucket, now=110) == (None, 0)
+
+
+def test_tokens_are_taken_from_every_bucket_or_none(buckets):
+    assert buckets.take([("user", 60, 2), ("global", 60, 1)], now=0) == (None, 0)
+    assert buckets.take([("user", 60, 2), ("global", 60, 1)], now=0)[0] == "global"
+    # The rejected request didn't spend the user's second token
+    assert buckets.take([("user", 60, 2)], now=0) == (None, 0)
+    assert buckets.take([("user", 60, 2)], now=0)[0] == "user"
+
+
+def test_controller_separates_users_and_the_global_limit():
+    controller = AdmissionController({"apply": {"user": (60, 1), "global": (60, 2)}})
+    assert controller.admit("apply", "a") == (None, 0)
+    assert controller.admit("apply", "a")[0] == "user"
+    assert controller.admit("apply", "b") == (None, 0)
+    assert controller.admit("apply", "c")[0] == "global"
+    assert controller.summary()["stats"]["apply"] == {"admitted": 2, "rejected": 2}
+
+
+def test_client_ids_are_only_trusted_when_configured():
+    scope = {"headers": [(b"x-client-id", b"gateway-user")], "client": ("203.0.113.7", 1234)}
+    assert client_id(scope) == "203.0.113.7"
+    assert client_id(scope, trust_header=True) == "gateway-user"
+    assert client_id({"headers": []}) == "anonymous"
+
+
+def test_middleware_answers_429_with_retry_after():
+    app = FastAPI()
+
+    @app.post("/apply")
+    def apply():
+        return {"ok": True}
+
+    @app.get("/health")
+    def health():
+        return {"ok": True}
+
+    controller = AdmissionController({"apply": {"user": (6, 1), "global": (60, 10)}})
+    app.add_middleware(AdmissionMiddleware, controller=controller)
+    client = TestClient(app)
+    assert client.post("/apply").status_code == 200
+    rejected = client.post("/apply")
+    assert rejected.status_code == 429
+    assert rejected.json()["scope"] == "user"
+    assert int(rejected.headers["retry-after"]) >= 1
+    assert client.get("/health").status_code == 200
@@ -0,0 +1,67 @@
+import os
+import threading
+
+import pytest
+
+import resource_monitor
+from resource_monitor import BrowserBudgetExceeded, ResourceMonitor
+
+
+class FakeDriver:
+    def __init__(self, pid):
+        self.service = type("Service", (), {"process": type("Process", (), {"pid": pid})()})()
+        self.quit_called = False
+
+    def quit(self):
+        self.quit_called = True
+
+
+@pytest.fixture
+def monitor():
+    monitor = ResourceMonitor(budget_mb=1000, session_estimate_mb=400, interval=60)
+    yield monitor
+    monitor.stop()
+
+
+def test_sessions_are_rejected_once_the_budget_is_committed(monitor):
+    monitor.acquire("a")
+    monitor.acquire("b")
+    with pytest.raises(BrowserBudgetExceeded, match="800 of 1000 MB"):
+        monitor.acquire("c")
+    assert monitor.summary()["rejected"] == 1
+    monitor.release("a")
+    monitor.acquire("c")
+
+
+def test_acquire_waits_for_a_release(monitor):
+    monitor.acquire("a")
+    monitor.acquire("b")
+    threading.Timer(0.1, monitor.release, ("a",)).start()
+    monitor.acquire("c", timeout=5)
+    assert set(monitor.sessions) == {"b", "c"}
+
+
+def test_sampling_measures_the_process_tree(monitor):
+    monitor.acquire("self")
+    monitor.track("self", FakeDriver(os.getpid()))
+    monitor.sample()
+    usage = monitor.usage("self")
+    assert usage["rss_mb"] > 0 and usage["processes"] >= 1
+    # Measured sessions count at what they use, and the estimate moves toward it
+    assert monitor.summary()["committed_mb"] == usage["rss_mb"]
+    assert monitor.session_estimate_mb != 400
+
+
+def test_idle_sessions_are_closed(monitor, monkeypatch):
+    monkeypatch.setattr(resource_monitor, "process_tree_usage",
+                        lambda pid: {"rss_mb": 100.0, "cpu_s": 1.0, "processes": 3})
+    idle = []
+    monitor.idle_timeout = 30
+    monitor.on_idle = idle.append
+    driver = FakeDriver(12345)
+    monitor.acquire("a")
+    monitor.track("a", driver)
+    monitor.sessions["a"].last_active -= 60
+    monitor.sample()
+    assert idle == ["a"] and driver.quit_called
+    assert monitor.usage("a") is None
@@ -0,0 +1,92 @@
+import base64
+import io
+import os
+import time
+
+import pytest
+
+from screenshots import ScreenshotStore
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+
+def png(color):
+    if Image is None:
+        pytest.skip("Pillow is not installed")
+    out = io.BytesIO()
+    Image.new("RGB", (640, 400), color).save(out, format="PNG")
+    return base64.b64encode(out.getvalue()).decode()
+
+
+class FakeDriver:
+    def __init__(self, data):
+        self.data = data
+
+    def execute_cdp_cmd(self, command, params):
+        assert command == "Page.captureScreenshot"
+        return {"data": self.data}
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = ScreenshotStore(str(tmp_path / "shots"))
+    yield store
+    store.shutdown()
+
+
+def test_capture_stores_a_screenshot_and_thumbnail(store):
+    store.capture(FakeDriver(png("red")), "job-1:token")
+    entry = store.get("job-1:token")
+    assert entry["format"] == "webp" and entry["thumbnail"]
+    assert store.path_for(entry["digest"]).endswith(".webp")
+    assert store.path_for(entry["digest"], thumbnail=True).endswith(".thumb.webp")
+
+
+def test_identical_screenshots_are_stored_once(store):
+    data = png("blue")
+    store.capture(FakeDriver(data), "a").result()
+    store.capture(FakeDriver(data), "b").result()
+    assert store.get("a")["digest"] == store.get("b")["digest"]
+    assert store.usage()["files"] == 2  # One image and its thumbnail
+
+
+def test_failed_encode_returns_none_and_is_forgotten(store):
+    store.capture(FakeDriver(base64.b64encode(b"not an image").decode()), "bad")
+    assert store.get("bad") is None
+    assert "bad" not in store.pending
+
+
+def test_slow_encode_returns_none(store, monkeypatch):
+    monkeypatch.setattr(store, "_store", lambda key, data: time.sleep(0.5))
+    store.capture(FakeDriver(""), "slow")
+    assert store.get("slow", timeout=0.05) is None
+    assert "slow" not in store.pending
+
+
+def test_eviction_forgets_the_entries_of_deleted_files(store):
+    store.capture(FakeDriver(png("green")), "old").result()
+    store.retention = 0
+    time.sleep(0.01)
+    store.evict()
+    assert store.entries == {}
+    assert store.get("old") is None
+    assert store.usage()["files"] == 0
+
+
+def test_only_alphanumeric_digests_are_looked_up(store):
+    assert store.path_for("../../etc/passwd") is None
+    assert not os.listdir(os.path.join(store.directory))
+
+
+def test_application_screenshots_need_their_token(api):
+    import apply_api
+    apply_api.screenshot_store.capture(FakeDriver(png("white")), apply_api.screenshot_key("job-1", "s3cret")).result()
+    response = api.get("/apply/job-1/screenshot/s3cret")
+    assert response.status_code == 200
+    assert response.headers["cache-control"] == "private, no-store"
+    assert api.get("/apply/job-1/screenshot/guess").status_code == 404
+    assert api.get("/apply/job-2/screenshot/s3cret").status_code == 404
+    assert api.get("/apply/job-1/screenshot").status_code == 404
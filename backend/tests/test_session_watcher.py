@@ -0,0 +1,71 @@
+import pytest
+
+from session_watcher import SessionWatcher
+
+
+class FakeDriver:
+    """Just enough WebDriver for the watcher: window handles and quit()."""
+
+    def __init__(self):
+        self.open = True
+        self.probes = 0
+        self.quit_called = False
+
+    @property
+    def window_handles(self):
+        self.probes += 1
+        return ["main"] if self.open else []
+
+    def quit(self):
+        self.quit_called = True
+
+
+@pytest.fixture
+def watcher():
+    # Sweeps are driven by hand; the background thread only starts and waits
+    watcher = SessionWatcher(interval=60, probe_budget=2)
+    yield watcher
+    watcher.stop()
+
+
+def test_closed_windows_are_reported_once_and_quit(watcher):
+    closed = []
+    drivers = {key: FakeDriver() for key in ("a", "b")}
+    for key, driver in drivers.items():
+        watcher.register(key, driver, closed.append)
+    assert watcher.sweep() == []
+    drivers["b"].open = False
+    assert watcher.sweep() == ["b"]
+    assert closed == ["b"] and drivers["b"].quit_called
+    assert watcher.sweep() == [] and len(watcher) == 1
+
+
+def test_probes_per_sweep_are_bounded_and_round_robin(watcher):
+    drivers = [FakeDriver() for _ in range(5)]
+    for n, driver in enumerate(drivers):
+        watcher.register(n, driver, lambda key: None)
+    watcher.sweep()
+    assert sum(driver.probes for driver in drivers) == 2
+    watcher.sweep()
+    watcher.sweep()
+    assert all(driver.probes >= 1 for driver in drivers)
+
+
+def test_tab_sessions_use_their_probe_and_keep_the_browser(watcher):
+    driver, closed = FakeDriver(), []
+    tab_closed = [False]
+    watcher.register("tab", driver, closed.append, probe=lambda: tab_closed[0])
+    assert watcher.sweep() == []
+    tab_closed[0] = True
+    assert watcher.sweep() == ["tab"]
+    assert driver.probes == 0 and not driver.quit_called
+
+
+def test_callback_errors_dont_stop_the_sweep(watcher):
+    def fail(key):
+        raise RuntimeError("boom")
+
+    driver = FakeDriver()
+    driver.open = False
+    watcher.register("a", driver, fail)
+    assert watcher.sweep() == ["a"] and driver.quit_called
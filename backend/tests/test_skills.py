@@ -0,0 +1,44 @@
+import pytest
+
+from skills import SkillTagger, skill_tagger
+
+
+def names(skill_ids):
+    return set(skill_tagger.names_for(skill_ids))
+
+
+def test_whole_words_and_multi_word_aliases():
+    found = names(skill_tagger.tag_text("Good React Native and node.js skills, some C++ and golang"))
+    assert found == {"React Native", "React", "Node.js", "C++", "Go"}
+
+
+def test_ambiguous_aliases_only_count_as_tags():
+    assert skill_tagger.tag_text("Ready to go, excel at R&D") == []
+    assert names(skill_tagger.tag_tags(["go", "Express", "next", "unknown thing", "postgres"])) == {
+        "Go", "Express", "Next.js", "PostgreSQL"}
+
+
+def test_failure_links_find_overlapping_aliases():
+    tagger = SkillTagger([("A B C", ()), ("B C D", ()), ("C", ())], tag_only={})
+    assert tagger.tag_text("a b c d") == [0, 1, 2]
+    assert tagger.tag_text("a b x c") == [2]
+
+
+def test_jobs_and_projects_are_tagged():
+    job = skill_tagger.tag_job({"positionName": "Python Engineer", "description": "Django and PostgreSQL"})
+    assert names(job["skills"]) == {"Python", "Django", "PostgreSQL"}
+    project = {"title": "Rust", "url": "https://devpost.com/software/rust", "built_with": ["flask"],
+               "description": "A TypeScript frontend"}
+    assert names(skill_tagger.tag_project(project)) == {"Flask", "TypeScript"}
+
+
+def test_ids_for_accepts_aliases_and_rejects_unknown_names():
+    assert skill_tagger.names_for(skill_tagger.ids_for(["nextjs", " Next.js "])) == ["Next.js", "Next.js"]
+    with pytest.raises(ValueError, match="Unknown skill"):
+        skill_tagger.ids_for(["cobolscript"])
+
+
+def test_skills_endpoint_lists_ids_in_order(api):
+    skills = api.get("/skills").json()
+    assert skills[0] == {"id": 0, "name": "Python"}
+    assert [skill["id"] for skill in skills] == list(range(len(skills)))
@@ -0,0 +1,50 @@
+import pytest
+
+from fake_apify import FakeApifyClient, make_fake_items
+from search_api import JobStreamTimeout, stream_jobs
+
+
+def fast_client(items=None, **kwargs):
+    options = {"first_delay": 0.05, "batch_size": 3, "batch_interval": 0.02, **kwargs}
+    return FakeApifyClient(items if items is not None else make_fake_items(10), **options)
+
+
+def test_streams_every_item_once_in_order():
+    client = fast_client()
+    jobs = list(stream_jobs(client, "Software Engineer", "Remote", max_items=10, poll_interval=0.01))
+    assert [job["id"] for job in jobs] == [f"fake{i:06d}" for i in range(10)]
+    assert all(job["skills"] for job in jobs)
+    run = next(iter(client.runs.values()))
+    assert run.status == "SUCCEEDED"
+
+
+def test_enough_aborts_the_run():
+    client = fast_client(make_fake_items(30), batch_interval=0.2)
+    jobs = list(stream_jobs(client, "Software Engineer", "Remote", max_items=30, enough=4, poll_interval=0.01))
+    assert len(jobs) == 4
+    run = next(iter(client.runs.values()))
+    assert run.status == "ABORTED"
+
+
+def test_closing_the_stream_early_aborts_the_run():
+    client = fast_client(make_fake_items(30), batch_interval=0.2)
+    stream = stream_jobs(client, "Software Engineer", "Remote", max_items=30, poll_interval=0.01)
+    next(stream)
+    stream.close()
+    run = next(iter(client.runs.values()))
+    assert run.status == "ABORTED"
+
+
+def test_raw_items_when_not_normalized():
+    jobs = list(stream_jobs(fast_client(), "Software Engineer", "Remote", max_items=10,
+                            poll_interval=0.01, normalize=False))
+    assert "descriptionHTML" in jobs[0]
+
+
+def test_first_result_timeout():
+    client = fast_client(first_delay=5)
+    with pytest.raises(JobStreamTimeout):
+        list(stream_jobs(client, "Software Engineer", "Remote", max_items=10,
+                         first_result_timeout=0.1, poll_interval=0.02))
+    run = next(iter(client.runs.values()))
+    assert run.status == "ABORTED"
@@ -0,0 +1,126 @@
+import time
+
+import pytest
+
+from tab_pool import TabPool
+
+
+class FakeDriver:
+    """A browser's windows and browser contexts, as far as TabPool drives them."""
+
+    def __init__(self):
+        self.windows = {"home": None}   # handle -> browser context id
+        self.current = "home"
+        self.created = 0
+        self.quit_called = False
+        self.switch_to = self
+
+    @property
+    def window_handles(self):
+        return list(self.windows)
+
+    @property
+    def current_window_handle(self):
+        return self.current
+
+    def window(self, handle):
+        if handle not in self.windows:
+            raise RuntimeError(f"no such window {handle}")
+        self.current = handle
+
+    def new_window(self, kind):
+        self.created += 1
+        self.current = f"tab-{self.created}"
+        self.windows[self.current] = None
+
+    def execute_cdp_cmd(self, command, params):
+        if command == "Target.createBrowserContext":
+            self.created += 1
+            return {"browserContextId": f"context-{self.created}"}
+        if command == "Target.createTarget":
+            target = f"target-{params['browserContextId']}"
+            self.windows[f"CDwindow-{target}"] = params["browserContextId"]
+            return {"targetId": target}
+        if command == "Target.disposeBrowserContext":
+            for handle, context in list(self.windows.items()):
+                if context == params["browserContextId"]:
+                    del self.windows[handle]
+            return {}
+        raise ValueError(command)
+
+    def close(self):
+        del self.windows[self.current]
+
+    def quit(self):
+        self.quit_called = True
+
+
+def wait_for(condition, timeout=2):
+    deadline = time.time() + timeout
+    while not condition() and time.time() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+@pytest.fixture
+def launched():
+    return {}
+
+
+@pytest.fixture
+def pool(launched):
+    def launch(browser_key):
+        launched[browser_key] = FakeDriver()
+        return launched[browser_key]
+    return TabPool(launch, tabs_per_browser=2)
+
+
+def test_browsers_are_filled_before_new_ones_launch(pool, launched):
+    sessions = [pool.open(key) for key in ("a", "b", "c")]
+    assert len(launched) == 2
+    assert sessions[0].browser is sessions[1].browser is not sessions[2].browser
+    assert pool.summary()["tabs"] == 3
+
+
+def test_isolated_tabs_get_their_own_context(pool):
+    session = pool.open("a")
+    # Old ChromeDriver versions prefix window handles with "CDwindow-"
+    assert session.context_id and session.handle == f"CDwindow-target-{session.context_id}"
+    with session.active() as driver:
+        assert driver.current_window_handle == session.handle
+    assert not pool.is_closed("a")
+
+
+def test_plain_tabs_without_isolation(launched):
+    pool = TabPool(lambda key: launched.setdefault(key, FakeDriver()), tabs_per_browser=2, isolate=False)
+    session = pool.open("a")
+    assert session.context_id is None and session.handle == "tab-1"
+
+
+def test_closing_tabs_disposes_contexts_and_quits_the_empty_browser(pool, launched):
+    closed = []
+    pool.on_browser_closed = closed.append
+    first, second = pool.open("a"), pool.open("b")
+    driver = first.browser.driver
+    pool.close("a")
+    assert pool.get("a") is None
+    assert wait_for(lambda: first.handle not in driver.windows)
+    assert not driver.quit_called and second.handle in driver.windows
+    pool.close("b")
+    assert driver.quit_called and closed == [first.browser.key]
+    assert pool.summary()["browsers"] == {}
+
+
+def test_a_failed_launch_releases_the_reservation(launched):
+    def launch(key):
+        raise RuntimeError("chrome didn't start")
+    pool = TabPool(launch, tabs_per_browser=2)
+    with pytest.raises(RuntimeError):
+        pool.open("a")
+    assert pool.summary()["browsers"] == {} and pool.get("a") is None
+
+
+def test_dropped_browsers_forget_their_tabs(pool):
+    session = pool.open("a")
+    assert pool.drop_browser(session.browser.key) == ["a"]
+    assert pool.is_closed("a") and not pool.is_browser(session.browser.key)
@@ -0,0 +1,189 @@
+"""
+Browser worker: runs applications queued by API processes started with APPLY_QUEUE.
+
+    APPLY_QUEUE=/srv/apply-queue.db python worker.py --slots 2 --view-url http://worker-1:6080/vnc.html
+    APPLY_QUEUE=redis://queue-host:6379/0 WORKER_VIEW_URL=https://worker-2.example/vnc.html python worker.py
+
+Every slot leases one application at a time and runs process_application
+on it. A heartbeat thread keeps the leases (and the worker's entry in the
+queue's worker list) alive; if this process dies, its leases run out and
+the applications are requeued for another worker. Statuses are written to
+the queue, where every API process reads them.
+
+As in the API process, the filled form is left open in a visible browser
+for the user to review and submit, and the application counts as done when
+they close it. On a worker that browser is on the worker's screen, so the
+worker must run under a display users can reach remotely (e.g. Xvfb with
+x11vnc and noVNC) and is given that display's address with --view-url or
+WORKER_VIEW_URL. It refuses to start without both. The address is added to
+each application's status and result as "view_url" for the frontend to
+link to.
+"""
+import os
+import sys
+import time
+import socket
+import signal
+import threading
+import traceback
+
+from job_queue import queue_from_env, worker_identity
+
+
+def display_available():
+    """Whether a visible browser can be started (always assumed outside Linux)."""
+    if not sys.platform.startswith("linux"):
+        return True
+    return bool(os.environ.get("DISPLAY") or os.environ.get("WAYLAND_DISPLAY"))
+
+
+def run_payload(payload):
+    """Runs one queued application in this process's browser tier."""
+    from apply_api import process_application, application_status
+    from models import UserData
+
+    job_id = payload["job_id"]
+    result = process_application(job_id, payload["job_url"], UserData(**payload["user"]),
+                                 payload.get("direct_form", False), payload.get("profile_values"),
+                                 payload.get("schema"))
+    view_url = os.environ.get("WORKER_VIEW_URL")
+    if view_url:
+        # Where the user finds the browser left open for them
+        status = application_status.get(job_id)
+        if status is not None:
+            application_status[job_id] = {**status, "view_url": view_url}
+        result = {**result, "details": {**result.get("details", {}), "view_url": view_url}}
+    return result
+
+
+class ApplicationWorker:
+    """
+    Pulls applications from a queue and runs them, `slots` at a time.
+
+    Args:
+        queue: SqliteQueue or RedisQueue.
+        slots: Applications run concurrently (each needs a browser).
+        lease: Seconds a task stays leased without a heartbeat.
+        poll_interval: Seconds between lease attempts when the queue is empty.
+        handler: Callable(payload) -> result dict with "success"; runs the application.
+    """
+
+    def __init__(self, queue, slots=1, lease=60, poll_interval=1.0, handler=run_payload, worker_id=None):
+        self.queue = queue
+        self.slots = slots
+        self.lease = lease
+        self.poll_interval = poll_interval
+        self.handler = handler
+        self.worker_id = worker_id or worker_identity()
+        self.lock = threading.Lock()
+        self.active = {}   # task id -> job id
+        self.completed = 0
+        self.failed = 0
+        self.stopping = threading.Event()
+        self.threads = []
+
+    def info(self):
+        with self.lock:
+            return {"host": socket.gethostname(), "pid": os.getpid(), "slots": self.slots,
+                    "active": sorted(self.active.values()), "completed": self.completed, "failed": self.failed}
+
+    def _heartbeat(self):
+        while not self.stopping.wait(self.lease / 3):
+            with self.lock:
+                task_ids = list(self.active)
+            try:
+                held = self.queue.heartbeat(self.worker_id, task_ids, self.lease, self.info())
+            except Exception as e:
+                print(f"Heartbeat failed: {e}")
+                continue
+            for task_id in set(task_ids) - held:
+                print(f"Lost the lease on task {task_id}; another worker may run it again")
+
+    def _run_slot(self):
+        while not self.stopping.is_set():
+            try:
+                task = self.queue.lease(self.worker_id, self.lease)
+            except Exception as e:
+                print(f"Could not lease a task: {e}")
+                task = None
+            if task is None:
+                self.stopping.wait(self.poll_interval)
+                continue
+            with self.lock:
+                self.active[task.id] = task.job_id
+            print(f"Running application for job {task.job_id} (task {task.id}, attempt {task.attempts})")
+            try:
+                result = self.handler(task.payload)
+            except Exception as e:
+                traceback.print_exc()
+                result = {"success": False, "message": f"Error processing application: {e}"}
+            succeeded = bool(result.get("success"))
+            if not self.queue.finish(task.id, self.worker_id, result, succeeded):
+                print(f"Result for task {task.id} dropped: its lease had run out")
+            with self.lock:
+                self.active.pop(task.id, None)
+                if succeeded:
+                    self.completed += 1
+                else:
+                    self.failed += 1
+
+    def start(self):
+        self.queue.heartbeat(self.worker_id, (), self.lease, self.info())
+        self.threads = [threading.Thread(target=self._heartbeat, name="queue-heartbeat", daemon=True)]
+        self.threads += [threading.Thread(target=self._run_slot, name=f"queue-slot-{i}", daemon=True)
+                         for i in range(self.slots)]
+        for thread in self.threads:
+            thread.start()
+        print(f"Worker {self.worker_id} started with {self.slots} slot(s)")
+
+    def stop(self):
+        """Stops leasing; applications already running finish first."""
+        self.stopping.set()
+        for thread in self.threads:
+            thread.join()
+        self.queue.retire(self.worker_id)
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description="Run queued job applications in local browsers")
+    parser.add_argument("--queue", help="Queue to pull from (SQLite path or redis:// URL; default: APPLY_QUEUE)")
+    parser.add_argument("-s", "--slots", type=int, default=int(os.environ.get("WORKER_SLOTS", 1)),
+                        help="Applications run at once")
+    parser.add_argument("--lease", type=float, default=60, help="Seconds before a silent worker's tasks are requeued")
+    parser.add_argument("--view-url", default=os.environ.get("WORKER_VIEW_URL"),
+                        help="Where users see and use this worker's screen (default: WORKER_VIEW_URL)")
+    args = parser.parse_args()
+
+    if not args.view_url:
+        sys.exit("Filled forms are left open for the user to submit: pass --view-url (or set WORKER_VIEW_URL) "
+                 "with the address where users reach this worker's screen")
+    if not display_available():
+        sys.exit("No display: run the worker under an X server users can view remotely (e.g. Xvfb + x11vnc + noVNC)")
+    os.environ["WORKER_VIEW_URL"] = args.view_url
+    if args.queue:
+        # apply_api writes statuses through the same queue
+        os.environ["APPLY_QUEUE"] = args.queue
+    queue = queue_from_env()
+    if queue is None:
+        sys.exit("Set APPLY_QUEUE or pass --queue")
+
+    worker = ApplicationWorker(queue, slots=args.slots, lease=args.lease)
+    signal.signal(signal.SIGTERM, lambda *_: worker.stopping.set())
+    worker.start()
+    try:
+        while not worker.stopping.is_set():
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    print("Stopping: waiting for running applications to be filled...")
+    worker.stop()
+    apply_api = sys.modules.get("apply_api")
+    if apply_api is not None:
+        # Browsers left open for manual completion stay open; only stop watching them
+        apply_api.session_watcher.stop()
+        apply_api.resource_monitor.stop()
+
+
+if __name__ == "__main__":
+    main()